@@ -0,0 +1,115 @@
+import argparse
+import itertools
+import random
+import time
+
+from classes.evaluation import evaluate
+from classes.parallel_search import ParallelSearchEngine
+from classes.pgn_reader import PgnReader
+from classes.position import START_FEN, Position
+
+
+def bench_search(args):
+    """
+    Замеряет скорость параллельного поиска для разного числа процессов.
+    """
+    position = Position.from_fen(args.fen)
+    workers = 1
+    while workers <= args.workers:
+        engine = ParallelSearchEngine(position, workers=workers, time_limit=args.time)
+        engine.get_best_move()
+        info = engine.last_info
+        engine.close()
+        print(f"Процессов: {workers:>2}, глубина {info['depth']}, {info['nodes']} узлов, {info['nps']} узлов/с, "
+              f"по процессам: {info['worker_nodes']}")
+        workers *= 2
+
+
+def collect_positions(args):
+    """
+    Собирает позиции для замера оценки: из партий PGN или из случайных партий от начальной позиции.
+    """
+    positions = []
+    if args.pgn:
+        games = ((game.headers.get("FEN", START_FEN), game.moves) for game in PgnReader(args.pgn))
+    else:
+        generator = random.Random(args.seed)
+        games = itertools.repeat((START_FEN, None))
+    for fen, moves in games:
+        position = Position.from_fen(fen, move_generator="bitboard")
+        for ply in range(len(moves) if moves is not None else 200):
+            if moves is None:
+                valid_moves = position.get_all_valid_moves()
+                if not valid_moves:
+                    break
+                move = generator.choice(valid_moves)
+            else:
+                move = moves[ply]
+            position.make_move(*move)
+            positions.append(Position.from_fen(position.to_fen()))
+            if len(positions) >= args.positions:
+                return positions
+    return positions
+
+
+def bench_eval(args):
+    """
+    Сравнивает скорость пакетной оценки на NumPy с оценкой позиций по одной и проверяет, что оценки совпадают.
+    """
+    try:
+        from classes.batch_evaluation import evaluate_batch, mobility_scores, pack_positions
+    except ImportError:
+        raise SystemExit("Для пакетной оценки нужен numpy (pip install numpy).")
+    positions = collect_positions(args)
+    count = len(positions)
+    print(f"Позиций: {count}")
+
+    start_time = time.perf_counter()
+    scores = [evaluate(position) for position in positions]
+    scalar_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    planes, turns = pack_positions(positions)
+    pack_time = time.perf_counter() - start_time
+    # Одна пачка слишком мала для точного замера — оцениваем её несколько раз
+    start_time = time.perf_counter()
+    for _ in range(args.repeat):
+        batch_scores = evaluate_batch(planes, turns)
+    batch_time = (time.perf_counter() - start_time) / args.repeat
+    start_time = time.perf_counter()
+    for _ in range(args.repeat):
+        mobility_scores(planes)
+    mobility_time = (time.perf_counter() - start_time) / args.repeat
+
+    mismatches = sum(1 for score, batch_score in zip(scores, batch_scores.tolist()) if score != batch_score)
+    print(f"По одной:          {count / max(scalar_time, 1e-9):>12.0f} позиций/с")
+    print(f"Упаковка в массив: {count / max(pack_time, 1e-9):>12.0f} позиций/с")
+    print(f"Пакетная оценка:   {count / max(batch_time, 1e-9):>12.0f} позиций/с "
+          f"(в {scalar_time / max(batch_time, 1e-9):.1f} раза быстрее)")
+    print(f"Подвижность:       {count / max(mobility_time, 1e-9):>12.0f} позиций/с")
+    print(f"Расхождений с evaluate(): {mismatches}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры скорости движка.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    search_parser = subparsers.add_parser("search", help="Скорость параллельного поиска (1, 2, 4, ... процессов).")
+    search_parser.add_argument("--workers", type=int, default=4, help="Максимальное число процессов.")
+    search_parser.add_argument("--time", type=float, default=3.0, help="Время на поиск в секундах.")
+    search_parser.add_argument("--fen", default=START_FEN, help="Позиция в формате FEN.")
+    search_parser.set_defaults(handler=bench_search)
+
+    eval_parser = subparsers.add_parser("eval", help="Пакетная оценка на NumPy против оценки по одной позиции.")
+    eval_parser.add_argument("--positions", type=int, default=50000, help="Число позиций.")
+    eval_parser.add_argument("--pgn", default=None, help="Брать позиции из партий PGN (по умолчанию случайные партии).")
+    eval_parser.add_argument("--seed", type=int, default=1, help="Зерно генератора случайных партий.")
+    eval_parser.add_argument("--repeat", type=int, default=10, help="Сколько раз повторить пакетную оценку.")
+    eval_parser.set_defaults(handler=bench_eval)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
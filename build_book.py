@@ -0,0 +1,31 @@
+import argparse
+import time
+
+from classes.opening_book import DEFAULT_BOOK, build_book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сборка книги дебютов в формате Polyglot из партий PGN.")
+    parser.add_argument("paths", nargs="+", help="Файлы PGN.")
+    parser.add_argument("--output", default=DEFAULT_BOOK, help=f"Файл книги (по умолчанию {DEFAULT_BOOK}).")
+    parser.add_argument("--min-games", type=int, default=3,
+                        help="Сколько раз ход должен встретиться в позиции, чтобы попасть в книгу.")
+    parser.add_argument("--max-ply", type=int, default=16, help="Сколько первых полуходов каждой партии учитывать.")
+    parser.add_argument("--progress", type=int, default=1000,
+                        help="Печатать прогресс каждые N партий (0 — не печатать).")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+
+    def report(games):
+        if args.progress and games % args.progress == 0:
+            elapsed = time.perf_counter() - start_time
+            print(f"Партий: {games}, {games / max(elapsed, 1e-9):.0f} партий/с", flush=True)
+
+    games, positions, entries = build_book(args.paths, args.output, args.min_games, args.max_ply, report)
+    print(f"Партий: {games}, позиций в книге: {positions}, ходов: {entries}, "
+          f"время: {time.perf_counter() - start_time:.2f} с. Книга записана в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
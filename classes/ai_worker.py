@@ -0,0 +1,120 @@
+"""
+Поиск хода компьютера в отдельном процессе, чтобы игровой цикл не замирал, пока движок думает.
+"""
+import multiprocessing
+import pickle
+import queue
+
+from classes.engine import SearchEngine
+from classes.opening_book import OpeningBook
+from classes.parallel_search import ParallelSearchEngine
+
+
+def run_worker(requests, results, stop_event, engine_options, book_path=None):
+    """
+    Цикл процесса-исполнителя: получает позиции, ищет ход и отправляет ответ.
+    Таблица транспозиций движка сохраняется между ходами.
+    :param requests: Очередь запросов (номер запроса, позиция в pickle) или None для завершения.
+    :param results: Очередь ответов (номер запроса, ход, сведения о поиске).
+    :param stop_event: Событие отмены текущего поиска.
+    :param engine_options: Параметры SearchEngine.
+    :param book_path: Книга дебютов Polyglot или None. Пока позиция есть в книге, ход берётся из неё без поиска.
+    """
+    book = OpeningBook(book_path) if book_path else None
+    workers = engine_options.pop("workers", 1)
+    if workers > 1:
+        engine = ParallelSearchEngine(None, workers=workers, stop_event=stop_event, **engine_options)
+    else:
+        engine = SearchEngine(None, stop_event=stop_event, **engine_options)
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, position_data = request
+        position = pickle.loads(position_data)
+        move = book.choose_move(position) if book else None
+        if move is not None:
+            results.put((request_id, move, {"book": True}))
+            continue
+        move = engine.get_best_move(position)
+        results.put((request_id, move, engine.last_info))
+    if workers > 1:
+        engine.close()
+    if book:
+        book.close()
+
+
+class AIWorker:
+    def __init__(self, workers=1, book_path=None, **engine_options):
+        """
+        Компьютерный игрок, который ищет ход в фоновом процессе.
+        :param workers: Число процессов поиска; больше одного — параллельный поиск (ParallelSearchEngine).
+        :param book_path: Файл книги дебютов Polyglot или None.
+        :param engine_options: Параметры SearchEngine (time_limit, node_limit, max_depth, hash_mb).
+        """
+        self.requests = multiprocessing.Queue()
+        self.results = multiprocessing.Queue()
+        self.stop_event = multiprocessing.Event()
+        engine_options["workers"] = workers
+        self.process = multiprocessing.Process(
+            target=run_worker,
+            args=(self.requests, self.results, self.stop_event, engine_options, book_path),
+            # Демон-процесс не может запускать свои процессы, поэтому параллельный поиск
+            # работает в обычном процессе, который завершает close()
+            daemon=workers == 1
+        )
+        self.process.start()
+
+        self.request_id = 0
+        self.pending = None  # Номер запроса, ответ на который ещё не получен
+        self.last_info = {}
+
+    @property
+    def thinking(self):
+        return self.pending is not None
+
+    def request_move(self, position):
+        """
+        Отправляет позицию на поиск. Позиция копируется сразу, поэтому её можно менять дальше.
+        :param position: Позиция (Position).
+        """
+        self.request_id += 1
+        self.pending = self.request_id
+        self.stop_event.clear()
+        self.requests.put((self.request_id, pickle.dumps(position)))
+
+    def poll(self):
+        """
+        Проверяет, готов ли ход, не блокируя вызывающий поток.
+        :return: Ход ((start_row, start_col), (end_row, end_col), promotion) или None, если ход ещё не найден
+                 (или ходов нет — тогда thinking становится False).
+        """
+        while self.pending is not None:
+            try:
+                request_id, move, info = self.results.get_nowait()
+            except queue.Empty:
+                return None
+            # Ответы на отменённые запросы пропускаем
+            if request_id == self.pending:
+                self.pending = None
+                self.last_info = info
+                return move
+        return None
+
+    def cancel(self):
+        """
+        Прерывает текущий поиск; его результат будет проигнорирован.
+        """
+        self.pending = None
+        self.stop_event.set()
+
+    def close(self):
+        """
+        Прерывает поиск и завершает процесс-исполнитель.
+        """
+        self.cancel()
+        if self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.terminate()
@@ -0,0 +1,211 @@
+"""
+Пакетная оценка позиций на NumPy: сразу для N позиций, без цикла по объектам Python.
+
+Позиции передаются массивом битбордов формы (N, 12) с типом uint64 — индексы как у
+Position.bitboards (цвет * 6 + тип фигуры), и массивом очередности хода формы (N,)
+(0 — ход белых, 1 — чёрных). Доску формы (N, 64) int8 (номер фигуры или -1 для пустой клетки)
+можно перевести в битборды функцией planes_from_boards.
+
+Материал и бонусы клеток считаются по тем же таблицам, что и evaluate(), поэтому их сумма
+совпадает с оценкой evaluate() для каждой позиции. Подвижность — приближённая: атаки фигур
+одного вида объединяются, так что клетка, которую бьют два коня, считается один раз.
+"""
+
+import numpy as np
+
+from classes.bitboard import BISHOP, COLOR_INDEX, KNIGHT, QUEEN, ROOK
+from classes.evaluation import PIECE_VALUES, SQUARE_SCORES
+
+CHUNK_SIZE = 1 << 14  # Сколько позиций обрабатывать за раз (промежуточный массив бонусов — 96 чисел на позицию)
+
+# Вес одной доступной клетки для каждого типа фигуры (P, N, B, R, Q, K)
+MOBILITY_WEIGHTS = [0, 4, 3, 2, 1, 0]
+
+# Материал со знаком цвета и бонусы клеток без материала — вместе дают SQUARE_SCORES
+SIGNED_VALUES = np.array([(1 if index < 6 else -1) * PIECE_VALUES[index % 6] for index in range(12)],
+                         dtype=np.int64)
+SQUARE_BONUSES = np.array(SQUARE_SCORES, dtype=np.int64) - SIGNED_VALUES[:, None]
+
+
+def _build_byte_bonuses():
+    """
+    Строит таблицу BYTE_BONUSES[байт битборда * 256 + значение байта]: сумма бонусов клеток,
+    занятых в этом байте. Байт битборда — 8 клеток одной строки, всего 12 * 8 = 96 байт на позицию,
+    поэтому бонусы позиции — это 96 чтений из таблицы вместо обхода 768 битов.
+    """
+    bonuses = SQUARE_BONUSES.reshape(96, 8)
+    values = np.arange(256)
+    bits = (values[:, None] >> np.arange(8)) & 1  # (256, 8): биты каждого значения байта
+    return (bits @ bonuses.T).T.reshape(-1).astype(np.int32)
+
+
+BYTE_BONUSES = _build_byte_bonuses()
+BYTE_OFFSETS = np.arange(96, dtype=np.intp) * 256
+
+
+def _column_mask(d_col):
+    """
+    Битборд клеток, на которые можно попасть сдвигом на d_col столбцов без перехода через край доски.
+    """
+    mask = 0
+    for square in range(64):
+        if 0 <= (square & 7) - d_col < 8:
+            mask |= 1 << square
+    return np.uint64(mask)
+
+
+# Направления (d_row, d_col) как (сдвиг номера клетки, маска столбцов)
+ROOK_DIRECTIONS = [(8 * d_row + d_col, _column_mask(d_col)) for d_row, d_col in ((0, 1), (0, -1), (1, 0), (-1, 0))]
+BISHOP_DIRECTIONS = [(8 * d_row + d_col, _column_mask(d_col)) for d_row, d_col in ((1, 1), (1, -1), (-1, 1), (-1, -1))]
+KNIGHT_DIRECTIONS = [(8 * d_row + d_col, _column_mask(d_col))
+                     for d_row, d_col in ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))]
+
+if hasattr(np, "bitwise_count"):
+    popcount = np.bitwise_count
+else:
+    # NumPy до 2.0: число единиц по таблице для каждого байта
+    BYTE_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+    def popcount(bitboards):
+        """
+        Считает число установленных битов в каждом элементе массива uint64.
+        """
+        counts = BYTE_COUNTS[np.ascontiguousarray(bitboards).view(np.uint8)]
+        return counts.reshape(bitboards.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+def shift(bitboards, amount):
+    """
+    Сдвигает битборды на amount клеток (положительный сдвиг — к первой горизонтали).
+    """
+    if amount > 0:
+        return np.left_shift(bitboards, np.uint64(amount))
+    return np.right_shift(bitboards, np.uint64(-amount))
+
+
+def slide(sliders, empty, amount, mask):
+    """
+    Атаки дальнобойных фигур в одном направлении для всех позиций сразу
+    (заполнение Когге — Стоуна: луч удлиняется на 1, 2 и 4 клетки за три шага).
+    :param sliders: Битборды фигур.
+    :param empty: Битборды пустых клеток.
+    :param amount: Сдвиг номера клетки за один шаг.
+    :param mask: Маска столбцов, куда можно попасть за шаг.
+    :return: Битборды атакованных клеток (включая первую занятую на каждом луче).
+    """
+    empty = empty & mask
+    for step in (amount, 2 * amount, 4 * amount):
+        sliders = sliders | empty & shift(sliders, step)
+        empty = empty & shift(empty, step)
+    return shift(sliders, amount) & mask
+
+
+def piece_attacks(pieces, empty, directions, sliding):
+    """
+    Объединение атак фигур одного вида по всем направлениям.
+    """
+    attacks = np.zeros_like(pieces)
+    for amount, mask in directions:
+        attacks |= slide(pieces, empty, amount, mask) if sliding else shift(pieces, amount) & mask
+    return attacks
+
+
+def pack_positions(positions):
+    """
+    Упаковывает позиции в массивы для пакетной оценки.
+    :param positions: Позиции (Position).
+    :return: (битборды формы (N, 12) uint64, очередность хода формы (N,) int8).
+    """
+    planes = []
+    turns = []
+    for position in positions:
+        planes.append(position.bitboards)
+        turns.append(COLOR_INDEX[position.current_player])
+    return (np.array(planes, dtype=np.uint64).reshape(len(planes), 12),
+            np.array(turns, dtype=np.int8))
+
+
+def planes_from_boards(boards):
+    """
+    Переводит доски формы (N, 64) — номер фигуры (цвет * 6 + тип) или -1 для пустой клетки — в битборды.
+    :return: Битборды формы (N, 12) uint64.
+    """
+    boards = np.asarray(boards)
+    planes = np.empty((len(boards), 12), dtype="<u8")
+    for index in range(12):
+        packed = np.packbits(boards == index, axis=1, bitorder="little")
+        planes[:, index] = packed.view("<u8")[:, 0]
+    return planes.astype(np.uint64)
+
+
+def material_scores(planes):
+    """
+    Материал с точки зрения белых.
+    :param planes: Битборды формы (N, 12) uint64.
+    :return: Массив (N,) int64.
+    """
+    return popcount(planes).astype(np.int64) @ SIGNED_VALUES
+
+
+def square_scores(planes):
+    """
+    Бонусы таблиц «фигура-клетка» (без материала) с точки зрения белых.
+    :param planes: Битборды формы (N, 12) uint64.
+    :return: Массив (N,) int64.
+    """
+    scores = np.empty(len(planes), dtype=np.int64)
+    for start in range(0, len(planes), CHUNK_SIZE):
+        chunk = np.ascontiguousarray(planes[start:start + CHUNK_SIZE], dtype="<u8").view(np.uint8)  # (n, 96)
+        scores[start:start + CHUNK_SIZE] = BYTE_BONUSES[chunk + BYTE_OFFSETS].sum(axis=1)
+    return scores
+
+
+def mobility_scores(planes):
+    """
+    Приближённая подвижность с точки зрения белых: число клеток, которые бьют фигуры каждого вида
+    (кроме занятых своими), умноженное на MOBILITY_WEIGHTS.
+    :param planes: Битборды формы (N, 12) uint64.
+    :return: Массив (N,) int64.
+    """
+    planes = np.asarray(planes, dtype=np.uint64)
+    occupied = np.bitwise_or.reduce(planes, axis=1)
+    empty = ~occupied
+    scores = np.zeros(len(planes), dtype=np.int64)
+    for color in (0, 1):
+        base = color * 6
+        free = ~np.bitwise_or.reduce(planes[:, base:base + 6], axis=1)  # Клетки, не занятые своими фигурами
+        queens = planes[:, base + QUEEN]
+        attacks = [(KNIGHT, piece_attacks(planes[:, base + KNIGHT], empty, KNIGHT_DIRECTIONS, False)),
+                   (BISHOP, piece_attacks(planes[:, base + BISHOP], empty, BISHOP_DIRECTIONS, True)),
+                   (ROOK, piece_attacks(planes[:, base + ROOK], empty, ROOK_DIRECTIONS, True)),
+                   (QUEEN, piece_attacks(queens, empty, ROOK_DIRECTIONS, True)
+                    | piece_attacks(queens, empty, BISHOP_DIRECTIONS, True))]
+        sign = 1 if color == 0 else -1
+        for piece_type, bitboards in attacks:
+            scores += sign * MOBILITY_WEIGHTS[piece_type] * popcount(bitboards & free).astype(np.int64)
+    return scores
+
+
+def score_components(planes):
+    """
+    Составляющие оценки с точки зрения белых.
+    :param planes: Битборды формы (N, 12) uint64.
+    :return: (материал, бонусы клеток, подвижность) — массивы (N,) int64.
+    """
+    planes = np.asarray(planes, dtype=np.uint64)
+    return material_scores(planes), square_scores(planes), mobility_scores(planes)
+
+
+def evaluate_batch(planes, turns, mobility=False):
+    """
+    Оценивает позиции с точки зрения ходящей стороны. Без подвижности результат совпадает с evaluate().
+    :param planes: Битборды формы (N, 12) uint64.
+    :param turns: Очередность хода формы (N,): 0 — белые, 1 — чёрные.
+    :param mobility: Добавить ли к оценке приближённую подвижность.
+    :return: Массив (N,) int64.
+    """
+    planes = np.asarray(planes, dtype=np.uint64)
+    scores = material_scores(planes) + square_scores(planes)
+    if mobility:
+        scores += mobility_scores(planes)
+    return np.where(np.asarray(turns) == 0, scores, -scores)
@@ -0,0 +1,166 @@
+"""
+Пакетная проверка партий: старые журналы data/*.txt ("white e2 -> e4") и файлы PGN
+проигрываются через правила Position, недопустимые ходы отмечаются, для каждой партии
+составляется короткая сводка с итоговым состоянием.
+
+Работа делится на задания (журнал целиком или кусок PGN-файла), которые выполняются
+в пуле процессов и не зависят друг от друга.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from classes.notation import notation_to_square
+from classes.pgn_reader import PgnError, iter_game_texts, parse_game, split_pgn
+from classes.position import Position
+
+SHARD_SIZE = 4 * 1024 * 1024  # Размер куска PGN-файла на одно задание, в байтах
+
+
+def make_summary(source, number, position, plies, result=None, illegal=None, error=None):
+    """
+    Составляет сводку по партии.
+    :param source: Файл, из которого прочитана партия.
+    :param number: Номер партии в файле (с 1) или смещение куска и номер в нём.
+    :param position: Позиция после последнего допустимого хода (None, если партию не удалось начать).
+    :param plies: Число сыгранных допустимых полуходов.
+    :param result: Результат, записанный в партии, или None.
+    :param illegal: (номер полухода, запись хода, причина) для первого недопустимого хода или None.
+    :param error: Текст ошибки разбора или None.
+    :return: Словарь сводки.
+    """
+    summary = {"source": source, "game": number, "plies": plies}
+    if position is not None:
+        status = position.get_status()
+        summary["status"] = status.state
+        if status.reason:
+            summary["reason"] = status.reason
+        summary["computed_result"] = status.get_result()
+    if result is not None:
+        summary["result"] = result
+    if illegal is not None:
+        summary["illegal_ply"], summary["illegal_move"], summary["illegal_reason"] = illegal
+    if error is not None:
+        summary["error"] = error
+    return summary
+
+
+def replay_text_log(path):
+    """
+    Проигрывает журнал старого формата: по строке на ход, "white e2 -> e4".
+    В таких журналах не записывалась фигура превращения, поэтому пешка превращается в ферзя.
+    :param path: Путь к журналу.
+    :return: Список из одной сводки.
+    """
+    position = Position(move_generator="bitboard")
+    plies = 0
+    illegal = None
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                color, start, arrow, end = line.split()
+                if arrow != "->":
+                    raise ValueError(line.strip())
+                move = (notation_to_square(start), notation_to_square(end))
+            except ValueError:
+                illegal = (plies + 1, line.strip(), "неверная запись")
+                break
+            legal = {(move_start, move_end) for move_start, move_end, _ in position.get_all_valid_moves()}
+            if color != position.current_player:
+                illegal = (plies + 1, line.strip(), "ход не в свою очередь")
+                break
+            if move not in legal:
+                illegal = (plies + 1, line.strip(), "недопустимый ход")
+                break
+            position.make_move(*move)
+            plies += 1
+    return [make_summary(path, 1, position, plies, illegal=illegal)]
+
+
+def replay_pgn_shard(path, start, end):
+    """
+    Проигрывает партии из куска PGN-файла.
+    :param path: Путь к файлу.
+    :param start: Начало куска в байтах.
+    :param end: Конец куска в байтах.
+    :return: Список сводок; номер партии — (начало куска, номер партии в куске).
+    """
+    summaries = []
+    for index, (header_lines, movetext_lines) in enumerate(iter_game_texts(path, start, end)):
+        number = f"{start}:{index + 1}"
+        illegal = None
+        try:
+            game = parse_game(header_lines, movetext_lines)
+        except PgnError as error:
+            if error.game is None:
+                # Партию не удалось начать: испорчены заголовки, текст ходов или FEN
+                summaries.append(make_summary(path, number, None, 0, error=str(error)))
+                continue
+            game = error.game
+            illegal = (error.ply, error.token, error.reason)
+        summaries.append(make_summary(path, number, game.position, len(game.moves), game.result, illegal))
+    return summaries
+
+
+def run_task(task):
+    """
+    Выполняет одно задание в процессе пула.
+    :param task: ("txt", путь) или ("pgn", путь, начало, конец).
+    :return: Список сводок.
+    """
+    if task[0] == "txt":
+        return replay_text_log(task[1])
+    return replay_pgn_shard(*task[1:])
+
+
+def collect_files(paths):
+    """
+    Собирает файлы .txt и .pgn из списка файлов и папок.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith((".txt", ".pgn")):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def make_tasks(files, shard_size=SHARD_SIZE):
+    """
+    Делит файлы на задания: журнал .txt — одно задание, файл PGN — по заданию на кусок.
+    """
+    tasks = []
+    for path in files:
+        if path.endswith(".pgn"):
+            tasks.extend(("pgn", path, start, end) for start, end in split_pgn(path, shard_size))
+        else:
+            tasks.append(("txt", path))
+    return tasks
+
+
+def replay_files(paths, workers=None, shard_size=SHARD_SIZE, report=None):
+    """
+    Проигрывает все партии из файлов в пуле процессов.
+    :param paths: Файлы и папки.
+    :param workers: Число процессов (по умолчанию — число ядер).
+    :param shard_size: Размер куска PGN-файла на одно задание.
+    :param report: Функция report(games, elapsed), вызываемая после каждого выполненного задания, или None.
+    :return: Генератор сводок (в порядке завершения заданий).
+    """
+    tasks = make_tasks(collect_files(paths), shard_size)
+    start_time = time.perf_counter()
+    games = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_task, task) for task in tasks]
+        for future in as_completed(futures):
+            summaries = future.result()
+            games += len(summaries)
+            yield from summaries
+            if report:
+                report(games, time.perf_counter() - start_time)
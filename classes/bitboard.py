@@ -0,0 +1,415 @@
+"""
+Генерация ходов на битбордах.
+
+Клетка кодируется числом square = row * 8 + col (row 0 — восьмая горизонталь, как в Position.grid),
+битборд — целое число, в котором бит square установлен, если клетка занята.
+"""
+
+from classes.move_generator import PROMOTION_LETTERS
+
+COLOR_INDEX = {"white": 0, "black": 1}
+PIECE_INDEX = {"P": 0, "N": 1, "B": 2, "R": 3, "Q": 4, "K": 5}
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+# Координаты (row, col) каждой клетки, чтобы не создавать кортежи при генерации
+SQUARES = [(square >> 3, square & 7) for square in range(64)]
+
+FULL_BOARD = (1 << 64) - 1
+
+
+def bit(row, col):
+    """
+    Возвращает битборд с одной клеткой.
+    :param row: Строка клетки.
+    :param col: Столбец клетки.
+    """
+    return 1 << (row * 8 + col)
+
+
+def squares_of(bitboard):
+    """
+    Перечисляет номера клеток, занятых в битборде.
+    :param bitboard: Битборд.
+    :return: Генератор номеров клеток.
+    """
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+def _step_attacks(offsets):
+    """
+    Строит таблицу атак для фигур, бьющих на фиксированные смещения (конь, король).
+    :param offsets: Смещения (d_row, d_col).
+    :return: Список битбордов атак для каждой клетки.
+    """
+    table = []
+    for row, col in SQUARES:
+        attacks = 0
+        for d_row, d_col in offsets:
+            r, c = row + d_row, col + d_col
+            if 0 <= r < 8 and 0 <= c < 8:
+                attacks |= bit(r, c)
+        table.append(attacks)
+    return table
+
+
+KNIGHT_ATTACKS = _step_attacks([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+KING_ATTACKS = _step_attacks([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+# PAWN_ATTACKS[color][square] — клетки, которые бьёт пешка цвета color, стоящая на square
+PAWN_ATTACKS = [_step_attacks([(-1, -1), (-1, 1)]), _step_attacks([(1, -1), (1, 1)])]
+
+
+def _ray(row, col, d_row, d_col, occupied):
+    """
+    Атаки вдоль луча до первой занятой клетки включительно.
+    """
+    attacks = 0
+    r, c = row + d_row, col + d_col
+    while 0 <= r < 8 and 0 <= c < 8:
+        attacks |= bit(r, c)
+        if occupied & bit(r, c):
+            break
+        r += d_row
+        c += d_col
+    return attacks
+
+
+def _line_tables(direction):
+    """
+    Строит таблицы атак дальнобойной фигуры вдоль одной линии (горизонталь, вертикаль или диагональ).
+    Для каждой клетки хранится маска внутренних клеток линии и словарь
+    «занятость линии -> атаки», поэтому атака считается одним поиском по ключу occupied & mask.
+    :param direction: Направление линии (d_row, d_col).
+    :return: Кортеж (маски, таблицы).
+    """
+    d_row, d_col = direction
+    masks = []
+    tables = []
+    for row, col in SQUARES:
+        # Крайние клетки линии не влияют на атаки, поэтому в маску не входят
+        mask = 0
+        for sign in (1, -1):
+            r, c = row + sign * d_row, col + sign * d_col
+            while 0 <= r + sign * d_row < 8 and 0 <= c + sign * d_col < 8:
+                mask |= bit(r, c)
+                r += sign * d_row
+                c += sign * d_col
+
+        table = {}
+        subset = 0
+        while True:
+            table[subset] = _ray(row, col, d_row, d_col, subset) | _ray(row, col, -d_row, -d_col, subset)
+            subset = (subset - mask) & mask
+            if subset == 0:
+                break
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+RANK_MASKS, RANK_ATTACKS = _line_tables((0, 1))
+FILE_MASKS, FILE_ATTACKS = _line_tables((1, 0))
+DIAGONAL_MASKS, DIAGONAL_ATTACKS = _line_tables((1, 1))
+ANTI_DIAGONAL_MASKS, ANTI_DIAGONAL_ATTACKS = _line_tables((1, -1))
+
+
+def rook_attacks(square, occupied):
+    """
+    Атаки ладьи с клетки square при заданной занятости доски.
+    """
+    return (RANK_ATTACKS[square][occupied & RANK_MASKS[square]]
+            | FILE_ATTACKS[square][occupied & FILE_MASKS[square]])
+
+
+def bishop_attacks(square, occupied):
+    """
+    Атаки слона с клетки square при заданной занятости доски.
+    """
+    return (DIAGONAL_ATTACKS[square][occupied & DIAGONAL_MASKS[square]]
+            | ANTI_DIAGONAL_ATTACKS[square][occupied & ANTI_DIAGONAL_MASKS[square]])
+
+
+def attacks_of(index, square, occupied):
+    """
+    Атаки фигуры с клетки square при заданной занятости доски.
+    :param index: Номер битборда фигуры (цвет * 6 + тип фигуры).
+    :param square: Номер клетки.
+    :param occupied: Занятость доски.
+    :return: Битборд атакованных клеток.
+    """
+    piece_type = index % 6
+    if piece_type == PAWN:
+        return PAWN_ATTACKS[index // 6][square]
+    if piece_type == KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    if piece_type == KING:
+        return KING_ATTACKS[square]
+    if piece_type == BISHOP:
+        return bishop_attacks(square, occupied)
+    if piece_type == ROOK:
+        return rook_attacks(square, occupied)
+    return rook_attacks(square, occupied) | bishop_attacks(square, occupied)
+
+
+def can_capture_en_passant(bitboards, target, color):
+    """
+    Проверяет, есть ли у стороны пешка, которая бьёт клетку взятия на проходе.
+    Связка пешки не учитывается — так же считают ключи Polyglot.
+    :param bitboards: Битборды позиции.
+    :param target: Клетка взятия на проходе (row, col).
+    :param color: Индекс цвета стороны, которая может взять.
+    """
+    row, col = target
+    # Свои пешки, которые бьют клетку взятия, — это клетки, которые бьёт с неё пешка соперника
+    return PAWN_ATTACKS[1 - color][row * 8 + col] & bitboards[color * 6 + PAWN] != 0
+
+
+def is_square_attacked(square, color, bitboards, occupied, excluded=0):
+    """
+    Проверяет, атакована ли клетка фигурами указанного цвета.
+    :param square: Номер клетки.
+    :param color: Индекс цвета атакующей стороны (0 — белые, 1 — чёрные).
+    :param bitboards: Список из 12 битбордов фигур (см. Position.bitboards).
+    :param occupied: Занятость доски.
+    :param excluded: Клетки, фигуры на которых не учитываются (например, только что взятые).
+    :return: True, если клетка атакована.
+    """
+    base = color * 6
+    keep = ~excluded
+    if PAWN_ATTACKS[1 - color][square] & bitboards[base + PAWN] & keep:
+        return True
+    if KNIGHT_ATTACKS[square] & bitboards[base + KNIGHT] & keep:
+        return True
+    if KING_ATTACKS[square] & bitboards[base + KING]:
+        return True
+    queens = bitboards[base + QUEEN]
+    rooks = (bitboards[base + ROOK] | queens) & keep
+    if rooks and rook_attacks(square, occupied) & rooks:
+        return True
+    bishops = (bitboards[base + BISHOP] | queens) & keep
+    if bishops and bishop_attacks(square, occupied) & bishops:
+        return True
+    return False
+
+
+def is_in_check(position, color):
+    """
+    Проверяет по битбордам, находится ли король указанного цвета под шахом.
+    :param position: Позиция (Position).
+    :param color: Цвет короля ("black" или "white").
+    """
+    us = COLOR_INDEX[color]
+    king = position.bitboards[us * 6 + KING]
+    if not king:
+        return False
+    return is_square_attacked(king.bit_length() - 1, 1 - us, position.bitboards, position.occupied())
+
+
+class BitboardMoveGenerator:
+    """
+    Генератор допустимых ходов на битбордах.
+    Использует битборды, которые Position поддерживает при каждом изменении доски,
+    и возвращает ходы в том же формате, что и PieceMoveGenerator.
+    """
+
+    def get_valid_moves(self, position, piece):
+        """
+        Возвращает ходы фигуры, после которых её король не остаётся под шахом.
+        :param position: Позиция (Position).
+        :param piece: Фигура.
+        :return: Список клеток (row, col), куда фигура может пойти.
+        """
+        row, col = piece.position
+        return [end for _, end, promotion in self.get_all_valid_moves(position, piece.color, bit(row, col))
+                if promotion in (None, "q")]
+
+    def has_valid_moves(self, position, color):
+        """
+        Проверяет, есть ли у игрока хотя бы один допустимый ход.
+        Ходы генерируются по одной фигуре, начиная с короля, до первой фигуры, у которой ход нашёлся.
+        :param position: Позиция (Position).
+        :param color: Цвет игрока.
+        """
+        context = self.prepare(position, COLOR_INDEX[color])
+        own, king = context[2], context[6]
+        moves = []
+        if king:
+            self.add_moves(position, context, king, moves)
+            if moves:
+                return True
+        for square in squares_of(own & ~king):
+            self.add_moves(position, context, 1 << square, moves)
+            if moves:
+                return True
+        return False
+
+    def get_all_valid_moves(self, position, color, origins=FULL_BOARD):
+        """
+        Возвращает все допустимые ходы игрока.
+        :param position: Позиция (Position).
+        :param color: Цвет игрока.
+        :param origins: Битборд клеток, ходы с которых нужны (по умолчанию — все).
+        :return: Список кортежей ((start_row, start_col), (end_row, end_col), promotion).
+        """
+        moves = []
+        self.add_moves(position, self.prepare(position, COLOR_INDEX[color]), origins, moves)
+        return moves
+
+    def prepare(self, position, us):
+        """
+        Считает то, что нужно для генерации ходов стороны в позиции: занятость, шах и связанные фигуры.
+        :param position: Позиция (Position).
+        :param us: Индекс цвета ходящей стороны.
+        :return: Кортеж (us, them, own, occupied, their, targets, king, king_square, in_check, risky).
+        """
+        them = 1 - us
+        bitboards = position.bitboards
+        base = us * 6
+        own = (bitboards[base] | bitboards[base + 1] | bitboards[base + 2]
+               | bitboards[base + 3] | bitboards[base + 4] | bitboards[base + 5])
+        occupied = position.occupied()
+        their = occupied & ~own
+        targets = ~own & FULL_BOARD
+
+        king = bitboards[base + KING]
+        king_square = king.bit_length() - 1 if king else None
+        in_check = king_square is not None and is_square_attacked(king_square, them, bitboards, occupied)
+        pinned = self.pinned_pieces(king_square, them, bitboards, occupied, own)
+        # Ходы непривязанных фигур без шаха не могут подставить короля — их не проверяем
+        risky = FULL_BOARD if in_check else pinned
+        return us, them, own, occupied, their, targets, king, king_square, in_check, risky
+
+    def add_moves(self, position, context, origins, moves):
+        """
+        Добавляет допустимые ходы фигур, стоящих на клетках origins.
+        :param position: Позиция (Position).
+        :param context: Результат prepare для этой позиции.
+        :param origins: Битборд клеток, ходы с которых нужны.
+        :param moves: Список, в который добавляются ходы.
+        """
+        us, them, own, occupied, their, targets, king, king_square, in_check, risky = context
+        bitboards = position.bitboards
+        base = us * 6
+        append = moves.append
+
+        def add(start, end, captured=0):
+            start_bit = 1 << start
+            end_bit = 1 << end
+            if king_square is not None and start_bit & risky:
+                after = (occupied & ~start_bit & ~captured) | end_bit
+                if is_square_attacked(king_square, them, bitboards, after, end_bit | captured):
+                    return
+            append((SQUARES[start], SQUARES[end], None))
+
+        # Конь, слон, ладья, ферзь
+        for start in squares_of(bitboards[base + KNIGHT] & origins):
+            for end in squares_of(KNIGHT_ATTACKS[start] & targets):
+                add(start, end)
+        for start in squares_of(bitboards[base + BISHOP] & origins):
+            for end in squares_of(bishop_attacks(start, occupied) & targets):
+                add(start, end)
+        for start in squares_of(bitboards[base + ROOK] & origins):
+            for end in squares_of(rook_attacks(start, occupied) & targets):
+                add(start, end)
+        for start in squares_of(bitboards[base + QUEEN] & origins):
+            for end in squares_of((rook_attacks(start, occupied) | bishop_attacks(start, occupied)) & targets):
+                add(start, end)
+
+        self.add_pawn_moves(position, us, bitboards, occupied, their, king_square, risky, origins, moves)
+
+        # Король: проверяем каждую клетку, убрав короля с исходной
+        # (иначе клетка за королём на линии шахующей фигуры считалась бы безопасной)
+        if king & origins:
+            without_king = occupied & ~king
+            for end in squares_of(KING_ATTACKS[king_square] & targets):
+                end_bit = 1 << end
+                if not is_square_attacked(end, them, bitboards, without_king | end_bit, end_bit):
+                    append((SQUARES[king_square], SQUARES[end], None))
+            if not in_check:
+                self.add_castling_moves(position, us, bitboards, occupied, king_square, moves)
+
+    def add_pawn_moves(self, position, us, bitboards, occupied, their, king_square, risky, origins, moves):
+        """
+        Добавляет ходы пешек: ход вперёд, двойной ход, взятия, взятие на проходе и превращение.
+        """
+        them = 1 - us
+        step = -8 if us == 0 else 8
+        start_rank = 6 if us == 0 else 1
+        last_rank = 0 if us == 0 else 7
+
+        ep_square = None
+        if position.en_passant_target:
+            ep_row, ep_col = position.en_passant_target
+            ep_square = ep_row * 8 + ep_col
+
+        for start in squares_of(bitboards[us * 6 + PAWN] & origins):
+            start_bit = 1 << start
+            ends = []
+            forward = start + step
+            if not occupied >> forward & 1:
+                ends.append((forward, 0))
+                double = forward + step
+                if start >> 3 == start_rank and not occupied >> double & 1:
+                    ends.append((double, 0))
+            for end in squares_of(PAWN_ATTACKS[us][start] & their):
+                ends.append((end, 0))
+            if ep_square is not None and PAWN_ATTACKS[us][start] >> ep_square & 1:
+                # Взятая пешка стоит на строке атакующей пешки
+                ends.append((ep_square, 1 << ((start & ~7) | (ep_square & 7))))
+
+            for end, captured in ends:
+                end_bit = 1 << end
+                # Взятие на проходе убирает с линии сразу две пешки — проверяем всегда
+                if king_square is not None and (start_bit & risky or captured):
+                    after = (occupied & ~start_bit & ~captured) | end_bit
+                    if is_square_attacked(king_square, them, bitboards, after, end_bit | captured):
+                        continue
+                if end >> 3 == last_rank:
+                    for promotion in PROMOTION_LETTERS:
+                        moves.append((SQUARES[start], SQUARES[end], promotion))
+                else:
+                    moves.append((SQUARES[start], SQUARES[end], None))
+
+    def add_castling_moves(self, position, us, bitboards, occupied, king_square, moves):
+        """
+        Добавляет рокировки: права берутся из флагов has_moved короля и ладей.
+        Король не под шахом (проверено вызывающим кодом), клетки между королём и ладьёй
+        должны быть пусты, а клетки, через которые проходит король, — не атакованы.
+        """
+        them = 1 - us
+        row = 7 if us == 0 else 0
+        rights = position.get_castling_rights()
+        short_right, long_right = ("K", "Q") if us == 0 else ("k", "q")
+
+        if short_right in rights:
+            if not occupied & (bit(row, 5) | bit(row, 6)):
+                if not any(is_square_attacked(row * 8 + col, them, bitboards, occupied) for col in (5, 6)):
+                    moves.append((SQUARES[king_square], (row, 6), None))
+        if long_right in rights:
+            if not occupied & (bit(row, 1) | bit(row, 2) | bit(row, 3)):
+                if not any(is_square_attacked(row * 8 + col, them, bitboards, occupied) for col in (3, 2)):
+                    moves.append((SQUARES[king_square], (row, 2), None))
+
+    def pinned_pieces(self, king_square, them, bitboards, occupied, own):
+        """
+        Находит свои фигуры, связанные с королём дальнобойными фигурами соперника.
+        :return: Битборд связанных фигур.
+        """
+        if king_square is None:
+            return 0
+        base = them * 6
+        queens = bitboards[base + QUEEN]
+        pinned = 0
+        for attackers, attacks in (
+                (bitboards[base + ROOK] | queens, rook_attacks),
+                (bitboards[base + BISHOP] | queens, bishop_attacks)):
+            if not attackers:
+                continue
+            # Снимаем ближайших своих блокирующих и смотрим, какие фигуры соперника открылись
+            blockers = attacks(king_square, occupied) & own
+            xray = attacks(king_square, occupied & ~blockers) & attackers
+            for pinner in squares_of(xray):
+                pinned |= attacks(pinner, occupied) & attacks(king_square, occupied) & blockers
+        return pinned
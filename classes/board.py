@@ -1,24 +1,29 @@
 import os
 
 import pygame
-from classes.game_state_checker import GameStateChecker
 from classes.board_renderer import BoardRenderer
 from classes.move_handler import MoveHandler
-from classes.ai import RandomAI
-from classes.pieces.king import King
-from classes.pieces.pawn import Pawn
+from classes.opening_book import DEFAULT_BOOK
+from classes.ai_worker import AIWorker
+from classes.position import Position
+from classes.sprites import get_piece_sprite
+from classes.tablebase import DEFAULT_DIRECTORY
 from classes.pieces.rook import Rook
 from classes.pieces.knight import Knight
 from classes.pieces.bishop import Bishop
 from classes.pieces.queen import Queen
 
+MESSAGE_TIME = 3000  # Сколько миллисекунд показывается сообщение о результате партии
+
 
 class Board:
-    def __init__(self, screen_width, screen_height, mode="human_vs_human", timer_minutes=5):
+    def __init__(self, screen_width, screen_height, mode="human_vs_human", timer_minutes=5, fen=None, workers=1):
         """
-        Инициализация доски.
+        Инициализация доски — отображения позиции (Position) средствами pygame.
         :param screen_width: Ширина экрана.
         :param screen_height: Высота экрана.
+        :param fen: Начальная позиция в формате FEN (по умолчанию обычная начальная расстановка).
+        :param workers: Число процессов поиска компьютера; больше одного — параллельный поиск (ParallelSearchEngine).
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
@@ -39,15 +44,12 @@ class Board:
         self.info_panel_x = self.board_width
         self.info_panel_y = 50
 
-        self.grid = [[None for _ in range(8)] for _ in range(8)]
-        self.add_pieces()
+        self.position = Position.from_fen(fen) if fen else Position()
 
         self.selected_piece = None
         self.valid_moves = []
-        self.current_player = "white"
-        self.en_passant_target = None
 
-        self.state_checker = GameStateChecker(self)
+        self.state_checker = self.position.state_checker
         self.renderer = BoardRenderer(
             self,
             self.board_start_x,
@@ -55,41 +57,81 @@ class Board:
             self.cell_size,
             self.border_size
         )
-        self.move_handler = MoveHandler(self)
-
         self.mode = mode  # Режим игры
         if self.mode == "human_vs_ai":
-            self.ai = RandomAI(self)  # Инициализируем AI
+            # Компьютер думает в отдельном процессе; дебютные ходы берёт из книги, если она есть,
+            # и играет окончания по таблицам эндшпиля, если они сгенерированы
+            self.ai = AIWorker(workers, time_limit=1.0,
+                               book_path=DEFAULT_BOOK if os.path.exists(DEFAULT_BOOK) else None,
+                               tablebases=DEFAULT_DIRECTORY if os.path.isdir(DEFAULT_DIRECTORY) else None)
 
         # Таймеры для игроков
         self.timer_minutes = timer_minutes
+        self.move_handler = MoveHandler(self)
         self.white_time = timer_minutes * 60  # Время в секундах
         self.black_time = timer_minutes * 60  # Время в секундах
         self.last_time_update = pygame.time.get_ticks()  # Время последнего обновления таймера
         self.promotion_pawn = None
+        self.promotion_pos = None
         self.promotion_active = False
         self.promotion_piece = None
         self.promotion_buttons = []
+        self.panel_texts = None  # Тексты информационной панели на момент последней отрисовки
+        self.promotion_shown = False  # Нарисовано ли уже меню превращения
+        self.game_over = False
+        self.game_over_time = None  # Когда показано сообщение о результате (pygame.time.get_ticks)
+
+    @property
+    def grid(self):
+        return self.position.grid
+
+    @grid.setter
+    def grid(self, grid):
+        self.position.grid = grid
+
+    @property
+    def current_player(self):
+        return self.position.current_player
+
+    @current_player.setter
+    def current_player(self, color):
+        self.position.current_player = color
+
+    @property
+    def en_passant_target(self):
+        return self.position.en_passant_target
+
+    @en_passant_target.setter
+    def en_passant_target(self, target):
+        self.position.en_passant_target = target
 
     def draw_promotion_menu(self, screen, pawn):
+        """
+        Отрисовывает меню выбора фигуры превращения.
+        :param screen: Экран.
+        :param pawn: Превращающаяся пешка.
+        :return: Прямоугольник меню на экране.
+        """
         colors = [(235, 235, 208), (119, 149, 86)]
         menu_width = 4 * self.cell_size
 
-        col = pawn.position[1]
+        # Меню показываем над клеткой, на которую идёт пешка
+        row, col = self.promotion_pos
         if col < 2:
             menu_x = self.board_start_x
         elif col > 5:
             menu_x = self.board_start_x + (8 - 4) * self.cell_size
         else:
             menu_x = self.board_start_x + (col - 1) * self.cell_size
-        menu_y = self.board_start_y + pawn.position[0] * self.cell_size
+        menu_y = self.board_start_y + row * self.cell_size
 
         # Корректируем позицию для черных пешек
         if pawn.color == "black":
             menu_y -= 3 * self.cell_size
 
         # Рамка окна выбора
-        pygame.draw.rect(screen, (0, 0, 0), (menu_x - 2, menu_y - 2, menu_width + 4, self.cell_size + 4), 3)
+        menu_rect = pygame.Rect(menu_x - 2, menu_y - 2, menu_width + 4, self.cell_size + 4)
+        pygame.draw.rect(screen, (0, 0, 0), menu_rect, 3)
 
         pieces = [Queen, Rook, Bishop, Knight]
 
@@ -103,11 +145,9 @@ class Board:
             pygame.draw.rect(screen, colors[i % 2], rect)
             pygame.draw.rect(screen, (0, 0, 0), rect, 1)
 
-            name_piece = piece_class.__name__[0] if not piece_class == Knight else 'N'
-            image_name = f"{'b' if pawn.color == 'black' else 'w'}{name_piece}.png"
-            image = pygame.image.load(os.path.join("images", image_name))
-            image = pygame.transform.scale(image, (self.cell_size, self.cell_size))
-            screen.blit(image, (x, menu_y))
+            # Изображения берём из общего кэша, а не загружаем с диска на каждом кадре
+            screen.blit(get_piece_sprite(pawn.color, piece_class.symbol, self.cell_size), (x, menu_y))
+        return menu_rect
 
     def handle_promotion_click(self, mouse_pos):
         for rect, piece_class in self.promotion_buttons:
@@ -133,23 +173,48 @@ class Board:
         # Проверяем, не истекло ли время у одного из игроков
         if self.white_time <= 0:
             self.white_time = 0
-            self.show_message(screen, "Время вышло! Черные победили.")
+            self.end_game(screen, "Время вышло! Черные победили.", "0-1", "time forfeit")
             return True  # Игра завершена
         elif self.black_time <= 0:
             self.black_time = 0
-            self.show_message(screen, "Время вышло! Белые победили.")
+            self.end_game(screen, "Время вышло! Белые победили.", "1-0", "time forfeit")
             return True  # Игра завершена
 
         return False  # Игра продолжается
 
     def draw_timers(self, screen):
         """
-        Отрисовывает таймеры игроков на экране.
+        Отрисовывает таймеры игроков на экране. Панель перерисовывается, только если изменился её текст.
         :param screen: Экран, на котором отрисовываются таймеры.
+        :return: Список изменившихся прямоугольников экрана (пустой, если панель не менялась).
         """
+        # Состояние компьютера: думает или результат последнего поиска
+        info_str = None
+        if self.mode == "human_vs_ai":
+            if self.ai.thinking:
+                info_str = "Компьютер думает..."
+            elif self.ai.last_info:
+                info = self.ai.last_info
+                if info.get("book"):
+                    info_str = "Ход из книги дебютов"
+                elif info.get("tablebase"):
+                    info_str = "Ход из таблиц эндшпиля"
+                else:
+                    info_str = f"Глубина: {info['depth']}, {info['nps']} узлов/с"
+
+        # Таймеры
+        white_time_str = f"Белые: {int(self.white_time // 60):02}:{int(self.white_time % 60):02}"
+        black_time_str = f"Черные: {int(self.black_time // 60):02}:{int(self.black_time % 60):02}"
+
+        texts = (self.current_player, info_str, white_time_str, black_time_str)
+        if texts == self.panel_texts:
+            return []
+        self.panel_texts = texts
+
         font = pygame.font.Font(None, 36)
 
-        pygame.draw.rect(screen, (50, 50, 50), (self.info_panel_x, 0, self.info_panel_width, self.screen_height))
+        panel_rect = pygame.Rect(self.info_panel_x, 0, self.info_panel_width, self.screen_height)
+        pygame.draw.rect(screen, (50, 50, 50), panel_rect)
 
         # Позиционирование в правой панели
         panel_center_x = self.info_panel_x + self.info_panel_width//2
@@ -159,9 +224,11 @@ class Board:
         text_rect = text.get_rect(center=(panel_center_x, self.screen_height // 2))
         screen.blit(text, text_rect)
 
-        # Таймеры
-        white_time_str = f"Белые: {int(self.white_time // 60):02}:{int(self.white_time % 60):02}"
-        black_time_str = f"Черные: {int(self.black_time // 60):02}:{int(self.black_time % 60):02}"
+        if info_str:
+            small_font = pygame.font.Font(None, 28)
+            info_text = small_font.render(info_str, True, (200, 200, 200))
+            info_rect = info_text.get_rect(center=(panel_center_x, self.screen_height // 2 + 40))
+            screen.blit(info_text, info_rect)
 
         white_text = font.render(white_time_str, True, (255, 255, 255))
         black_text = font.render(black_time_str, True, (255, 255, 255))
@@ -169,58 +236,20 @@ class Board:
         # Расположение таймеров
         screen.blit(white_text, (panel_center_x - white_text.get_width() // 2, self.screen_height - 50))
         screen.blit(black_text, (panel_center_x - black_text.get_width() // 2, self.info_panel_y))
+        return [panel_rect]
 
-    def add_pieces(self):
+    def get_fen(self):
         """
-        Добавляет фигуры на доску.
+        Возвращает текущую позицию в формате FEN.
         """
-        # Добавляем черные пешки
-        for col in range(8):
-            pawn = Pawn("black", (1, col), self.cell_size, self.board_start_x, self.board_start_y)
-            pawn.board = self  # Добавляем ссылку на доску
-            self.grid[1][col] = pawn
-
-        # Добавляем белые пешки
-        for col in range(8):
-            pawn = Pawn("white", (6, col), self.cell_size, self.board_start_x, self.board_start_y)
-            pawn.board = self
-            self.grid[6][col] = pawn
-
-        # Добавляем черные ладьи
-        self.grid[0][0] = Rook("black", (0, 0), self.cell_size, self.board_start_x, self.board_start_y)
-        self.grid[0][7] = Rook("black", (0, 7), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем белые ладьи
-        self.grid[7][0] = Rook("white", (7, 0), self.cell_size, self.board_start_x, self.board_start_y)
-        self.grid[7][7] = Rook("white", (7, 7), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем черных коней
-        self.grid[0][1] = Knight("black", (0, 1), self.cell_size, self.board_start_x, self.board_start_y)
-        self.grid[0][6] = Knight("black", (0, 6), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем белых коней
-        self.grid[7][1] = Knight("white", (7, 1), self.cell_size, self.board_start_x, self.board_start_y)
-        self.grid[7][6] = Knight("white", (7, 6), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем черных слонов
-        self.grid[0][2] = Bishop("black", (0, 2), self.cell_size, self.board_start_x, self.board_start_y)
-        self.grid[0][5] = Bishop("black", (0, 5), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем белых слонов
-        self.grid[7][2] = Bishop("white", (7, 2), self.cell_size, self.board_start_x, self.board_start_y)
-        self.grid[7][5] = Bishop("white", (7, 5), self.cell_size, self.board_start_x, self.board_start_y)
+        return self.position.to_fen()
 
-        # Добавляем черную королеву
-        self.grid[0][3] = Queen("black", (0, 3), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем белую королеву
-        self.grid[7][3] = Queen("white", (7, 3), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем черного короля
-        self.grid[0][4] = King("black", (0, 4), self.cell_size, self.board_start_x, self.board_start_y)
-
-        # Добавляем белого короля
-        self.grid[7][4] = King("white", (7, 4), self.cell_size, self.board_start_x, self.board_start_y)
+    def invalidate(self):
+        """
+        Помечает доску и панель для полной перерисовки на следующем кадре.
+        """
+        self.renderer.invalidate()
+        self.panel_texts = None
 
     def find_king_position(self, color):
         """
@@ -228,12 +257,7 @@ class Board:
         :param color: Цвет короля ("black" или "white").
         :return: Позиция короля в виде кортежа (row, col).
         """
-        for row in range(8):
-            for col in range(8):
-                piece = self.grid[row][col]
-                if isinstance(piece, King) and piece.color == color:
-                    return row, col
-        return None
+        return self.position.find_king_position(color)
 
     def is_king_in_check(self, color):
         return self.state_checker.is_king_in_check(color)
@@ -245,77 +269,137 @@ class Board:
         return self.state_checker.is_stalemate(color)
 
     def get_king_position(self, color):
-        return self.state_checker.find_king_position(color)
+        return self.position.find_king_position(color)
 
     def draw(self, screen):
-        self.renderer.draw(screen)
+        """
+        Отрисовка доски.
+        :return: Список изменившихся прямоугольников экрана.
+        """
+        return self.renderer.draw(screen)
 
-    def handle_click(self, row, col):
+    def handle_click(self, row, col, promotion=None):
+        """
+        Обрабатывает клик по клетке доски.
+        :param promotion: Фигура превращения ("q", "r", "b", "n"), если она известна заранее.
+        """
         if 0 <= row < 8 and 0 <= col < 8:  # Проверка границ доски
-            self.move_handler.handle_click(row, col)
+            self.move_handler.handle_click(row, col, promotion)
         else:
             self.selected_piece = None
             self.valid_moves = []
             return
 
-    def run(self):
+    def start(self, screen):
         """
-        Основной игровой цикл для шахматной доски.
+        Начинает показ партии: экран очищается один раз, дальше перерисовываются только изменившиеся области.
+        :param screen: Экран.
         """
-        screen = pygame.display.set_mode((self.screen_width, self.screen_height))
         pygame.display.set_caption("Game")
+        screen.fill((0, 0, 0))
+        pygame.display.flip()
+        self.invalidate()
+        self.promotion_shown = False
+        self.last_time_update = pygame.time.get_ticks()
 
-        running = True
-        game_over = False
+    def update(self, screen):
+        """
+        Один кадр партии: отрисовка, таймеры, проверка окончания и ход компьютера.
+        :param screen: Экран.
+        :return: Список изменившихся прямоугольников экрана.
+        """
+        if self.game_over:
+            return []  # Сообщение о результате остаётся на экране
+
+        dirty = self.draw(screen)
 
-        while running and not game_over:
-            screen.fill((0, 0, 0))
-            self.draw(screen)
+        # Меню превращения рисуется поверх доски, пока игрок не выберет фигуру
+        if self.promotion_active and not self.promotion_shown:
+            dirty.append(self.draw_promotion_menu(screen, self.promotion_pawn))
+            self.promotion_shown = True
 
-            # Отрисовываем таймеры
-            self.draw_timers(screen)
+        # Отрисовываем таймеры
+        dirty += self.draw_timers(screen)
 
-            # Обновляем таймеры
-            if self.update_timers(screen):
-                game_over = True  # Время одного из игроков истекло
+        # Обновляем таймеры
+        if self.update_timers(screen):
+            return dirty  # Время одного из игроков истекло
 
-            if not game_over:
-                if self.is_checkmate("white"):
-                    self.show_message(screen, "Мат! Черные победили.")
-                    game_over = True
-                elif self.is_checkmate("black"):
-                    self.show_message(screen, "Мат! Белые победили.")
-                    game_over = True
-                elif self.is_stalemate("white") or self.is_stalemate("black"):
-                    self.show_message(screen, "Пат! Ничья.")
-                    game_over = True
+        # Состояние партии вычисляется один раз после хода, здесь берётся из кэша
+        status = self.position.get_status()
+        if status.is_over:
+            self.end_game(screen, status.get_message(), status.get_result())
+            return dirty
 
-            pygame.display.flip()
+        # Ход компьютера (если режим "human_vs_ai" и текущий игрок — чёрные)
+        if self.is_ai_turn():
+            self.make_ai_move()
+        return dirty
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
+    def handle_event(self, event):
+        """
+        Обрабатывает событие pygame: клики по доске и по меню превращения.
+        :param event: Событие.
+        """
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1 or self.game_over:
+            return
 
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and not game_over:
-                    mouse_pos = pygame.mouse.get_pos()
+        if self.promotion_active:
+            # Ход пешки ждёт выбора фигуры: остальные клики игнорируются
+            if self.handle_promotion_click(event.pos):
+                self.move_handler.complete_promotion(self.promotion_piece.symbol.lower())
+                self.promotion_shown = False
+                # Меню закрывало часть доски — перерисовываем её целиком
+                self.invalidate()
+        elif not self.is_ai_turn():
+            mouse_pos = event.pos
+
+            # Проверяем, что клик был в пределах доски
+            if (self.board_start_x <= mouse_pos[0] < self.board_start_x + 8 * self.cell_size and
+                    self.board_start_y <= mouse_pos[1] < self.board_start_y + 8 * self.cell_size):
+                # Конвертируем координаты только для кликов внутри доски
+                row = (mouse_pos[1] - self.board_start_y) // self.cell_size
+                col = (mouse_pos[0] - self.board_start_x) // self.cell_size
+                self.handle_click(row, col)
+
+    def is_idle(self):
+        """
+        Может ли игровой цикл спать до следующего события: пока компьютер думает, его нужно опрашивать.
+        """
+        return self.game_over or not self.is_ai_turn()
 
-                    # Проверяем, что клик был в пределах доски
-                    if (self.board_start_x <= mouse_pos[0] < self.board_start_x + 8 * self.cell_size and
-                            self.board_start_y <= mouse_pos[1] < self.board_start_y + 8 * self.cell_size):
-                        # Конвертируем координаты только для кликов внутри доски
-                        row = (mouse_pos[1] - self.board_start_y) // self.cell_size
-                        col = (mouse_pos[0] - self.board_start_x) // self.cell_size
-                        self.handle_click(row, col)
+    def is_finished(self):
+        """
+        Закончена ли партия и показано ли сообщение о результате достаточно долго.
+        """
+        return self.game_over and pygame.time.get_ticks() - self.game_over_time >= MESSAGE_TIME
 
-            # Ход компьютера (если режим "human_vs_ai" и текущий игрок — чёрные)
-            if self.mode == "human_vs_ai" and self.current_player == "black" and not game_over:
-                self.make_ai_move()
+    def close(self):
+        """
+        Освобождает ресурсы партии: останавливает поиск компьютера и закрывает запись ходов.
+        """
+        if self.mode == "human_vs_ai":
+            self.ai.close()
+        self.move_handler.close()
 
-        self.return_to_main_menu()
+    def end_game(self, screen, message, result, termination="normal"):
+        """
+        Завершает партию: прерывает поиск компьютера, дописывает запись и показывает результат.
+        :param screen: Экран.
+        :param message: Текст о результате.
+        :param result: Результат в формате PGN ("1-0", "0-1", "1/2-1/2").
+        :param termination: Причина окончания для заголовка Termination.
+        """
+        # Если время вышло, пока компьютер думал, поиск не должен работать до закрытия сцены
+        if self.mode == "human_vs_ai":
+            self.ai.cancel()
+        self.move_handler.finish(result, termination, message)
+        self.show_message(screen, message)
 
     def show_message(self, screen, message):
         """
-        Отображает сообщение о результате игры.
+        Отображает сообщение о результате игры и завершает партию.
+        Сообщение висит MESSAGE_TIME миллисекунд, игровой цикл при этом не блокируется.
         :param screen: Экран, на котором отрисовывается сообщение.
         :param message: Текст сообщения.
         """
@@ -324,21 +408,26 @@ class Board:
         text_rect = text.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
         screen.blit(text, text_rect)
         pygame.display.flip()
-        pygame.time.wait(3000)
+        self.game_over = True
+        self.game_over_time = pygame.time.get_ticks()
 
-    def return_to_main_menu(self):
+    def is_ai_turn(self):
         """
-        Возвращает игру в главное меню.
+        Проверяет, должен ли сейчас ходить компьютер.
         """
-        from main import main
-        main()
+        return self.mode == "human_vs_ai" and self.current_player == "black"
 
     def make_ai_move(self):
         """
-        Выполняет ход компьютера.
+        Выполняет ход компьютера: отправляет позицию на поиск, а когда ход готов — делает его.
+        Вызывается на каждом кадре и не блокирует игровой цикл.
         """
-        move = self.ai.get_random_move()
+        if not self.ai.thinking:
+            self.ai.request_move(self.position)
+            return
+
+        move = self.ai.poll()
         if move:
-            (start_row, start_col), (end_row, end_col) = move
+            (start_row, start_col), (end_row, end_col), promotion = move
             self.move_handler.handle_click(start_row, start_col)  # Выбираем фигуру
-            self.move_handler.handle_click(end_row, end_col)  # Выполняем ход
+            self.move_handler.handle_click(end_row, end_col, promotion)  # Выполняем ход, превращение без меню
@@ -1,43 +1,82 @@
 import pygame
 
+from classes.sprites import get_atlas, get_piece_sprite, piece_image_name
+
 
 class BoardRenderer:
-    def __init__(self, board, start_x, start_y, cell_size, border_size):
+    def __init__(self, board, start_x, start_y, cell_size, border_size, use_atlas=False):
         self.board = board
         self.start_x = start_x
         self.start_y = start_y
         self.cell_size = cell_size
         self.border_size = border_size
         self.font = pygame.font.Font(None, 36)
+        self.use_atlas = use_atlas  # Копировать фигуры из общего атласа вместо отдельных изображений
+        self.background = None  # Рамка, клетки и подписи, отрисованные один раз
+        self.drawn_squares = {}  # Что сейчас нарисовано на клетках: (фигура, подсветка хода, подсветка шаха)
+        self.drawn_signature = None  # Ключ позиции, допустимые ходы и шах на момент последней отрисовки
+        self.full_redraw = True  # Нужно ли перерисовать доску целиком
 
-    def draw(self, screen):
+    def get_piece_image(self, piece):
         """
-        Отрисовка доски и фигур.
-        :param screen: Экран, на котором отрисовывается доска.
+        Возвращает изображение фигуры, масштабированное под размер клетки.
+        :param piece: Фигура.
+        :return: Поверхность pygame с изображением фигуры.
         """
-        pygame.draw.rect(
-            screen,
-            (200, 200, 200),  # Цвет рамки
-            (
-                self.start_x - self.border_size,
-                self.start_y - self.border_size,
-                self.cell_size * 8 + 2 * self.border_size,
-                self.cell_size * 8 + 2 * self.border_size
-            )
+        return get_piece_sprite(piece.color, piece.symbol, self.cell_size)
+
+    def blit_piece(self, screen, piece, rect):
+        """
+        Рисует фигуру в прямоугольнике клетки.
+        :param screen: Экран.
+        :param piece: Фигура.
+        :param rect: Прямоугольник клетки.
+        """
+        if self.use_atlas:
+            atlas, rects = get_atlas(self.cell_size)
+            screen.blit(atlas, rect, rects[piece_image_name(piece.color, piece.symbol)])
+        else:
+            screen.blit(self.get_piece_image(piece), rect)
+
+    def invalidate(self):
+        """
+        Помечает доску для полной перерисовки (например, после того как экран был закрыт другим изображением).
+        """
+        self.full_redraw = True
+
+    def get_frame_rect(self):
+        """
+        Возвращает прямоугольник доски вместе с рамкой и подписями.
+        """
+        return pygame.Rect(
+            self.start_x - self.border_size,
+            self.start_y - self.border_size,
+            self.cell_size * 8 + 2 * self.border_size,
+            self.cell_size * 8 + 2 * self.border_size
         )
 
-        # Отрисовка клеток
+    def get_square_rect(self, row, col):
+        """
+        Возвращает прямоугольник клетки на экране.
+        """
+        return pygame.Rect(self.start_x + col * self.cell_size, self.start_y + row * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def build_background(self, screen):
+        """
+        Один раз рисует рамку, клетки и подписи на отдельной поверхности.
+        :param screen: Экран (для совпадения формата пикселей).
+        """
+        frame = self.get_frame_rect()
+        background = pygame.Surface(frame.size, 0, screen)
+        background.fill((200, 200, 200))  # Цвет рамки
+
+        # Клетки
         colors = [(235, 235, 208), (119, 149, 86)]
         for row in range(8):
             for col in range(8):
-                x = self.start_x + col * self.cell_size
-                y = self.start_y + row * self.cell_size
-                color = colors[(row + col) % 2]
-                pygame.draw.rect(screen, color, (x, y, self.cell_size, self.cell_size))
-
-                # Подсветка допустимых ходов
-                if (row, col) in self.board.valid_moves:
-                    pygame.draw.rect(screen, (255, 0, 0), (x, y, self.cell_size, self.cell_size), 3)
+                rect = self.get_square_rect(row, col).move(-frame.x, -frame.y)
+                pygame.draw.rect(background, colors[(row + col) % 2], rect)
 
         # Подписи столбцов (a-h)
         for col in range(8):
@@ -45,11 +84,11 @@ class BoardRenderer:
             text = self.font.render(letter, True, (0, 0, 0))
             text_rect = text.get_rect(
                 center=(
-                    self.start_x + col * self.cell_size + self.cell_size//2,
-                    self.start_y + 8 * self.cell_size + self.border_size//2
+                    self.border_size + col * self.cell_size + self.cell_size//2,
+                    self.border_size + 8 * self.cell_size + self.border_size//2
                 )
             )
-            screen.blit(text, text_rect)
+            background.blit(text, text_rect)
 
         # Подписи строк (1-8)
         for row in range(8):
@@ -57,22 +96,72 @@ class BoardRenderer:
             text = self.font.render(number, True, (0, 0, 0))
             text_rect = text.get_rect(
                 center=(
-                    self.start_x - self.border_size//2,
-                    self.start_y + row * self.cell_size + self.cell_size//2
+                    self.border_size//2,
+                    self.border_size + row * self.cell_size + self.cell_size//2
                 )
             )
-            screen.blit(text, text_rect)
+            background.blit(text, text_rect)
+
+        self.background = background
+
+    def draw_square(self, screen, row, col, state):
+        """
+        Перерисовывает одну клетку: фон, подсветку допустимого хода, фигуру и подсветку шаха.
+        :param screen: Экран.
+        :param row: Строка клетки.
+        :param col: Столбец клетки.
+        :param state: (фигура или None, подсвечен ли ход, подсвечен ли шах).
+        """
+        piece, is_valid_move, is_check = state
+        rect = self.get_square_rect(row, col)
+        frame = self.get_frame_rect()
+        screen.blit(self.background, rect, rect.move(-frame.x, -frame.y))
+
+        # Подсветка допустимых ходов
+        if is_valid_move:
+            pygame.draw.rect(screen, (255, 0, 0), rect, 3)
+        if piece is not None:
+            self.blit_piece(screen, piece, rect)
+        # Подсветка короля под шахом
+        if is_check:
+            pygame.draw.rect(screen, (255, 0, 0, 100), rect, 5)
 
-        # Отрисовка фигур
+    def draw(self, screen):
+        """
+        Отрисовка доски и фигур. Перерисовываются только клетки, которые изменились с прошлого кадра.
+        :param screen: Экран, на котором отрисовывается доска.
+        :return: Список изменившихся прямоугольников экрана (для pygame.display.update).
+        """
+        if self.background is None:
+            self.build_background(screen)
+
+        position = self.board.position
+        status = position.get_status()
+        check_square = position.find_king_position(position.current_player) if status.in_check else None
+        signature = (position.zobrist_key, tuple(self.board.valid_moves), check_square)
+        if not self.full_redraw and signature == self.drawn_signature:
+            return []  # Ничего не изменилось
+
+        dirty = []
+        if self.full_redraw:
+            frame = self.get_frame_rect()
+            screen.blit(self.background, frame)
+            self.drawn_squares = {}
+            dirty.append(frame)
+
+        valid_moves = set(self.board.valid_moves)
+        empty = (None, False, False)  # Так клетка выглядит на фоне
         for row in range(8):
             for col in range(8):
-                piece = self.board.grid[row][col]
-                if piece:
-                    piece.draw(screen)
+                piece = position.grid[row][col]
+                state = (piece, (row, col) in valid_moves, (row, col) == check_square)
+                if self.drawn_squares.get((row, col), empty) == state:
+                    continue
+                self.draw_square(screen, row, col, state)
+                self.drawn_squares[(row, col)] = state
+                if not self.full_redraw:
+                    dirty.append(self.get_square_rect(row, col))
 
-        # Подсветка короля под шахом
-        current_player_king_pos = self.board.get_king_position(self.board.current_player)
-        if self.board.state_checker.is_king_in_check(self.board.current_player):
-            x = self.start_x + current_player_king_pos[1] * self.cell_size
-            y = self.start_y + current_player_king_pos[0] * self.cell_size
-            pygame.draw.rect(screen, (255, 0, 0, 100), (x, y, self.cell_size, self.cell_size), 5)
+        self.drawn_signature = signature
+        self.full_redraw = False
+        return dirty
@@ -0,0 +1,354 @@
+"""
+Поиск лучшего хода: негамакс с альфа-бета отсечением, форсированным вариантом (quiescence)
+и итеративным углублением с ограничением по времени и числу узлов.
+"""
+import random
+import time
+
+from classes.bitboard import PIECE_INDEX, BitboardMoveGenerator, is_in_check
+from classes.evaluation import PIECE_VALUES, evaluate
+from classes.tablebase import LOSS, WIN, Tablebases
+from classes.notation import move_to_uci
+from classes.transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND, TranspositionTable
+
+MATE_SCORE = 100000
+INFINITY = 10 ** 9
+# Оценки выше этого порога означают найденный мат
+MATE_THRESHOLD = MATE_SCORE - 1000
+
+# Частота проверки лимитов (в узлах)
+CHECK_INTERVAL = 1024
+
+
+class SearchEngine:
+    def __init__(self, position, max_depth=64, time_limit=1.0, node_limit=None, hash_mb=16, stop_event=None,
+                 transposition_table=None, helper_id=0, tablebases=None):
+        """
+        Движок, выбирающий ход перебором.
+        :param position: Позиция (Position), в которой играет компьютер.
+        :param max_depth: Максимальная глубина итеративного углубления.
+        :param time_limit: Лимит времени на ход в секундах (None — без лимита).
+        :param node_limit: Лимит узлов на ход (None — без лимита).
+        :param hash_mb: Размер таблицы транспозиций в мегабайтах.
+        :param stop_event: Событие (threading/multiprocessing), установка которого прерывает поиск
+                           из другого потока или процесса.
+        :param transposition_table: Готовая таблица транспозиций (например, общая для нескольких процессов).
+        :param helper_id: Номер помощника при параллельном поиске: помощники (helper_id > 0) начинают
+                          с другой глубины и перемешивают тихие ходы, чтобы не повторять работу основного поиска.
+        :param tablebases: Папка с таблицами эндшпиля (classes/tablebase.py) или None. Позиции из таблиц
+                           не перебираются: оценка и ход берутся из таблицы.
+        """
+        self.position = position
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.stop_event = stop_event
+        self.generator = BitboardMoveGenerator()
+        self.transposition_table = transposition_table or TranspositionTable(hash_mb)
+        self.helper_id = helper_id
+        self.random = random.Random(helper_id)
+        self.tablebases = Tablebases(tablebases) if tablebases else None
+
+        self.nodes = 0
+        self.deadline = None
+        self.stopped = False
+        self.killers = []
+        self.previous_pv = []
+        self.last_info = {}  # Глубина, оценка, узлы, скорость и главный вариант последнего поиска
+
+    def stop(self):
+        """
+        Прерывает текущий поиск; get_best_move вернёт лучший ход последней завершённой итерации.
+        """
+        self.stopped = True
+
+    def get_best_move(self, position=None):
+        """
+        Ищет лучший ход итеративным углублением.
+        :param position: Позиция (по умолчанию та, что передана в конструктор).
+        :return: Кортеж ((start_row, start_col), (end_row, end_col), promotion) или None, если ходов нет.
+        """
+        position = position or self.position
+        moves = self.generator.get_all_valid_moves(position, position.current_player)
+        if not moves:
+            return None
+        if self.tablebases is not None:
+            move = self.get_tablebase_move(position, moves)
+            if move is not None:
+                return move
+
+        self.nodes = 0
+        self.stopped = False
+        self.killers = [[None, None] for _ in range(self.max_depth + 1)]
+        self.previous_pv = []
+        self.transposition_table.new_search()
+        start_time = time.perf_counter()
+        self.deadline = start_time + self.time_limit if self.time_limit else None
+
+        best_move = moves[0]
+        self.last_info = {"depth": 0, "score": 0, "nodes": 0, "time": 0.0, "nps": 0, "pv": []}
+        for depth in range(1 + self.helper_id % 2, self.max_depth + 1):
+            pv = []
+            score = self.negamax(position, depth, -INFINITY, INFINITY, 0, pv)
+            if self.stopped or not pv:
+                break
+
+            best_move = pv[0]
+            self.previous_pv = pv
+            elapsed = time.perf_counter() - start_time
+            self.last_info = {
+                "depth": depth,
+                "score": score,
+                "nodes": self.nodes,
+                "time": elapsed,
+                "nps": int(self.nodes / max(elapsed, 1e-9)),
+                "pv": [move_to_uci(move) for move in pv],
+            }
+            # Найден мат — глубже искать незачем
+            if abs(score) >= MATE_THRESHOLD:
+                break
+
+        self.last_info["nodes"] = self.nodes
+        self.last_info["time"] = time.perf_counter() - start_time
+        self.last_info["nps"] = int(self.nodes / max(self.last_info["time"], 1e-9))
+        self.last_info["hash"] = self.transposition_table.get_stats()
+        return best_move
+
+    def get_tablebase_move(self, position, moves):
+        """
+        Выбирает ход по таблицам эндшпиля: самый быстрый мат, иначе ничья, иначе самое долгое сопротивление.
+        :return: Ход или None, если позиции нет в таблицах.
+        """
+        if self.tablebases.probe(position) is None:
+            return None
+        best_move = None
+        best_score = -INFINITY
+        for move in moves:
+            undo = position.make_move(*move)
+            result = self.tablebases.probe(position)
+            position.unmake_move(undo)
+            if result is None:
+                return None
+            outcome, plies = result  # С точки зрения соперника
+            score = MATE_SCORE - plies - 1 if outcome == LOSS else -MATE_SCORE + plies + 1 if outcome == WIN else 0
+            if score > best_score:
+                best_score = score
+                best_move = move
+        self.last_info = {"depth": 0, "score": best_score, "nodes": len(moves), "time": 0.0, "nps": 0,
+                          "pv": [move_to_uci(best_move)], "tablebase": True}
+        return best_move
+
+    def check_limits(self):
+        """
+        Останавливает поиск, если исчерпан лимит времени или узлов.
+        """
+        if self.node_limit and self.nodes >= self.node_limit:
+            self.stopped = True
+        elif self.nodes % CHECK_INTERVAL == 0:
+            if self.deadline and time.perf_counter() >= self.deadline:
+                self.stopped = True
+            elif self.stop_event is not None and self.stop_event.is_set():
+                self.stopped = True
+
+    def negamax(self, position, depth, alpha, beta, ply, pv):
+        """
+        Негамакс с альфа-бета отсечением.
+        :param position: Позиция (Position).
+        :param depth: Оставшаяся глубина.
+        :param alpha: Нижняя граница окна.
+        :param beta: Верхняя граница окна.
+        :param ply: Расстояние от корня в полуходах.
+        :param pv: Список, в который записывается главный вариант из этого узла.
+        :return: Оценка позиции с точки зрения ходящего.
+        """
+        # Повторение и правило 50 ходов — ничья (игра засчитывает их сама, см. GameStateChecker)
+        if ply > 0 and self.is_draw(position):
+            return 0
+
+        if self.tablebases is not None and ply > 0:
+            result = self.tablebases.probe(position)
+            if result is not None:
+                self.nodes += 1
+                self.check_limits()  # Иначе значение, кратное CHECK_INTERVAL, может пройти без проверки
+                outcome, plies = result
+                if outcome == WIN:
+                    return MATE_SCORE - ply - plies
+                return -MATE_SCORE + ply + plies if outcome == LOSS else 0
+
+        if depth <= 0:
+            return self.quiescence(position, alpha, beta)
+
+        self.nodes += 1
+        self.check_limits()
+        if self.stopped:
+            return 0
+
+        key = position.zobrist_key
+        entry = self.transposition_table.probe(key)
+        table_move = None
+        if entry:
+            entry_depth, entry_score, bound, table_move = entry
+            # В корне нужен главный вариант, поэтому там результатом таблицы не ограничиваемся
+            if ply > 0 and entry_depth >= depth:
+                entry_score = self.score_from_table(entry_score, ply)
+                if (bound == EXACT or (bound == LOWER_BOUND and entry_score >= beta)
+                        or (bound == UPPER_BOUND and entry_score <= alpha)):
+                    if table_move:
+                        pv[:] = [table_move]
+                    return entry_score
+
+        moves = self.generator.get_all_valid_moves(position, position.current_player)
+        if not moves:
+            # Мат (чем ближе, тем хуже для проигрывающего) или пат
+            return -MATE_SCORE + ply if is_in_check(position, position.current_player) else 0
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        best_move = None
+        for move in self.order_moves(position, moves, ply, table_move):
+            child_pv = []
+            undo = position.make_move(*move)
+            score = -self.negamax(position, depth - 1, -beta, -alpha, ply + 1, child_pv)
+            position.unmake_move(undo)
+            if self.stopped:
+                return 0
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+                pv[:] = [move] + child_pv
+            if alpha >= beta:
+                if not self.is_capture(position, move) and ply < len(self.killers):
+                    killers = self.killers[ply]
+                    if killers[0] != move:
+                        killers[1] = killers[0]
+                        killers[0] = move
+                break
+
+        if best_score <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_score >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.transposition_table.store(key, depth, self.score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    @staticmethod
+    def is_draw(position):
+        """
+        Проверяет ничью по правилу 50 ходов или повторению позиции.
+        В поиске достаточно одного повторения: если позицию можно повторить, можно повторить и трижды.
+        :param position: Позиция (Position).
+        """
+        if position.halfmove_clock >= 100:
+            return True
+        history = position.history
+        key = position.zobrist_key
+        # Позиция могла повториться только после последнего взятия или хода пешкой и при том же ходящем
+        for index in range(len(history) - 2, max(len(history) - position.halfmove_clock, 0) - 1, -2):
+            if history[index] == key:
+                return True
+        return False
+
+    @staticmethod
+    def score_to_table(score, ply):
+        """
+        Переводит оценку мата в расстояние от текущего узла, чтобы она не зависела от пути к позиции.
+        """
+        if score >= MATE_THRESHOLD:
+            return score + ply
+        if score <= -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def score_from_table(score, ply):
+        """
+        Обратное преобразование к score_to_table.
+        """
+        if score >= MATE_THRESHOLD:
+            return score - ply
+        if score <= -MATE_THRESHOLD:
+            return score + ply
+        return score
+
+    def quiescence(self, position, alpha, beta):
+        """
+        Продолжает перебор только взятиями и превращениями, чтобы не оценивать позицию посреди размена.
+        """
+        self.nodes += 1
+        self.check_limits()
+        if self.stopped:
+            return 0
+
+        stand_pat = evaluate(position)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        moves = self.generator.get_all_valid_moves(position, position.current_player)
+        captures = [move for move in moves if move[2] or self.is_capture(position, move)]
+        captures.sort(key=lambda move: self.capture_score(position, move), reverse=True)
+        for move in captures:
+            undo = position.make_move(*move)
+            score = -self.quiescence(position, -beta, -alpha)
+            position.unmake_move(undo)
+            if self.stopped:
+                return 0
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    @staticmethod
+    def is_capture(position, move):
+        """
+        Проверяет, является ли ход взятием (включая взятие на проходе).
+        """
+        start, end, _ = move
+        if position.grid[end[0]][end[1]] is not None:
+            return True
+        piece = position.grid[start[0]][start[1]]
+        return piece.symbol == "P" and start[1] != end[1]
+
+    @staticmethod
+    def capture_score(position, move):
+        """
+        Оценка взятия для сортировки: ценная жертва, дешёвый нападающий (MVV-LVA), плюс превращение.
+        """
+        start, end, promotion = move
+        attacker = position.grid[start[0]][start[1]]
+        victim = position.grid[end[0]][end[1]]
+        score = 10 * PIECE_VALUES[PIECE_INDEX[victim.symbol]] if victim else 10 * PIECE_VALUES[0]
+        score -= PIECE_VALUES[PIECE_INDEX[attacker.symbol]]
+        if promotion == "q":
+            score += 10 * PIECE_VALUES[PIECE_INDEX["Q"]]
+        return score
+
+    def order_moves(self, position, moves, ply, table_move=None):
+        """
+        Упорядочивает ходы: ход из таблицы транспозиций, ход главного варианта прошлой итерации,
+        взятия, ходы-убийцы, остальные.
+        """
+        pv_move = self.previous_pv[ply] if ply < len(self.previous_pv) else None
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+
+        def score(move):
+            if move == table_move:
+                return INFINITY + 1
+            if move == pv_move:
+                return INFINITY
+            if move[2] or self.is_capture(position, move):
+                return 100000 + self.capture_score(position, move)
+            if move == killers[0]:
+                return 90000
+            if move == killers[1]:
+                return 80000
+            return self.random.random() if self.helper_id else 0
+
+        return sorted(moves, key=score, reverse=True)
@@ -0,0 +1,107 @@
+"""
+Оценка позиции: материал и таблицы «фигура-клетка».
+
+Таблицы записаны для белых в порядке клеток Position.grid (первая строка — восьмая горизонталь),
+для чёрных используется зеркальная клетка square ^ 56.
+"""
+
+from classes.bitboard import COLOR_INDEX
+
+# Стоимость фигур в сотых долях пешки, порядок как в PIECE_INDEX (P, N, B, R, Q, K)
+PIECE_VALUES = [100, 320, 330, 500, 900, 0]
+
+PAWN_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    50, 50, 50, 50, 50, 50, 50, 50,
+    10, 10, 20, 30, 30, 20, 10, 10,
+    5, 5, 10, 25, 25, 10, 5, 5,
+    0, 0, 0, 20, 20, 0, 0, 0,
+    5, -5, -10, 0, 0, -10, -5, 5,
+    5, 10, 10, -20, -20, 10, 10, 5,
+    0, 0, 0, 0, 0, 0, 0, 0,
+]
+KNIGHT_TABLE = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20, 0, 0, 0, 0, -20, -40,
+    -30, 0, 10, 15, 15, 10, 0, -30,
+    -30, 5, 15, 20, 20, 15, 5, -30,
+    -30, 0, 15, 20, 20, 15, 0, -30,
+    -30, 5, 10, 15, 15, 10, 5, -30,
+    -40, -20, 0, 5, 5, 0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+BISHOP_TABLE = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 10, 10, 5, 0, -10,
+    -10, 5, 5, 10, 10, 5, 5, -10,
+    -10, 0, 10, 10, 10, 10, 0, -10,
+    -10, 10, 10, 10, 10, 10, 10, -10,
+    -10, 5, 0, 0, 0, 0, 5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+ROOK_TABLE = [
+    0, 0, 0, 0, 0, 0, 0, 0,
+    5, 10, 10, 10, 10, 10, 10, 5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    -5, 0, 0, 0, 0, 0, 0, -5,
+    0, 0, 0, 5, 5, 0, 0, 0,
+]
+QUEEN_TABLE = [
+    -20, -10, -10, -5, -5, -10, -10, -20,
+    -10, 0, 0, 0, 0, 0, 0, -10,
+    -10, 0, 5, 5, 5, 5, 0, -10,
+    -5, 0, 5, 5, 5, 5, 0, -5,
+    0, 0, 5, 5, 5, 5, 0, -5,
+    -10, 5, 5, 5, 5, 5, 0, -10,
+    -10, 0, 5, 0, 0, 0, 0, -10,
+    -20, -10, -10, -5, -5, -10, -10, -20,
+]
+KING_TABLE = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+    20, 20, 0, 0, 0, 0, 20, 20,
+    20, 30, 10, 0, 0, 10, 30, 20,
+]
+PIECE_TABLES = [PAWN_TABLE, KNIGHT_TABLE, BISHOP_TABLE, ROOK_TABLE, QUEEN_TABLE, KING_TABLE]
+
+
+def _build_square_scores():
+    """
+    Строит таблицы SQUARE_SCORES[цвет * 6 + тип фигуры][клетка]: стоимость фигуры плюс бонус клетки
+    с точки зрения белых (для чёрных — со знаком минус).
+    """
+    tables = []
+    for color in range(2):
+        sign = 1 if color == 0 else -1
+        for piece_type in range(6):
+            table = PIECE_TABLES[piece_type]
+            tables.append([sign * (PIECE_VALUES[piece_type] + table[square if color == 0 else square ^ 56])
+                           for square in range(64)])
+    return tables
+
+
+SQUARE_SCORES = _build_square_scores()
+
+
+def evaluate(position):
+    """
+    Оценивает позицию с точки зрения игрока, чей сейчас ход.
+    :param position: Позиция (Position).
+    :return: Оценка в сотых долях пешки (больше — лучше для ходящего).
+    """
+    score = 0
+    for index, bitboard in enumerate(position.bitboards):
+        scores = SQUARE_SCORES[index]
+        while bitboard:
+            low = bitboard & -bitboard
+            score += scores[low.bit_length() - 1]
+            bitboard ^= low
+    return score if COLOR_INDEX[position.current_player] == 0 else -score
@@ -0,0 +1,46 @@
+"""
+Общий для всех экранов игровой цикл без холостой загрузки процессора.
+
+Пока что-то меняется само (например, компьютер думает), цикл крутится не чаще заданной частоты кадров.
+Когда ничего не происходит, цикл спит в pygame.event.wait до ближайшего события; чтобы часы
+на экране продолжали идти, можно включить таймерное событие TICK_EVENT.
+"""
+
+import pygame
+
+DEFAULT_FPS = 60  # Ограничение частоты кадров по умолчанию
+TICK_EVENT = pygame.USEREVENT + 1  # Таймерное событие, будящее цикл в режиме ожидания
+
+
+class FrameClock:
+    def __init__(self, fps=DEFAULT_FPS, tick_interval=0):
+        """
+        Ограничитель кадров и ожидание событий.
+        :param fps: Максимальная частота кадров (0 — без ограничения).
+        :param tick_interval: Период таймерного события TICK_EVENT в миллисекундах (0 — без таймера).
+        """
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+        self.tick_interval = tick_interval
+        if tick_interval:
+            pygame.time.set_timer(TICK_EVENT, tick_interval)
+
+    def get_events(self, idle=True):
+        """
+        Ждёт следующего кадра и возвращает накопившиеся события.
+        :param idle: True — на экране ничего не меняется само, можно спать до первого события;
+                     False — цикл должен продолжаться, события забираются без ожидания.
+        :return: Список событий pygame.
+        """
+        self.clock.tick(self.fps)
+        if idle:
+            return [pygame.event.wait()] + pygame.event.get()
+        return pygame.event.get()
+
+    def stop(self):
+        """
+        Отключает таймерное событие (при выходе с экрана).
+        """
+        if self.tick_interval:
+            pygame.time.set_timer(TICK_EVENT, 0)
+            self.tick_interval = 0
@@ -0,0 +1,275 @@
+"""
+Запись партий в формате PGN.
+
+Ходы копятся в GameRecord, а на диск их пишет один общий фоновый поток (RecordWriter),
+поэтому игровой цикл не ждёт диска. Когда запись сбрасывается на диск, определяет политика
+надёжности: после каждого хода, после каждых N ходов или только в конце партии.
+По ходу партии в файл дописываются только новые ходы (заголовки — при первом сбросе), и такой файл
+читается как партия с результатом "*". В конце партии файл перезаписывается целиком через временный
+файл с os.fsync: с результатом, заголовком Termination и комментарием.
+"""
+
+import atexit
+import datetime
+import logging
+import os
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Политики надёжности записи (кроме них можно передать число N — сброс каждые N полуходов)
+DURABILITY_MOVE = "move"
+DURABILITY_END = "end"
+
+# Порядок обязательных заголовков PGN (Seven Tag Roster)
+SEVEN_TAG_ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+LINE_LENGTH = 80  # Максимальная длина строки с ходами
+
+
+def default_headers():
+    """
+    Заголовки Seven Tag Roster, которые не зависят от партии (White, Black и Result задаются отдельно).
+    :return: Словарь Event, Site, Date (сегодняшняя дата) и Round.
+    """
+    return {"Event": "Casual game", "Site": "ChessPyGame",
+            "Date": datetime.date.today().strftime("%Y.%m.%d"), "Round": "-"}
+
+
+def format_headers(headers, result):
+    """
+    Формирует блок заголовков PGN (с пустой строкой после него).
+    :param headers: Словарь заголовков.
+    :param result: Результат для заголовка Result.
+    :return: Строка.
+    """
+    headers = dict(headers, Result=result)
+    names = [name for name in SEVEN_TAG_ROSTER if name in headers]
+    names += [name for name in headers if name not in SEVEN_TAG_ROSTER]
+    lines = []
+    for name in names:
+        value = str(headers[name]).replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'[{name} "{value}"]')
+    return "\n".join(lines) + "\n\n"
+
+
+def move_tokens(headers, moves, start=0):
+    """
+    Перечисляет лексемы текста ходов (номера ходов и ходы) начиная с полухода start.
+    Партия из FEN начинается с указанного в нём номера хода и, возможно, с хода чёрных.
+    :param headers: Словарь заголовков (нужен заголовок FEN, если он есть).
+    :param moves: Список ходов в SAN.
+    :param start: Номер первого полухода (с 0).
+    :return: Список лексем.
+    """
+    number, black_first = 1, False
+    if "FEN" in headers:
+        fields = str(headers["FEN"]).split()
+        black_first = len(fields) > 1 and fields[1] == "b"
+        if len(fields) > 5 and fields[5].isdigit():
+            number = int(fields[5])
+
+    tokens = []
+    first = 1 if black_first else 0
+    for index, san in enumerate(moves[start:], start + first):
+        if index % 2 == 0:
+            tokens.append(f"{number + index // 2}.")
+        elif index == first:
+            tokens.append(f"{number}...")
+        tokens.append(san)
+    return tokens
+
+
+def wrap_tokens(tokens, line_length=0):
+    """
+    Соединяет лексемы пробелами с переносом строк по LINE_LENGTH символов.
+    :param tokens: Лексемы.
+    :param line_length: Длина уже записанной части текущей строки.
+    :return: (текст, длина последней строки).
+    """
+    text = []
+    for token in tokens:
+        if line_length and line_length + 1 + len(token) > LINE_LENGTH:
+            text.append("\n")
+            line_length = 0
+        elif line_length:
+            text.append(" ")
+            line_length += 1
+        text.append(token)
+        line_length += len(token)
+    return "".join(text), line_length
+
+
+def format_pgn(headers, moves, result, comment=None):
+    """
+    Формирует текст партии в формате PGN.
+    :param headers: Словарь заголовков.
+    :param moves: Список ходов в SAN.
+    :param result: Результат ("1-0", "0-1", "1/2-1/2" или "*").
+    :param comment: Комментарий перед результатом (например, причина окончания партии) или None.
+    :return: Строка PGN.
+    """
+    tokens = move_tokens(headers, moves)
+    if comment:
+        tokens.append("{" + comment.replace("}", ")") + "}")
+    tokens.append(result)
+    return format_headers(headers, result) + wrap_tokens(tokens)[0] + "\n\n"
+
+
+class RecordWriter:
+    def __init__(self):
+        """
+        Фоновый поток, который пишет записи партий на диск.
+        Дописывания одного файла, накопившиеся в очереди, объединяются в одну запись,
+        а полная перезапись отменяет всё, что было поставлено для файла до неё.
+        Ошибки записи не прерывают поток: они пишутся в журнал (logging) и запоминаются в errors.
+        """
+        self.jobs = queue.Queue()
+        self.errors = {}  # Путь -> текст последней ошибки записи этого файла
+        self.thread = threading.Thread(target=self.run, name="pgn-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, headers, moves, result, comment=None):
+        """
+        Ставит в очередь полную перезапись файла партии (с os.fsync).
+        :param path: Путь к файлу.
+        Остальные параметры — как у format_pgn; списки должны быть копиями, которые больше не меняются.
+        """
+        self.jobs.put((path, False, (headers, moves, result, comment)))
+
+    def append(self, path, text):
+        """
+        Ставит в очередь дописывание текста в конец файла (без os.fsync).
+        :param path: Путь к файлу.
+        :param text: Текст.
+        """
+        self.jobs.put((path, True, text))
+
+    def flush(self):
+        """
+        Ждёт, пока все поставленные записи окажутся на диске.
+        """
+        self.jobs.join()
+
+    def run(self):
+        while True:
+            jobs = [self.jobs.get()]
+            # Забираем всё, что накопилось, и оставляем последнюю версию каждого файла
+            while True:
+                try:
+                    jobs.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            # Для каждого файла: (дописать ли, текст); полная перезапись включает в себя всё, что до неё
+            pending = {}
+            for path, is_append, data in jobs:
+                if not is_append:
+                    pending[path] = (False, format_pgn(*data))
+                elif path in pending:
+                    pending[path] = (pending[path][0], pending[path][1] + data)
+                else:
+                    pending[path] = (True, data)
+            for path, (is_append, text) in pending.items():
+                try:
+                    if is_append:
+                        with open(path, "a", encoding="utf-8") as file:
+                            file.write(text)
+                    else:
+                        self.write(path, text)
+                except OSError as error:
+                    self.errors[path] = str(error)
+                    logger.error("Не удалось записать партию %s: %s", path, error)
+            for _ in jobs:
+                self.jobs.task_done()
+
+    @staticmethod
+    def write(path, text):
+        """
+        Записывает файл целиком: сначала во временный файл, затем заменяет им прежний.
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """
+    Возвращает общий для процесса RecordWriter (создаётся при первом обращении).
+    При выходе из программы недописанные партии сбрасываются на диск.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = RecordWriter()
+            atexit.register(_writer.flush)
+    return _writer
+
+
+class GameRecord:
+    def __init__(self, path, headers, durability=DURABILITY_MOVE, writer=None):
+        """
+        Запись одной партии.
+        :param path: Путь к файлу PGN.
+        :param headers: Заголовки PGN (Event, White, Black, TimeControl и т.п.); Date заполняется сам.
+        :param durability: Когда сбрасывать запись на диск: DURABILITY_MOVE, DURABILITY_END или число полуходов.
+        :param writer: Фоновый писатель (по умолчанию общий для процесса).
+        """
+        self.path = path
+        self.headers = default_headers()
+        self.headers.update(headers)
+        self.durability = durability
+        self.writer = writer or get_writer()
+        self.moves = []
+        self.saved = 0  # Сколько полуходов уже отправлено на диск
+        self.line_length = None  # Длина последней строки ходов в файле (None — файл ещё не начат)
+        self.finished = False
+
+    def add_move(self, san):
+        """
+        Добавляет ход и, если этого требует политика надёжности, отправляет запись на диск.
+        :param san: Ход в SAN.
+        """
+        self.moves.append(san)
+        unsaved = len(self.moves) - self.saved
+        if self.durability == DURABILITY_MOVE or (isinstance(self.durability, int) and unsaved >= self.durability):
+            self.save()
+
+    def finish(self, result, termination="normal", comment=None):
+        """
+        Завершает запись партии и отправляет её на диск.
+        :param result: Результат ("1-0", "0-1", "1/2-1/2" или "*").
+        :param termination: Значение заголовка Termination ("normal", "time forfeit", "unterminated").
+        :param comment: Причина окончания партии для комментария в конце или None.
+        """
+        if self.finished:
+            return
+        self.finished = True
+        self.headers["Termination"] = termination
+        self.saved = len(self.moves)
+        self.writer.submit(self.path, dict(self.headers), list(self.moves), result, comment)
+
+    def save(self):
+        """
+        Отправляет фоновому писателю ходы, которых ещё нет в файле (в первый раз — вместе с заголовками).
+        """
+        text = ""
+        if self.line_length is None:
+            text = format_headers(self.headers, "*")
+            self.line_length = 0
+        tokens, self.line_length = wrap_tokens(move_tokens(self.headers, self.moves, self.saved), self.line_length)
+        self.saved = len(self.moves)
+        self.writer.append(self.path, text + tokens)
+
+    def close(self):
+        """
+        Закрывает запись: незавершённая партия сохраняется с результатом "*".
+        """
+        self.finish("*", "unterminated")
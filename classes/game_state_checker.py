@@ -1,9 +1,21 @@
-from classes.pieces.king import King
+from classes.bitboard import BISHOP, KING, KNIGHT, is_square_attacked
+from classes.game_status import (CHECK, CHECKMATE, DRAW, FIFTY_MOVES, IN_PROGRESS, INSUFFICIENT_MATERIAL, REPETITION,
+                                 STALEMATE, GameStatus)
+
+# Светлые клетки доски (a8 — светлая)
+LIGHT_SQUARES = sum(1 << (row * 8 + col) for row in range(8) for col in range(8) if (row + col) % 2 == 0)
 
 
 class GameStateChecker:
-    def __init__(self, board):
-        self.board = board
+    def __init__(self, position):
+        """
+        Проверка состояния игры (шах, мат, пат).
+        :param position: Позиция (Position), для которой выполняются проверки.
+        """
+        self.position = position
+        # Последнее вычисленное состояние партии и ключ позиции, для которой оно вычислено
+        self.status = None
+        self.status_key = None
 
     def is_king_in_check(self, color):
         """
@@ -11,18 +23,13 @@ class GameStateChecker:
         :param color: Цвет короля ("black" или "white").
         :return: True, если король под шахом, иначе False.
         """
-        king_pos = self.board.find_king_position(color)
+        king_pos = self.find_king_position(color)
         if not king_pos:
             return False
 
-        opponent_color = "black" if color == "white" else "white"
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.grid[row][col]
-                if piece and piece.color == opponent_color:
-                    if king_pos in piece.get_valid_moves(self.board.grid):
-                        return True
-        return False
+        opponent_color = 1 if color == "white" else 0
+        return is_square_attacked(king_pos[0] * 8 + king_pos[1], opponent_color, self.position.bitboards,
+                                  self.position.occupied())
 
     def is_checkmate(self, color):
         """
@@ -32,51 +39,7 @@ class GameStateChecker:
         """
         if not self.is_king_in_check(color):
             return False
-
-        king_pos = self.board.find_king_position(color)
-        if not king_pos:
-            return False
-
-        king = self.board.grid[king_pos[0]][king_pos[1]]
-        king_moves = king.get_valid_moves(self.board.grid)
-        for move in king_moves:
-            temp_grid = [[self.board.grid[row][col] for col in range(8)] for row in range(8)]
-            temp_position = king.position
-
-            self.board.grid[king_pos[0]][king_pos[1]] = None
-            self.board.grid[move[0]][move[1]] = king
-            king.position = move
-
-            if not self.is_king_in_check(color):
-                self.board.grid = temp_grid
-                king.position = temp_position
-                return False
-
-            self.board.grid = temp_grid
-            king.position = temp_position
-
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.grid[row][col]
-                if piece and piece.color == color and not isinstance(piece, King):
-                    valid_moves = piece.get_valid_moves(self.board.grid)
-                    for move in valid_moves:
-                        temp_grid = [[self.board.grid[row][col] for col in range(8)] for row in range(8)]
-                        temp_position = piece.position
-
-                        self.board.grid[row][col] = None
-                        self.board.grid[move[0]][move[1]] = piece
-                        piece.position = move
-
-                        if not self.is_king_in_check(color):
-                            self.board.grid = temp_grid
-                            piece.position = temp_position
-                            return False
-
-                        self.board.grid = temp_grid
-                        piece.position = temp_position
-
-        return True
+        return not self.position.has_valid_moves(color)
 
     def is_stalemate(self, color):
         """
@@ -86,22 +49,85 @@ class GameStateChecker:
         """
         if self.is_king_in_check(color):
             return False
-
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.grid[row][col]
-                if piece and piece.color == color:
-                    if piece.get_valid_moves(self.board.grid):
-                        return False
-        return True
+        return not self.position.has_valid_moves(color)
 
     def find_king_position(self, color):
         """
         Находит позицию короля указанного цвета
         """
-        for row in range(8):
-            for col in range(8):
-                piece = self.board.grid[row][col]
-                if isinstance(piece, King) and piece.color == color:
-                    return row, col
-        return None
+        return self.position.king_squares[color]
+
+    def is_fifty_move_draw(self):
+        """
+        Проверяет правило 50 ходов: 100 полуходов без взятий и ходов пешками.
+        """
+        return self.position.halfmove_clock >= 100
+
+    def is_threefold_repetition(self):
+        """
+        Проверяет, встретилась ли текущая позиция в третий раз.
+        Сравниваются только позиции после последнего взятия или хода пешкой, через один полуход.
+        """
+        position = self.position
+        history = position.history
+        repetitions = 1
+        for index in range(len(history) - 2, max(len(history) - position.halfmove_clock, 0) - 1, -2):
+            if history[index] == position.zobrist_key:
+                repetitions += 1
+                if repetitions >= 3:
+                    return True
+        return False
+
+    def is_insufficient_material(self):
+        """
+        Проверяет, что мат невозможен: голые короли, король с одной лёгкой фигурой
+        или только слоны, стоящие на полях одного цвета.
+        """
+        bitboards = self.position.bitboards
+        pieces = 0
+        for index, bitboard in enumerate(bitboards):
+            if index % 6 != KING:
+                pieces |= bitboard
+        minors = 0
+        bishops = 0
+        for color in (0, 1):
+            minors |= bitboards[color * 6 + KNIGHT] | bitboards[color * 6 + BISHOP]
+            bishops |= bitboards[color * 6 + BISHOP]
+        if pieces != minors:
+            return False  # На доске есть пешки, ладьи или ферзи
+        if minors & (minors - 1) == 0:
+            # Не больше одной лёгкой фигуры
+            return True
+        return minors == bishops and (bishops & LIGHT_SQUARES == 0 or bishops & ~LIGHT_SQUARES == 0)
+
+    def get_status(self):
+        """
+        Возвращает состояние партии для игрока, чей сейчас ход.
+        Состояние вычисляется один раз после хода и хранится, пока позиция не изменится.
+        :return: GameStatus.
+        """
+        position = self.position
+        key = (position.zobrist_key, len(position.history))
+        if self.status is None or self.status_key != key:
+            self.status = self.compute_status()
+            self.status_key = key
+        return self.status
+
+    def compute_status(self):
+        """
+        Вычисляет состояние партии: мат и пат проверяются раньше ничьих по правилам.
+        :return: GameStatus.
+        """
+        player = self.position.current_player
+        in_check = self.is_king_in_check(player)
+        if not self.position.has_valid_moves(player):
+            if in_check:
+                return GameStatus(CHECKMATE, player, winner="black" if player == "white" else "white")
+            return GameStatus(STALEMATE, player)
+        if self.is_insufficient_material():
+            return GameStatus(DRAW, player, reason=INSUFFICIENT_MATERIAL)
+        if self.is_fifty_move_draw():
+            return GameStatus(DRAW, player, reason=FIFTY_MOVES)
+        if self.is_threefold_repetition():
+            return GameStatus(DRAW, player, reason=REPETITION)
+        return GameStatus(CHECK if in_check else IN_PROGRESS, player)
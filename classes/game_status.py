@@ -0,0 +1,76 @@
+"""
+Состояние партии после очередного хода: идёт, шах, мат, пат или ничья с указанием причины.
+"""
+
+# Состояния партии
+IN_PROGRESS = "in_progress"
+CHECK = "check"
+CHECKMATE = "checkmate"
+STALEMATE = "stalemate"
+DRAW = "draw"
+
+# Причины ничьей (кроме пата)
+FIFTY_MOVES = "fifty_moves"
+REPETITION = "repetition"
+INSUFFICIENT_MATERIAL = "insufficient_material"
+
+COLOR_NAMES = {"white": "Белые", "black": "Черные"}
+DRAW_MESSAGES = {
+    FIFTY_MOVES: "Ничья: правило 50 ходов.",
+    REPETITION: "Ничья: троекратное повторение.",
+    INSUFFICIENT_MATERIAL: "Ничья: недостаточно материала.",
+}
+
+
+class GameStatus:
+    def __init__(self, state, player, winner=None, reason=None):
+        """
+        Состояние партии для игрока, чей сейчас ход.
+        :param state: Одно из IN_PROGRESS, CHECK, CHECKMATE, STALEMATE, DRAW.
+        :param player: Цвет игрока, чей ход ("black" или "white").
+        :param winner: Цвет победителя при мате, иначе None.
+        :param reason: Причина ничьей (FIFTY_MOVES, REPETITION, INSUFFICIENT_MATERIAL) или None.
+        """
+        self.state = state
+        self.player = player
+        self.winner = winner
+        self.reason = reason
+
+    @property
+    def is_over(self):
+        """
+        Закончена ли партия.
+        """
+        return self.state in (CHECKMATE, STALEMATE, DRAW)
+
+    @property
+    def in_check(self):
+        """
+        Стоит ли король ходящего игрока под шахом (в том числе при мате).
+        """
+        return self.state in (CHECK, CHECKMATE)
+
+    def get_result(self):
+        """
+        Возвращает результат в формате PGN: "1-0", "0-1", "1/2-1/2" или "*", если партия продолжается.
+        """
+        if self.state == CHECKMATE:
+            return "1-0" if self.winner == "white" else "0-1"
+        if self.state in (STALEMATE, DRAW):
+            return "1/2-1/2"
+        return "*"
+
+    def get_message(self):
+        """
+        Возвращает текст о результате партии или None, если партия продолжается.
+        """
+        if self.state == CHECKMATE:
+            return f"Мат! {COLOR_NAMES[self.winner]} победили."
+        if self.state == STALEMATE:
+            return "Пат! Ничья."
+        if self.state == DRAW:
+            return DRAW_MESSAGES[self.reason]
+        return None
+
+    def __repr__(self):
+        return f"GameStatus({self.state!r}, {self.player!r}, winner={self.winner!r}, reason={self.reason!r})"
@@ -0,0 +1,70 @@
+from classes.pieces.pawn import Pawn
+
+# Буквы фигур превращения (как в UCI)
+PROMOTION_LETTERS = ("q", "r", "b", "n")
+
+
+def is_promotion_move(piece, row):
+    """
+    Проверяет, превращается ли пешка при ходе на указанную строку.
+    :param piece: Фигура, которая ходит.
+    :param row: Строка клетки назначения.
+    """
+    return isinstance(piece, Pawn) and ((piece.color == "white" and row == 0) or (piece.color == "black" and row == 7))
+
+
+class PieceMoveGenerator:
+    """
+    Генератор ходов на основе методов get_valid_moves классов фигур.
+    """
+
+    def get_valid_moves(self, position, piece):
+        """
+        Возвращает ходы фигуры, после которых её король не остаётся под шахом.
+        :param position: Позиция (Position).
+        :param piece: Фигура.
+        :return: Список клеток (row, col), куда фигура может пойти.
+        """
+        return [move for move in piece.get_valid_moves(position.grid)
+                if not self.leaves_king_in_check(position, piece, move)]
+
+    def get_all_valid_moves(self, position, color):
+        """
+        Возвращает все допустимые ходы игрока.
+        :param position: Позиция (Position).
+        :param color: Цвет игрока.
+        :return: Список кортежей ((start_row, start_col), (end_row, end_col), promotion).
+        """
+        moves = []
+        for piece in position.get_pieces(color):
+            for end in self.get_valid_moves(position, piece):
+                if is_promotion_move(piece, end[0]):
+                    for promotion in PROMOTION_LETTERS:
+                        moves.append((piece.position, end, promotion))
+                else:
+                    moves.append((piece.position, end, None))
+        return moves
+
+    def has_valid_moves(self, position, color):
+        """
+        Проверяет, есть ли у игрока хотя бы один допустимый ход.
+        :param position: Позиция (Position).
+        :param color: Цвет игрока.
+        """
+        for piece in position.get_pieces(color):
+            if self.get_valid_moves(position, piece):
+                return True
+        return False
+
+    def leaves_king_in_check(self, position, piece, move):
+        """
+        Проверяет, остаётся ли король под шахом после хода фигуры.
+        :param position: Позиция (Position).
+        :param piece: Фигура, которая ходит.
+        :param move: Клетка назначения (row, col).
+        :return: True, если ход оставляет своего короля под шахом.
+        """
+        undo = position.make_move(piece.position, move)
+        in_check = position.is_king_in_check(piece.color)
+        position.unmake_move(undo)
+        return in_check
@@ -1,76 +1,89 @@
 import datetime
 import os
 
-import pygame
+from classes.game_record import DURABILITY_MOVE, GameRecord
+from classes.notation import move_to_san
+from classes.position import START_FEN
 
-from classes.pieces.king import King
-from classes.pieces.pawn import Pawn
+PLAYER_NAMES = {"human": "Игрок", "ai": "Компьютер"}
 
 
 class MoveHandler:
-    def __init__(self, board):
+    def __init__(self, board, durability=DURABILITY_MOVE):
+        """
+        Обработка ходов игрока и запись партии.
+        :param board: Доска (Board).
+        :param durability: Когда сбрасывать запись партии на диск (см. classes/game_record.py).
+        """
         self.board = board
         self.start_time = datetime.datetime.now()  # Время начала партии
-        self.log_file = self.create_log_file()  # Создаем файл для записи ходов
+        self.record = self.create_record(durability)  # Запись партии в PGN
 
-    def __del__(self):
+    def create_record(self, durability):
         """
-        Закрываем файл при уничтожении объекта.
+        Создает запись партии в папке data.
+        :param durability: Политика сброса записи на диск.
+        :return: GameRecord.
         """
-        if hasattr(self, 'log_file'):
-            self.log_file.close()
+        if not os.path.exists("data"):
+            os.makedirs("data")
+        name = f"data/Партия от {self.start_time.strftime('%Y-%m-%d %H-%M-%S')}"
+        filename = f"{name}.pgn"
+        number = 1
+        while os.path.exists(filename):
+            # Несколько партий, начатых в одну секунду, не должны затирать друг друга
+            number += 1
+            filename = f"{name} ({number}).pgn"
+        black = PLAYER_NAMES["ai"] if self.board.mode == "human_vs_ai" else PLAYER_NAMES["human"]
+        headers = {
+            "White": PLAYER_NAMES["human"],
+            "Black": black,
+            "TimeControl": str(self.board.timer_minutes * 60),
+            "StartTime": self.start_time.strftime("%H:%M:%S"),
+        }
+        fen = self.board.get_fen()
+        if fen != START_FEN:
+            # Партия начата не из начальной позиции
+            headers["SetUp"] = "1"
+            headers["FEN"] = fen
+        return GameRecord(filename, headers, durability)
 
-    def create_log_file(self):
+    def log_move(self, move):
         """
-        Создает файл для записи ходов.
-        :return: Файловый объект.
+        Записывает ход в SAN. Вызывается до того, как ход сделан на доске.
+        :param move: Ход в формате ((start_row, start_col), (end_row, end_col), promotion).
         """
-        if not os.path.exists("data"):
-            os.makedirs("data")
-        filename = f"data/Партия от {self.start_time.strftime('%Y-%m-%d %H-%M-%S')}.txt"
-        return open(filename, "w", encoding="utf-8")
+        self.record.add_move(move_to_san(self.board.position, move))
 
-    def convert_to_chess_notation(self, position):
+    def finish(self, result, termination="normal", comment=None):
         """
-        Преобразует координаты из числового формата (строка, столбец) в шахматный формат (буква столбца и номер строки).
-        :param position: Кортеж (строка, столбец).
-        :return: Строка в шахматной нотации (например, "a1").
+        Завершает запись партии.
+        :param result: Результат ("1-0", "0-1", "1/2-1/2").
+        :param termination: Причина окончания для заголовка Termination.
+        :param comment: Текст о результате партии.
         """
-        row, col = position
-        # Преобразуем столбец в букву (0 -> 'a', 1 -> 'b', ..., 7 -> 'h')
-        col_char = chr(ord('a') + col)
-        # Преобразуем строку в номер (0 -> 8, 1 -> 7, ..., 7 -> 1)
-        row_num = 8 - row
-        return f"{col_char}{row_num}"
+        self.record.finish(result, termination, comment)
 
-    def log_move(self, move):
+    def close(self):
         """
-        Записывает ход в файл в шахматной нотации.
-        :param move: Ход в формате ((start_row, start_col), (end_row, end_col)).
+        Закрывает запись партии (незаконченная партия сохраняется с результатом "*").
         """
-        start_pos, end_pos = move
-        start_chess = self.convert_to_chess_notation(start_pos)
-        end_chess = self.convert_to_chess_notation(end_pos)
-        move_str = f"{self.board.current_player} {start_chess} -> {end_chess}\n"
-        self.log_file.write(move_str)
-        self.log_file.flush()  # Сбрасываем буфер, чтобы данные сразу записывались в файл
+        self.record.close()
 
-    def handle_click(self, row, col):
+    def handle_click(self, row, col, promotion=None):
         """
         Обрабатывает клик на клетку доски.
         :param row: Строка клетки.
         :param col: Столбец клетки.
+        :param promotion: Фигура превращения ("q", "r", "b", "n"), если она известна заранее
+                          (ход компьютера, воспроизведение партии). Иначе игроку показывается меню выбора.
         """
         if self.board.selected_piece is None:
             # Если фигура не выбрана, выбираем фигуру текущего игрока
             piece = self.board.grid[row][col]
             if piece is not None and piece.color == self.board.current_player:
                 self.board.selected_piece = piece
-                self.board.valid_moves = piece.get_valid_moves(self.board.grid)
-
-                # Фильтруем допустимые ходы, если король под шахом
-                if self.board.is_king_in_check(self.board.current_player):
-                    self.board.valid_moves = self.filter_moves_in_check(self.board.selected_piece, self.board.valid_moves)
+                self.board.valid_moves = self.board.position.get_valid_moves(piece)
         else:
             # Если фигура уже выбрана, проверяем, куда кликнул игрок
             if (row, col) == self.board.selected_piece.position:
@@ -79,179 +92,50 @@ class MoveHandler:
                 self.board.valid_moves = []
             elif (row, col) in self.board.valid_moves:
                 # Если кликнули на допустимый ход, выполняем его
-                self.make_move(row, col)
+                self.make_move(row, col, promotion)
             else:
                 # Если кликнули на другую фигуру, выбираем её (если она принадлежит текущему игроку)
                 piece = self.board.grid[row][col]
                 if piece is not None and piece.color == self.board.current_player:
                     self.board.selected_piece = piece
-                    self.board.valid_moves = piece.get_valid_moves(self.board.grid)
-
-                    # Фильтруем допустимые ходы, если король под шахом
-                    if self.board.is_king_in_check(self.board.current_player):
-                        self.board.valid_moves = self.filter_moves_in_check(self.board.selected_piece, self.board.valid_moves)
+                    self.board.valid_moves = self.board.position.get_valid_moves(piece)
 
-    def filter_moves_in_check(self, piece, valid_moves):
+    def make_move(self, row, col, promotion=None):
         """
-        Фильтрует допустимые ходы, оставляя только те, которые убирают короля из-под шаха.
-        :param piece: Фигура, которая ходит.
-        :param valid_moves: Список допустимых ходов.
-        :return: Отфильтрованный список допустимых ходов.
-        """
-        filtered_moves = []
-
-        for move in valid_moves:
-            # Сохраняем текущее состояние доски
-            temp_grid = [[self.board.grid[row][col] for col in range(8)] for row in range(8)]
-            temp_position = piece.position
-
-            # Выполняем ход
-            self.board.grid[piece.position[0]][piece.position[1]] = None
-            self.board.grid[move[0]][move[1]] = piece
-            piece.position = move
-
-            # Проверяем, остался ли король под шахом
-            if not self.board.is_king_in_check(self.board.current_player):
-                filtered_moves.append(move)
-
-            # Восстанавливаем исходное состояние доски
-            self.board.grid = [[temp_grid[row][col] for col in range(8)] for row in range(8)]
-            piece.position = temp_position
-
-        return filtered_moves
-
-    def make_move(self, row, col):
-        """
-        Выполняет ход фигуры.
+        Выполняет ход выбранной фигуры. Если пешка превращается, а фигура превращения не указана,
+        ход откладывается до выбора в меню (см. complete_promotion).
         :param row: Строка клетки.
         :param col: Столбец клетки.
+        :param promotion: Фигура превращения ("q", "r", "b", "n") или None.
         """
-        original_grid = [[self.board.grid[row][col] for col in range(8)] for row in range(8)]
-        original_position = self.board.selected_piece.position
-        start_row, start_col = original_position
         piece = self.board.selected_piece
-
-        # Сброс флага взятия на проходе
-        self.board.en_passant_target = None
-
-        # Обработка взятия на проходе
-        if isinstance(piece, Pawn):
-            # Ход на две клетки - устанавливаем правильную целевую позицию
-            if abs(row - start_row) == 2:
-                direction = 1 if piece.color == "black" else -1
-                self.board.en_passant_target = (start_row + direction, start_col)  # Позиция ПРОМЕЖУТОЧНОЙ клетки
-
-            # Выполнение взятия на проходе
-            if col != start_col and self.board.grid[row][col] is None:
-                # Удаляем пешку противника
-                captured_row = start_row  # Ряд где стояла атакующая пешка
-                captured_col = col  # Колонка куда пошла цель
-                self.board.grid[captured_row][captured_col] = None
-
-        # Логируем ход
-        start_pos = self.board.selected_piece.position
+        start_pos = piece.position
         end_pos = (row, col)
-        self.log_move((start_pos, end_pos))
-
-        # Проверяем, является ли ход рокировкой
-        if isinstance(self.board.selected_piece, King) and abs(col - original_position[1]) == 2:
-            self.handle_castle(row, col)
-        else:
-            # Обычный ход
-            self.board.grid[self.board.selected_piece.position[0]][self.board.selected_piece.position[1]] = None
-            self.board.grid[row][col] = self.board.selected_piece
-            self.board.selected_piece.position = (row, col)
-
-            # Проверяем, остался ли король под шахом после хода
-            if self.board.is_king_in_check(self.board.current_player):
-                # Если король под шахом, отменяем ход
-                self.board.grid = original_grid
-                self.board.selected_piece.position = original_position
-            else:
-                # Если ход допустим, завершаем его
-                if self.board.grid[row][col] is not None and self.board.grid[row][col].color != self.board.current_player:
-                    self.board.grid[row][col] = None
-
-                # Устанавливаем флаг has_moved для пешки
-                if isinstance(self.board.selected_piece, Pawn):
-                    self.board.selected_piece.has_moved = True
-
-                # Меняем игрока
-                self.board.current_player = "black" if self.board.current_player == "white" else "white"
-
-        # Обновление флага has_moved для пешки
-        if isinstance(piece, Pawn):
-            piece.has_moved = True
-
-        # После перемещения короля
-        if isinstance(piece, King):
-            # Проверяем, остался ли король под шахом
-            if self.board.is_king_in_check(self.board.current_player):
-                self.board.grid = original_grid
-                piece.position = original_position
-                return  # Отмена хода
 
-        if isinstance(piece, Pawn) and ((piece.color == "white" and row == 0) or (piece.color == "black" and row == 7)):
+        if promotion is None and self.board.position.is_promotion_move(piece, row):
+            # Игровой цикл покажет меню и продолжит ход после выбора
             self.board.promotion_active = True
             self.board.promotion_pawn = piece
-            self.board.promotion_pos = (row, col)
+            self.board.promotion_pos = end_pos
+            return
 
-            while self.board.promotion_active:
-                screen = pygame.display.get_surface()
-                self.board.draw(screen)
-                self.board.draw_promotion_menu(screen, self.board.promotion_pawn)
-                pygame.display.flip()
+        # Записываем ход (SAN считается по позиции до хода)
+        self.log_move((start_pos, end_pos, promotion))
 
-                for event in pygame.event.get():
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        if self.board.handle_promotion_click(event.pos):
-                            self.board.promotion_active = False
-
-            # Замена пешки на выбранную фигуру
-            new_piece = self.board.promotion_piece(
-                self.board.promotion_pawn.color,
-                (row, col),
-                self.board.cell_size,
-                self.board.board_start_x,
-                self.board.board_start_y
-            )
-            self.board.grid[self.board.promotion_pos[0]][self.board.promotion_pos[1]] = new_piece
-        self.board.promotion_pawn = None
-        self.board.promotion_piece = None
+        self.board.position.make_move(start_pos, end_pos, promotion)
 
         # Сбрасываем выбор фигуры
         self.board.selected_piece = None
         self.board.valid_moves = []
 
-    def handle_castle(self, row, col):
+    def complete_promotion(self, promotion):
         """
-        Выполняет рокировку.
-        :param row: Строка короля.
-        :param col: Столбец короля после рокировки.
+        Завершает отложенный ход пешки выбранной фигурой превращения.
+        :param promotion: Буква фигуры ("q", "r", "b", "n").
         """
-        king = self.board.selected_piece
-        king_row, king_col = king.position
-
-        # Определяем направление рокировки
-        if col > king_col:  # Короткая рокировка
-            rook_col = 7
-            new_rook_col = col - 1
-        else:  # Длинная рокировка
-            rook_col = 0
-            new_rook_col = col + 1
-
-        # Перемещаем короля
-        self.board.grid[king_row][king_col] = None
-        self.board.grid[row][col] = king
-        king.position = (row, col)
-        king.has_moved = True
-
-        # Перемещаем ладью
-        rook = self.board.grid[king_row][rook_col]
-        self.board.grid[king_row][rook_col] = None
-        self.board.grid[king_row][new_rook_col] = rook
-        rook.position = (king_row, new_rook_col)
-        rook.has_moved = True
-
-        # Меняем игрока
-        self.board.current_player = "black" if self.board.current_player == "white" else "white"
+        row, col = self.board.promotion_pos
+        self.board.promotion_active = False
+        self.board.promotion_pawn = None
+        self.board.promotion_pos = None
+        self.board.promotion_piece = None
+        self.make_move(row, col, promotion)
@@ -0,0 +1,140 @@
+"""
+Перевод клеток и ходов в шахматную нотацию и обратно.
+"""
+import re
+
+# Ход в SAN: фигура, уточнение вертикали и горизонтали, взятие, клетка назначения, превращение
+SAN_PATTERN = re.compile(r"^([NBRQK])?([a-h])?([1-8])?x?([a-h][1-8])(?:=?([NBRQ]))?$")
+
+
+def square_to_notation(position):
+    """
+    Преобразует координаты из числового формата (строка, столбец) в шахматный формат (буква столбца и номер строки).
+    :param position: Кортеж (строка, столбец).
+    :return: Строка в шахматной нотации (например, "a1").
+    """
+    row, col = position
+    return f"{chr(ord('a') + col)}{8 - row}"
+
+
+def notation_to_square(notation):
+    """
+    Преобразует клетку в шахматной нотации ("e4") в кортеж (строка, столбец).
+    :param notation: Строка в шахматной нотации.
+    :return: Кортеж (строка, столбец).
+    """
+    return 8 - int(notation[1]), ord(notation[0]) - ord('a')
+
+
+def move_to_uci(move):
+    """
+    Записывает ход в формате UCI ("e2e4", "e7e8q").
+    :param move: Кортеж ((start_row, start_col), (end_row, end_col), promotion).
+    :return: Строка хода.
+    """
+    start, end, promotion = move
+    return f"{square_to_notation(start)}{square_to_notation(end)}{promotion or ''}"
+
+
+def uci_to_move(uci):
+    """
+    Разбирает ход в формате UCI.
+    :param uci: Строка хода ("e2e4", "e7e8q").
+    :return: Кортеж ((start_row, start_col), (end_row, end_col), promotion).
+    """
+    return notation_to_square(uci[0:2]), notation_to_square(uci[2:4]), uci[4:5] or None
+
+
+def move_to_san(position, move):
+    """
+    Записывает ход в стандартной алгебраической нотации (SAN): "e4", "Nbd7", "exd6", "O-O", "e8=Q+", "Qh4#".
+    Позиция должна быть той, в которой ход ещё не сделан; после вызова она не меняется.
+    :param position: Позиция (Position).
+    :param move: Кортеж ((start_row, start_col), (end_row, end_col), promotion).
+    :return: Строка хода.
+    """
+    (start_row, start_col), end, promotion = move
+    piece = position.grid[start_row][start_col]
+    end_row, end_col = end
+
+    if piece.symbol == "K" and abs(end_col - start_col) == 2:
+        san = "O-O" if end_col > start_col else "O-O-O"
+    elif piece.symbol == "P":
+        san = square_to_notation(end)
+        if start_col != end_col:
+            # Пешка ходит по диагонали только со взятием (в том числе на проходе)
+            san = f"{chr(ord('a') + start_col)}x{san}"
+        if position.is_promotion_move(piece, end_row):
+            san += f"={(promotion or 'q').upper()}"
+    else:
+        # Уточнение, если на ту же клетку может пойти другая такая же фигура
+        rivals = [start for start, other_end, _ in position.get_all_valid_moves(piece.color)
+                  if other_end == end and start != (start_row, start_col)
+                  and position.grid[start[0]][start[1]].symbol == piece.symbol]
+        disambiguation = ""
+        if rivals:
+            file, rank = square_to_notation((start_row, start_col))
+            if all(col != start_col for _, col in rivals):
+                disambiguation = file
+            elif all(row != start_row for row, _ in rivals):
+                disambiguation = rank
+            else:
+                disambiguation = file + rank
+        capture = "x" if position.grid[end_row][end_col] is not None else ""
+        san = f"{piece.symbol}{disambiguation}{capture}{square_to_notation(end)}"
+
+    # Шах или мат определяем, сделав ход и сразу отменив его
+    undo = position.make_move(*move)
+    if position.is_king_in_check(position.current_player):
+        san += "+" if position.has_valid_moves(position.current_player) else "#"
+    position.unmake_move(undo)
+    return san
+
+
+def san_to_move(position, san):
+    """
+    Разбирает ход в SAN, сверяя его с допустимыми ходами позиции.
+    :param position: Позиция (Position), в которой делается ход.
+    :param san: Строка хода ("e4", "Nbd7", "O-O", "e8=Q+").
+    :return: Кортеж ((start_row, start_col), (end_row, end_col), promotion).
+    :raises ValueError: Если ход записан с ошибкой, невозможен или неоднозначен.
+    """
+    text = san.rstrip("+#!?")
+    if text.endswith("e.p."):
+        text = text[:-4].rstrip()
+    moves = position.get_all_valid_moves()
+
+    if text in ("O-O", "0-0", "O-O-O", "0-0-0"):
+        king = position.find_king_position(position.current_player)
+        step = 2 if len(text) == 3 else -2
+        for move in moves:
+            if king is not None and move[0] == king and move[1] == (king[0], king[1] + step):
+                return move
+        raise ValueError(f"Рокировка невозможна: {san}")
+
+    match = SAN_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Неверная запись хода: {san}")
+    symbol, file, rank, target, promotion = match.groups()
+    symbol = symbol or "P"
+    end = notation_to_square(target)
+    promotion = promotion.lower() if promotion else None
+
+    candidates = []
+    for move in moves:
+        start, move_end, move_promotion = move
+        if move_end != end or position.grid[start[0]][start[1]].symbol != symbol:
+            continue
+        if file and start[1] != ord(file) - ord("a"):
+            continue
+        if rank and start[0] != 8 - int(rank):
+            continue
+        if move_promotion != promotion:
+            continue
+        candidates.append(move)
+
+    if not candidates:
+        raise ValueError(f"Недопустимый ход: {san}")
+    if len(candidates) > 1:
+        raise ValueError(f"Неоднозначный ход: {san}")
+    return candidates[0]
@@ -0,0 +1,224 @@
+"""
+Книга дебютов в формате Polyglot.
+
+Файл книги — отсортированные по ключу позиции записи по 16 байт (big-endian): ключ Polyglot (8 байт),
+ход (2 байта), вес (2 байта) и поле learn (4 байта). Книга отображается в память (mmap)
+и при открытии не читается: записи позиции ищутся двоичным поиском по ключу, поэтому
+даже книга на сотни мегабайт открывается мгновенно.
+
+Здесь же сборщик книги из партий PGN.
+"""
+
+import mmap
+import os
+import random
+import struct
+
+from classes.bitboard import COLOR_INDEX, can_capture_en_passant
+from classes.pgn_reader import PgnReader
+from classes.pieces.king import King
+from classes.polyglot_random import POLYGLOT_RANDOM
+from classes.position import START_FEN, Position
+
+DEFAULT_BOOK = "data/book.bin"  # Книга, которую использует компьютер, если файл существует
+
+ENTRY = struct.Struct(">QHHI")  # Ключ, ход, вес, learn
+KEY = struct.Struct(">Q")
+
+# PIECE_RANDOM[цвет * 6 + тип фигуры][клетка] — индексы как у Position.bitboards.
+# В Polyglot вид фигуры — 2 * тип + 1 для белых, клетки считаются от a1 (клетка Position ^ 56)
+PIECE_RANDOM = [[POLYGLOT_RANDOM[64 * (2 * (index % 6) + (1 - index // 6)) + (square ^ 56)] for square in range(64)]
+                for index in range(12)]
+CASTLING_RANDOM = {"K": POLYGLOT_RANDOM[768], "Q": POLYGLOT_RANDOM[769],
+                   "k": POLYGLOT_RANDOM[770], "q": POLYGLOT_RANDOM[771]}
+EN_PASSANT_RANDOM = POLYGLOT_RANDOM[772:780]
+TURN_RANDOM = POLYGLOT_RANDOM[780]  # Ход белых
+
+PROMOTION_CODES = {None: 0, "n": 1, "b": 2, "r": 3, "q": 4}
+PROMOTIONS = {code: promotion for promotion, code in PROMOTION_CODES.items()}
+
+MAX_WEIGHT = 0xFFFF
+
+
+def polyglot_key(position):
+    """
+    Считает ключ позиции по правилам Polyglot (отдельно от ключа Зобриста позиции).
+    Вертикаль взятия на проходе учитывается, только если пешка ходящей стороны может так взять.
+    :param position: Позиция (Position).
+    :return: 64-битный ключ.
+    """
+    key = 0
+    for index, bitboard in enumerate(position.bitboards):
+        randoms = PIECE_RANDOM[index]
+        while bitboard:
+            low = bitboard & -bitboard
+            key ^= randoms[low.bit_length() - 1]
+            bitboard ^= low
+    for letter in position.get_castling_rights():
+        key ^= CASTLING_RANDOM[letter]
+    target = position.en_passant_target
+    if target and can_capture_en_passant(position.bitboards, target, COLOR_INDEX[position.current_player]):
+        key ^= EN_PASSANT_RANDOM[target[1]]
+    if position.current_player == "white":
+        key ^= TURN_RANDOM
+    return key
+
+
+def encode_move(position, move):
+    """
+    Кодирует ход в 16 бит Polyglot. Рокировка записывается как ход короля на клетку своей ладьи.
+    :param position: Позиция до хода.
+    :param move: Ход ((start_row, start_col), (end_row, end_col), promotion).
+    """
+    (start_row, start_col), (end_row, end_col), promotion = move
+    if isinstance(position.grid[start_row][start_col], King) and abs(end_col - start_col) == 2:
+        end_col = 7 if end_col > start_col else 0
+    return (end_col | (7 - end_row) << 3 | start_col << 6 | (7 - start_row) << 9
+            | PROMOTION_CODES[promotion] << 12)
+
+
+def decode_move(position, code):
+    """
+    Переводит ход Polyglot в ход позиции.
+    :param position: Позиция, для которой записан ход.
+    :param code: 16-битный ход.
+    :return: Ход ((start_row, start_col), (end_row, end_col), promotion) или None, если код некорректен.
+    """
+    end_col, end_row = code & 7, 7 - (code >> 3 & 7)
+    start_col, start_row = code >> 6 & 7, 7 - (code >> 9 & 7)
+    promotion = PROMOTIONS.get(code >> 12 & 7, "")
+    if promotion == "":
+        return None
+    piece = position.grid[start_row][start_col]
+    if isinstance(piece, King) and start_row == end_row and start_col == 4 and end_col in (0, 7):
+        end_col = 6 if end_col == 7 else 2
+    return (start_row, start_col), (end_row, end_col), promotion
+
+
+class OpeningBook:
+    def __init__(self, path=DEFAULT_BOOK, random_generator=None):
+        """
+        Книга дебютов Polyglot, отображённая в память.
+        :param path: Путь к файлу книги.
+        :param random_generator: Генератор случайных чисел для выбора хода (random.Random).
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.count = size // ENTRY.size  # Число записей
+        # Пустой файл отобразить в память нельзя — такая книга просто ничего не находит
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.random = random_generator or random.Random()
+
+    def find(self, key):
+        """
+        Находит номер первой записи с указанным ключом двоичным поиском.
+        :return: Номер записи (если записей с ключом нет — номер, где они стояли бы).
+        """
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if KEY.unpack_from(self.data, middle * ENTRY.size)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get_entries(self, key):
+        """
+        Возвращает записи книги для ключа.
+        :return: Список (ход Polyglot, вес, learn).
+        """
+        entries = []
+        index = self.find(key)
+        while index < self.count:
+            entry_key, code, weight, learn = ENTRY.unpack_from(self.data, index * ENTRY.size)
+            if entry_key != key:
+                break
+            entries.append((code, weight, learn))
+            index += 1
+        return entries
+
+    def get_moves(self, position):
+        """
+        Возвращает допустимые в позиции ходы книги с весами.
+        :param position: Позиция (Position).
+        :return: Список (ход, вес).
+        """
+        entries = self.get_entries(polyglot_key(position))
+        if not entries:
+            return []
+        legal = set(position.get_all_valid_moves())
+        moves = []
+        for code, weight, _ in entries:
+            move = decode_move(position, code)
+            if move in legal:
+                moves.append((move, weight))
+        return moves
+
+    def choose_move(self, position):
+        """
+        Выбирает ход книги случайно, с вероятностью пропорционально весу.
+        :param position: Позиция (Position).
+        :return: Ход или None, если позиции нет в книге.
+        """
+        moves = [(move, weight) for move, weight in self.get_moves(position) if weight > 0]
+        if not moves:
+            return None
+        return self.random.choices([move for move, _ in moves], weights=[weight for _, weight in moves])[0]
+
+    def close(self):
+        """
+        Закрывает файл книги.
+        """
+        if self.data:
+            self.data.close()
+        self.file.close()
+
+
+def build_book(paths, output=DEFAULT_BOOK, min_games=3, max_ply=16, report=None):
+    """
+    Собирает книгу Polyglot из партий PGN.
+    Вес хода — 2 * победы + ничьи сделавшей его стороны; ходы, сыгранные реже min_games раз,
+    и ходы без набранных очков в книгу не попадают.
+    :param paths: Файлы PGN.
+    :param output: Путь к файлу книги.
+    :param min_games: Сколько раз ход должен встретиться в позиции, чтобы попасть в книгу.
+    :param max_ply: Сколько первых полуходов каждой партии учитывать.
+    :param report: Функция report(games), вызываемая после каждой партии, или None.
+    :return: (число партий, число позиций, число записей в книге).
+    """
+    stats = {}  # (ключ, ход Polyglot) -> [число партий, очки * 2]
+    games = 0
+    for path in paths:
+        for game in PgnReader(path):
+            games += 1
+            result = game.result if game.result in ("1-0", "0-1", "1/2-1/2") else game.headers.get("Result")
+            position = Position.from_fen(game.headers.get("FEN", START_FEN), move_generator="bitboard")
+            for move in game.moves[:max_ply]:
+                points = 1 if result == "1/2-1/2" else 2 if result == ("1-0" if position.current_player == "white"
+                                                                      else "0-1") else 0
+                entry = stats.setdefault((polyglot_key(position), encode_move(position, move)), [0, 0])
+                entry[0] += 1
+                entry[1] += points
+                position.make_move(*move)
+            if report:
+                report(games)
+
+    # Записи группируются по позициям; если веса не помещаются в 16 бит, они масштабируются
+    positions = {}
+    for (key, code), (count, points) in stats.items():
+        if count >= min_games and points > 0:
+            positions.setdefault(key, []).append((points, code))
+    entries = 0
+    directory = os.path.dirname(output)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(output, "wb") as file:
+        for key in sorted(positions):
+            moves = sorted(positions[key], key=lambda item: (-item[0], item[1]))
+            scale = max(1, -(-moves[0][0] // MAX_WEIGHT))
+            for points, code in moves:
+                file.write(ENTRY.pack(key, code, max(1, points // scale), 0))
+                entries += 1
+    return games, len(positions), entries
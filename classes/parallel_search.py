@@ -0,0 +1,195 @@
+"""
+Параллельный поиск (Lazy SMP): несколько процессов ищут ход в одной и той же позиции
+и обмениваются результатами через общую таблицу транспозиций в разделяемой памяти.
+
+Экспериментальный модуль: ускорение от числа процессов не измерено (замеры делались на машине
+с одним ядром). Проверить его можно командой bench.py search на многоядерной машине;
+по умолчанию компьютер ищет ход в одном процессе.
+"""
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+
+from classes.engine import SearchEngine
+from classes.transposition_table import TranspositionTable, table_size
+
+REPLY_GRACE = 2.0  # Сколько секунд сверх лимита времени ждать ответов процессов, прежде чем сдаться
+
+
+def run_search_worker(helper_id, requests, results, table_buffer, hash_mb, stop_event, engine_options):
+    """
+    Цикл процесса-помощника: ищет ход в присланной позиции, используя общую таблицу транспозиций.
+    :param helper_id: Номер помощника (0 — основной поиск).
+    :param requests: Очередь запросов (номер запроса, позиция в pickle, лимит узлов) или None для завершения.
+    :param results: Очередь ответов помощника (номер запроса, номер помощника, ход, сведения о поиске).
+    :param table_buffer: Разделяемая память таблицы транспозиций.
+    :param hash_mb: Размер таблицы в мегабайтах.
+    :param stop_event: Событие остановки поиска.
+    :param engine_options: Параметры SearchEngine.
+    """
+    table = TranspositionTable(hash_mb, buffer=table_buffer)
+    engine = SearchEngine(None, transposition_table=table, stop_event=stop_event, helper_id=helper_id,
+                          **engine_options)
+    while True:
+        request = requests.get()
+        if request is None:
+            break
+        request_id, position_data, node_limit = request
+        engine.node_limit = node_limit
+        move = engine.get_best_move(pickle.loads(position_data))
+        results.put((request_id, helper_id, move, engine.last_info))
+
+
+class ParallelSearchEngine:
+    def __init__(self, position, workers=None, hash_mb=64, stop_event=None, node_limit=None, **engine_options):
+        """
+        Параллельный движок с тем же интерфейсом, что и SearchEngine.
+        :param position: Позиция (Position), в которой играет компьютер.
+        :param workers: Число процессов поиска (по умолчанию — число ядер).
+        :param hash_mb: Размер общей таблицы транспозиций в мегабайтах.
+        :param stop_event: Внешнее событие, прерывающее поиск (как у SearchEngine).
+        :param node_limit: Общий лимит узлов на ход, делится между процессами.
+        :param engine_options: Остальные параметры SearchEngine (time_limit, max_depth).
+        """
+        self.position = position
+        self.workers = workers or os.cpu_count() or 1
+        self.stop_event = stop_event
+        self.node_limit = node_limit
+        self.engine_options = engine_options
+        self.last_info = {}
+
+        self.table_buffer = multiprocessing.RawArray("B", table_size(hash_mb))
+        self.worker_stop_event = multiprocessing.Event()
+        # У каждого процесса своя очередь ответов: процесс, убитый во время записи в общую очередь,
+        # оставил бы её заблокированной для остальных
+        self.results = []
+        self.requests = []
+        self.processes = []
+        for helper_id in range(self.workers):
+            requests = multiprocessing.Queue()
+            results = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=run_search_worker,
+                args=(helper_id, requests, results, self.table_buffer, hash_mb, self.worker_stop_event,
+                      engine_options),
+                daemon=True
+            )
+            process.start()
+            self.requests.append(requests)
+            self.results.append(results)
+            self.processes.append(process)
+        self.request_id = 0
+
+    def stop(self):
+        """
+        Прерывает текущий поиск во всех процессах.
+        """
+        self.worker_stop_event.set()
+
+    def get_best_move(self, position=None):
+        """
+        Ищет лучший ход всеми процессами сразу.
+        Процессы, которые завершились (нехватка памяти, исключение), не ждём; если к сроку
+        (лимит времени плюс REPLY_GRACE) ответили не все, берём лучший из полученных ответов,
+        а если ответов нет совсем — ищем ход в этом процессе.
+        :param position: Позиция (по умолчанию та, что передана в конструктор).
+        :return: Ход лучшего по глубине процесса или None, если ходов нет.
+                 В last_info — сведения этого процесса, общее число узлов и узлы каждого процесса.
+        """
+        position = position or self.position
+        self.request_id += 1
+        self.worker_stop_event.clear()
+        position_data = pickle.dumps(position)
+        node_limit = self.node_limit // self.workers if self.node_limit else None
+        helpers = [helper_id for helper_id, process in enumerate(self.processes) if process.is_alive()]
+        for helper_id in helpers:
+            self.requests[helper_id].put((self.request_id, position_data, node_limit))
+
+        start_time = time.perf_counter()
+        time_limit = self.engine_options.get("time_limit", 1.0)
+        deadline = start_time + time_limit + REPLY_GRACE if time_limit is not None else None
+        replies = {}
+        while True:
+            # Ждём только живые процессы, которые ещё не ответили
+            waiting = [helper_id for helper_id in helpers
+                       if helper_id not in replies and self.processes[helper_id].is_alive()]
+            if not waiting:
+                break
+            now = time.perf_counter()
+            if deadline is not None and now > deadline:
+                if replies or self.worker_stop_event.is_set():
+                    break
+                # Ответов нет — останавливаем процессы и ждём ещё немного
+                self.worker_stop_event.set()
+                deadline = now + REPLY_GRACE
+            if self.stop_event is not None and self.stop_event.is_set():
+                self.worker_stop_event.set()
+            if self.collect_replies(helpers, replies):
+                # Первый закончивший процесс исчерпал лимит — останавливаем остальных
+                self.worker_stop_event.set()
+            else:
+                time.sleep(0.01)
+        # Ответ мог прийти в очередь перед самым завершением процесса
+        self.collect_replies(helpers, replies)
+        elapsed = time.perf_counter() - start_time
+
+        if not replies:
+            # Ни один процесс не ответил — ищем ход здесь же, без общей таблицы
+            engine = SearchEngine(position, stop_event=self.stop_event, node_limit=self.node_limit,
+                                  **self.engine_options)
+            move = engine.get_best_move()
+            self.last_info = dict(engine.last_info, worker_nodes=[0] * self.workers, worker=None)
+            return move
+
+        # Берём ход процесса, завершившего самую глубокую итерацию (при равенстве — основного)
+        best_helper = max(replies, key=lambda helper_id: (replies[helper_id][1].get("depth", 0), -helper_id))
+        best_move, best_info = replies[best_helper]
+        worker_nodes = [replies[helper_id][1].get("nodes", 0) if helper_id in replies else 0
+                        for helper_id in range(self.workers)]
+        self.last_info = dict(best_info)
+        self.last_info.update({
+            "nodes": sum(worker_nodes),
+            "time": elapsed,
+            "nps": int(sum(worker_nodes) / max(elapsed, 1e-9)),
+            "worker_nodes": worker_nodes,
+            "worker": best_helper,
+        })
+        return best_move
+
+    def collect_replies(self, helpers, replies):
+        """
+        Забирает из очередей ответы на текущий запрос.
+        :param helpers: Номера процессов, которым отправлен запрос.
+        :param replies: Словарь номер процесса -> (ход, сведения о поиске), дополняется на месте.
+        :return: True, если пришёл хотя бы один новый ответ.
+        """
+        received = False
+        for helper_id in helpers:
+            if helper_id in replies:
+                continue
+            while True:
+                try:
+                    request_id, _, move, info = self.results[helper_id].get_nowait()
+                except queue.Empty:
+                    break
+                # Ответы на прерванные прежние запросы пропускаем
+                if request_id == self.request_id:
+                    replies[helper_id] = (move, info)
+                    received = True
+                    break
+        return received
+
+    def close(self):
+        """
+        Останавливает поиск и завершает процессы.
+        """
+        self.worker_stop_event.set()
+        for requests, process in zip(self.requests, self.processes):
+            if process.is_alive():
+                requests.put(None)
+        for process in self.processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
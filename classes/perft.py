@@ -0,0 +1,105 @@
+"""
+Подсчёт листьев дерева ходов (perft) для проверки и замера скорости генерации ходов.
+"""
+import time
+
+from classes.notation import move_to_uci
+from classes.position import START_FEN, Position
+
+# Эталонные позиции с известным числом листьев на каждой глубине
+PERFT_SUITE = [
+    ("Начальная позиция", START_FEN, {1: 20, 2: 400, 3: 8902, 4: 197281}),
+    ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+     {1: 48, 2: 2039, 3: 97862}),
+    ("Позиция 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", {1: 14, 2: 191, 3: 2812, 4: 43238}),
+    ("Позиция 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", {1: 6, 2: 264, 3: 9467}),
+    ("Позиция 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", {1: 44, 2: 1486, 3: 62379}),
+    ("Позиция 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+     {1: 46, 2: 2079, 3: 89890}),
+    ("Взятие на проходе открывает короля", "3k4/3p4/8/K1P4r/8/8/8/8 b - - 0 1", {1: 18, 2: 92, 3: 1670, 4: 10138}),
+    ("Взятие на проходе с шахом", "8/8/1k6/2b5/2pP4/8/5K2/8 b - d3 0 1", {1: 15, 2: 126, 3: 1928, 4: 13931}),
+    ("Взятие на проходе белыми", "8/5bk1/8/2Pp4/8/1K6/8/8 w - d6 0 1", {1: 8, 2: 104, 3: 736, 4: 9287}),
+    ("Короткая рокировка с шахом", "5k2/8/8/8/8/8/8/4K2R w K - 0 1", {1: 15, 2: 66, 3: 1198, 4: 6399}),
+    ("Длинная рокировка с шахом", "3k4/8/8/8/8/8/8/R3K3 w Q - 0 1", {1: 16, 2: 71, 3: 1286, 4: 7418}),
+    ("Потеря права на рокировку", "r3k2r/1b4bq/8/8/8/8/7B/R3K2R w KQkq - 0 1", {1: 26, 2: 1141, 3: 27826}),
+    ("Рокировка запрещена", "r3k2r/8/3Q4/8/8/5q2/8/R3K2R b KQkq - 0 1", {1: 44, 2: 1494, 3: 50509}),
+    ("Превращение со снятием шаха", "2K2r2/4P3/8/8/8/8/8/3k4 w - - 0 1", {1: 11, 2: 133, 3: 1442, 4: 19174}),
+    ("Вскрытый шах", "8/8/1P2K3/8/2n5/1q6/8/5k2 b - - 0 1", {1: 29, 2: 165, 3: 5160, 4: 31961}),
+    ("Превращение с шахом", "4k3/1P6/8/8/8/8/K7/8 w - - 0 1", {1: 9, 2: 40, 3: 472, 4: 2661}),
+    ("Слабое превращение с шахом", "8/P1k5/K7/8/8/8/8/8 w - - 0 1", {1: 6, 2: 27, 3: 273, 4: 1329}),
+    ("Пат самому себе", "K1k5/8/P7/8/8/8/8/8 w - - 0 1", {1: 2, 2: 6, 3: 13, 4: 63}),
+    ("Пат и мат", "8/k1P5/8/1K6/8/8/8/8 w - - 0 1", {1: 10, 2: 25, 3: 268, 4: 926}),
+]
+
+
+def perft(position, depth):
+    """
+    Считает число листьев дерева допустимых ходов заданной глубины.
+    :param position: Позиция (Position).
+    :param depth: Глубина в полуходах (при глубине 0 и меньше лист — сама позиция).
+    :return: Число листьев.
+    """
+    if depth <= 0:
+        return 1
+    moves = position.get_all_valid_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        undo = position.make_move(*move)
+        nodes += perft(position, depth - 1)
+        position.unmake_move(undo)
+    return nodes
+
+
+def divide(position, depth):
+    """
+    Разбивает perft по ходам из корня.
+    :param position: Позиция (Position).
+    :param depth: Глубина в полуходах (не меньше 1).
+    :return: Список пар (ход в формате UCI, число листьев), отсортированный по ходу.
+    :raises ValueError: Если глубина меньше 1.
+    """
+    if depth < 1:
+        raise ValueError(f"Глубина должна быть не меньше 1: {depth}")
+    result = []
+    for move in position.get_all_valid_moves():
+        undo = position.make_move(*move)
+        result.append((move_to_uci(move), perft(position, depth - 1)))
+        position.unmake_move(undo)
+    return sorted(result)
+
+
+def run_suite(max_depth=3, move_generator="pieces", report=print):
+    """
+    Прогоняет эталонные позиции и сверяет число листьев с известными значениями.
+    :param max_depth: Максимальная глубина для каждой позиции.
+    :param move_generator: Генератор ходов ("pieces" или "bitboard").
+    :param report: Функция вывода строки отчёта.
+    :return: Число позиций, на которых результат не совпал.
+    :raises ValueError: Если максимальная глубина меньше 1.
+    """
+    if max_depth < 1:
+        raise ValueError(f"Глубина должна быть не меньше 1: {max_depth}")
+    failures = 0
+    total_nodes = 0
+    total_time = 0.0
+    for name, fen, expected in PERFT_SUITE:
+        depth = max(d for d in expected if d <= max_depth)
+        position = Position.from_fen(fen, move_generator=move_generator)
+
+        start_time = time.perf_counter()
+        nodes = perft(position, depth)
+        elapsed = time.perf_counter() - start_time
+        total_nodes += nodes
+        total_time += elapsed
+
+        status = "OK" if nodes == expected[depth] else f"ОШИБКА (ожидалось {expected[depth]})"
+        if nodes != expected[depth]:
+            failures += 1
+        report(f"{name:<36} глубина {depth}: {nodes:>9} узлов, {nodes / max(elapsed, 1e-9):>10.0f} узлов/с  {status}")
+
+    report(f"Итого: {total_nodes} узлов за {total_time:.2f} с ({total_nodes / max(total_time, 1e-9):.0f} узлов/с), "
+           f"ошибок: {failures}")
+    return failures
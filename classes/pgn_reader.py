@@ -0,0 +1,233 @@
+"""
+Потоковое чтение PGN: партии читаются по одной из отображённого в память файла,
+поэтому даже многогигабайтные базы не загружаются в память целиком.
+Ходы в SAN проверяются собственной генерацией ходов, испорченные партии пропускаются с подсчётом ошибок.
+"""
+
+import mmap
+import re
+import time
+
+from classes.notation import san_to_move
+from classes.position import START_FEN, Position
+
+HEADER_PATTERN = re.compile(r'^\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+# Лексемы текста ходов: комментарии, варианты, NAG, номера ходов, результат и сами ходы
+TOKEN_PATTERN = re.compile(r"\{[^}]*\}?|\(|\)|\$\d+|\d+\.+|1-0|0-1|1/2-1/2|\*|[^\s{}()$]+")
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+
+
+class PgnError(ValueError):
+    def __init__(self, message, ply=None, token=None, reason=None, game=None):
+        """
+        Ошибка в записи партии.
+        :param message: Текст ошибки.
+        :param ply: Номер недопустимого полухода (с 1) или None, если ошибка не в ходе.
+        :param token: Запись недопустимого хода в SAN.
+        :param reason: Почему ход недопустим.
+        :param game: Партия (PgnGame) до недопустимого хода: заголовки, сыгранные ходы и позиция после них.
+        """
+        super().__init__(message)
+        self.ply = ply
+        self.token = token
+        self.reason = reason
+        self.game = game
+
+
+class PgnGame:
+    def __init__(self, headers, moves, result, position):
+        """
+        Прочитанная партия.
+        :param headers: Словарь заголовков.
+        :param moves: Список ходов ((start_row, start_col), (end_row, end_col), promotion).
+        :param result: Результат из текста ходов (или заголовка Result).
+        :param position: Позиция после последнего хода.
+        """
+        self.headers = headers
+        self.moves = moves
+        self.result = result
+        self.position = position
+
+
+def iter_game_texts(path, start=0, end=None):
+    """
+    Делит файл PGN на партии, не читая его целиком.
+    :param path: Путь к файлу.
+    :param start: Смещение в байтах, с которого начинается первая партия (см. split_pgn).
+    :param end: Смещение, на котором начинается первая чужая партия (None — до конца файла).
+    :return: Генератор пар (строки заголовков, строки текста ходов).
+    """
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Пустой файл нельзя отобразить в память
+        with data:
+            data.seek(start)
+            end = len(data) if end is None else end
+            headers = []
+            movetext = []
+            while data.tell() < end:
+                line = data.readline().decode("utf-8", "replace").strip().lstrip("\ufeff")
+                if line.startswith("["):
+                    if movetext:
+                        yield headers, movetext
+                        headers, movetext = [], []
+                    headers.append(line)
+                elif line and not line.startswith("%"):
+                    # Комментарий до конца строки после ";"
+                    comment = line.find(";")
+                    if comment >= 0 and "{" not in line[:comment]:
+                        line = line[:comment]
+                    movetext.append(line)
+            if headers or movetext:
+                yield headers, movetext
+
+
+def split_pgn(path, shard_size):
+    """
+    Делит файл PGN на куски примерно по shard_size байт, границы которых совпадают с началом партий
+    (строка заголовка после пустой строки). Куски можно читать независимо, например в разных процессах.
+    :param path: Путь к файлу.
+    :param shard_size: Желаемый размер куска в байтах.
+    :return: Список пар (начало, конец) в байтах.
+    """
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []
+        with data:
+            size = len(data)
+            shards = []
+            start = 0
+            while start < size:
+                target = start + max(shard_size, 1)
+                if target >= size:
+                    shards.append((start, size))
+                    break
+                # Ближайшее начало партии после target (с переводами строк Unix или Windows)
+                found = [position for position in (data.find(b"\n\n[", target), data.find(b"\n\r\n[", target))
+                         if position >= 0]
+                if not found:
+                    shards.append((start, size))
+                    break
+                boundary = data.find(b"[", min(found))
+                shards.append((start, boundary))
+                start = boundary
+            return shards
+
+
+def parse_headers(lines):
+    """
+    Разбирает строки заголовков вида [Name "Value"].
+    :raises PgnError: Если строка заголовка записана с ошибкой.
+    """
+    headers = {}
+    for line in lines:
+        match = HEADER_PATTERN.match(line)
+        if match is None:
+            raise PgnError(f"Неверный заголовок: {line}")
+        headers[match.group(1)] = match.group(2).replace('\\"', '"').replace("\\\\", "\\")
+    return headers
+
+
+def parse_movetext(lines):
+    """
+    Выделяет из текста ходов основную линию: комментарии, варианты, NAG и номера ходов пропускаются.
+    :return: (список ходов в SAN, результат или None).
+    :raises PgnError: Если скобки вариантов или комментариев не закрыты.
+    """
+    sans = []
+    result = None
+    depth = 0  # Вложенность вариантов
+    for token in TOKEN_PATTERN.findall(" ".join(lines)):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+            if depth < 0:
+                raise PgnError("Лишняя закрывающая скобка варианта")
+        elif depth or token[0] in "{$" or token[0].isdigit() and token.endswith("."):
+            if token[0] == "{" and not token.endswith("}"):
+                raise PgnError("Незакрытый комментарий")
+        elif token in RESULTS:
+            result = token
+        else:
+            sans.append(token)
+    if depth:
+        raise PgnError("Незакрытый вариант")
+    return sans, result
+
+
+def parse_game(header_lines, movetext_lines, move_generator="bitboard"):
+    """
+    Разбирает партию и проигрывает её ходы.
+    :raises PgnError: Если партия записана с ошибкой или содержит недопустимый ход
+                      (тогда в ошибке есть номер полухода, запись хода и партия до него).
+    """
+    headers = parse_headers(header_lines)
+    sans, result = parse_movetext(movetext_lines)
+    try:
+        position = Position.from_fen(headers.get("FEN", START_FEN), move_generator=move_generator)
+    except (ValueError, IndexError, KeyError) as error:
+        raise PgnError(f"Неверный FEN: {error}") from error
+
+    moves = []
+    result = result or headers.get("Result", "*")
+    for ply, san in enumerate(sans):
+        try:
+            move = san_to_move(position, san)
+        except ValueError as error:
+            raise PgnError(f"Полуход {ply + 1}: {error}", ply + 1, san, str(error),
+                           PgnGame(headers, moves, result, position)) from error
+        position.make_move(*move)
+        moves.append(move)
+    return PgnGame(headers, moves, result, position)
+
+
+class PgnReader:
+    def __init__(self, path, move_generator="bitboard", max_errors=100):
+        """
+        Потоковое чтение файла PGN со статистикой.
+        :param path: Путь к файлу.
+        :param move_generator: Генератор ходов для проверки партий.
+        :param max_errors: Сколько сообщений об ошибках сохранять (счётчик ведётся для всех).
+        """
+        self.path = path
+        self.move_generator = move_generator
+        self.max_errors = max_errors
+        self.games_read = 0
+        self.errors = 0
+        self.error_messages = []  # (номер партии в файле, текст ошибки)
+        self.elapsed = 0.0
+
+    def __iter__(self):
+        return self.games()
+
+    def games(self):
+        """
+        Возвращает партии по одной; испорченные партии пропускаются и учитываются в errors.
+        :return: Генератор PgnGame.
+        """
+        start_time = time.perf_counter()
+        try:
+            for index, (header_lines, movetext_lines) in enumerate(iter_game_texts(self.path)):
+                try:
+                    game = parse_game(header_lines, movetext_lines, self.move_generator)
+                except PgnError as error:
+                    self.errors += 1
+                    if len(self.error_messages) < self.max_errors:
+                        self.error_messages.append((index + 1, str(error)))
+                    continue
+                self.games_read += 1
+                self.elapsed = time.perf_counter() - start_time
+                yield game
+        finally:
+            self.elapsed = time.perf_counter() - start_time
+
+    def games_per_second(self):
+        """
+        Скорость чтения: прочитанные (и пропущенные) партии в секунду.
+        """
+        return (self.games_read + self.errors) / max(self.elapsed, 1e-9)
@@ -2,17 +2,15 @@ from classes.pieces.piece import Piece
 
 
 class Bishop(Piece):
-    def __init__(self, color, position, cell_size, start_x, start_y):
+    symbol = "B"
+
+    def __init__(self, color, position):
         """
         Инициализация слона.
         :param color: Цвет слона ("black" или "white").
         :param position: Позиция слона на доске в виде кортежа (row, col).
-        :param cell_size: Размер клетки доски.
-        :param start_x: Начальные координаты по X.
-        :param start_y: Начальные координаты по Y.
         """
-        image_name = "bB.png" if color == "black" else "wB.png"
-        super().__init__(color, position, cell_size, image_name, start_x, start_y)
+        super().__init__(color, position)
 
     def get_valid_moves(self, board):
         """
@@ -1,3 +1,4 @@
+from classes.bitboard import is_square_attacked
 from classes.pieces.bishop import Bishop
 from classes.pieces.knight import Knight
 from classes.pieces.pawn import Pawn
@@ -7,17 +8,15 @@ from classes.pieces.rook import Rook
 
 
 class King(Piece):
-    def __init__(self, color, position, cell_size, start_x, start_y):
+    symbol = "K"
+
+    def __init__(self, color, position):
         """
         Инициализация короля.
         :param color: Цвет короля ("black" или "white").
         :param position: Позиция короля на доске в виде кортежа (row, col).
-        :param cell_size: Размер клетки доски.
-        :param start_x: Начальные координаты по X.
-        :param start_y: Начальные координаты по Y.
         """
-        image_name = "bK.png" if color == "black" else "wK.png"
-        super().__init__(color, position, cell_size, image_name, start_x, start_y)
+        super().__init__(color, position)
         self.has_moved = False  # Флаг, указывающий, двигался ли король
 
     def get_valid_moves(self, board):
@@ -44,17 +43,6 @@ class King(Piece):
             if self.can_castle(board, row, col, 0):
                 valid_moves.append((row, col - 2))
 
-        # Найдем позицию вражеского короля
-        enemy_king_pos = None
-        for r in range(8):
-            for c in range(8):
-                piece = board[r][c]
-                if isinstance(piece, King) and piece.color != self.color:
-                    enemy_king_pos = (r, c)
-                    break
-            if enemy_king_pos:
-                break
-
         # Проверка обычных ходов
         for r, c in moves:
             if 0 <= r < 8 and 0 <= c < 8:
@@ -64,15 +52,9 @@ class King(Piece):
                 if target and target.color == self.color:
                     continue
 
-                # Проверка безопасности клетки
+                # Проверка безопасности клетки (атаки вражеского короля тоже учитываются,
+                # поэтому короли не могут встать рядом)
                 if not self.is_square_attacked(board, r, c):
-
-                    # Проверка расстояния до вражеского короля
-                    if enemy_king_pos:
-                        enemy_row, enemy_col = enemy_king_pos
-                        if abs(r - enemy_row) <= 1 and abs(c - enemy_col) <= 1:
-                            continue  # Пропускаем ход, если короли будут рядом
-
                     valid_moves.append((r, c))
 
         return valid_moves
@@ -90,9 +72,9 @@ class King(Piece):
         if self.has_moved:
             return False
 
-        # Проверяем, что ладья существует и не двигалась
+        # Проверяем, что своя ладья существует и не двигалась
         rook = board[row][rook_col]
-        if not isinstance(rook, Rook) or rook.has_moved:
+        if not isinstance(rook, Rook) or rook.color != self.color or rook.has_moved:
             return False
 
         # Определяем направление и проверяем пустые клетки между
@@ -105,8 +87,8 @@ class King(Piece):
         if self.is_square_attacked(board, row, col):
             return False
 
-        # Проверяем, что король не проходит через атакованные клетки
-        for c in range(col, rook_col + step, step):
+        # Проверяем, что король не проходит через атакованные клетки и не встаёт под удар
+        for c in (col + step, col + 2 * step):
             if self.is_square_attacked(board, row, c):
                 return False
 
@@ -120,6 +102,12 @@ class King(Piece):
         :param col: Столбец клетки.
         :return: True, если клетка атакована, иначе False.
         """
+        position = getattr(self, "board", None)
+        if position is not None and position.grid is board:
+            # Король стоит в позиции — проверяем атаки по её битбордам
+            return is_square_attacked(row * 8 + col, 1 if self.color == "white" else 0, position.bitboards,
+                                      position.occupied())
+
         opponent_color = "black" if self.color == "white" else "white"
 
         # Проверка атак пешек
@@ -150,6 +138,14 @@ class King(Piece):
                 if isinstance(piece, Knight) and piece.color == opponent_color:
                     return True
 
+        # Проверяем атаки короля
+        for r in range(row - 1, row + 2):
+            for c in range(col - 1, col + 2):
+                if (r, c) != (row, col) and 0 <= r < 8 and 0 <= c < 8:
+                    piece = board[r][c]
+                    if isinstance(piece, King) and piece.color == opponent_color:
+                        return True
+
         # Проверяем атаки слонов, ладей и ферзей
         for dr, dc in [(-1, -1), (-1, 1), (1, -1), (1, 1), (-1, 0), (1, 0), (0, -1), (0, 1)]:
             r, c = row + dr, col + dc
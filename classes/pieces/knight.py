@@ -2,17 +2,15 @@ from classes.pieces.piece import Piece
 
 
 class Knight(Piece):
-    def __init__(self, color, position, cell_size, start_x, start_y):
+    symbol = "N"
+
+    def __init__(self, color, position):
         """
         Инициализация коня.
         :param color: Цвет коня ("black" или "white").
         :param position: Позиция коня на доске в виде кортежа (row, col).
-        :param cell_size: Размер клетки доски.
-        :param start_x: Начальные координаты по X.
-        :param start_y: Начальные координаты по Y.
         """
-        image_name = "bN.png" if color == "black" else "wN.png"
-        super().__init__(color, position, cell_size, image_name, start_x, start_y)
+        super().__init__(color, position)
 
     def get_valid_moves(self, board):
         """
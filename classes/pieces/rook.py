@@ -2,17 +2,15 @@ from classes.pieces.piece import Piece
 
 
 class Rook(Piece):
-    def __init__(self, color, position, cell_size, start_x, start_y):
+    symbol = "R"
+
+    def __init__(self, color, position):
         """
         Инициализация ладьи.
         :param color: Цвет ладьи ("black" или "white").
         :param position: Позиция ладьи на доске в виде кортежа (row, col).
-        :param cell_size: Размер клетки доски.
-        :param start_x: Начальные координаты по X.
-        :param start_y: Начальные координаты по Y.
         """
-        image_name = "bR.png" if color == "black" else "wR.png"
-        super().__init__(color, position, cell_size, image_name, start_x, start_y)
+        super().__init__(color, position)
         self.has_moved = False  # Флаг, указывающий, двигался ли король
 
     def get_valid_moves(self, board):
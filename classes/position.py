@@ -0,0 +1,439 @@
+from classes.bitboard import COLOR_INDEX, PIECE_INDEX, BitboardMoveGenerator, can_capture_en_passant
+from classes.game_state_checker import GameStateChecker
+from classes.move_generator import PieceMoveGenerator, is_promotion_move
+from classes.notation import notation_to_square, square_to_notation
+from classes.zobrist import (CASTLING_SQUARES, EN_PASSANT_KEYS, PIECE_KEYS, SIDE_KEY, castling_key,
+                             compute_key)
+from classes.pieces.bishop import Bishop
+from classes.pieces.king import King
+from classes.pieces.knight import Knight
+from classes.pieces.pawn import Pawn
+from classes.pieces.queen import Queen
+from classes.pieces.rook import Rook
+
+# Фигуры, в которые может превратиться пешка (буквы как в UCI)
+PROMOTION_PIECES = {"q": Queen, "r": Rook, "b": Bishop, "n": Knight}
+
+# Доступные генераторы ходов
+MOVE_GENERATORS = {"pieces": PieceMoveGenerator, "bitboard": BitboardMoveGenerator}
+
+# Классы фигур по букве FEN
+PIECE_CLASSES = {piece_class.symbol: piece_class for piece_class in (Pawn, Knight, Bishop, Rook, Queen, King)}
+
+START_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+
+def opponent(color):
+    """
+    Возвращает цвет соперника.
+    :param color: Цвет игрока ("black" или "white").
+    :return: Цвет соперника.
+    """
+    return "black" if color == "white" else "white"
+
+
+class Position:
+    def __init__(self, setup=True, move_generator="pieces"):
+        """
+        Шахматная позиция без привязки к pygame: фигуры, очередь хода и правила игры.
+        Позицию можно создавать без дисплея (анализ, тесты, пакетная обработка).
+        :param setup: Расставить ли фигуры в начальную позицию.
+        :param move_generator: Генератор ходов: "pieces" (методы фигур) или "bitboard" (битборды).
+        """
+        self.grid = [[None for _ in range(8)] for _ in range(8)]
+        # Битборды фигур: индекс цвет * 6 + тип фигуры (см. classes/bitboard.py)
+        self.bitboards = [0] * 12
+        # Клетки королей — чтобы не искать короля по всей доске
+        self.king_squares = {"white": None, "black": None}
+        self.current_player = "white"
+        self.en_passant_target = None
+        # Полуходы после последнего взятия или хода пешкой (правило 50 ходов)
+        self.halfmove_clock = 0
+        # Номер хода (увеличивается после хода чёрных, как в FEN)
+        self.fullmove_number = 1
+        # Ключи Зобриста позиций перед каждым сделанным ходом (для поиска повторений)
+        self.history = []
+        # Ключ Зобриста текущей позиции, обновляется при каждом изменении доски
+        self.zobrist_key = 0
+        self.state_checker = GameStateChecker(self)
+        self.move_generator = MOVE_GENERATORS[move_generator]()
+
+        if setup:
+            self.load_fen(START_FEN)
+
+    @classmethod
+    def from_fen(cls, fen, move_generator="pieces"):
+        """
+        Создаёт позицию по записи FEN.
+        :param fen: Строка FEN.
+        :param move_generator: Генератор ходов ("pieces" или "bitboard").
+        :return: Позиция (Position).
+        """
+        position = cls(setup=False, move_generator=move_generator)
+        position.load_fen(fen)
+        return position
+
+    def load_fen(self, fen):
+        """
+        Расставляет фигуры по записи FEN: расстановка, очередь хода, рокировки, взятие на проходе и счётчики ходов.
+        Права на рокировку переводятся во флаги has_moved короля и ладей.
+        Фигуры ставятся напрямую в сетку и битборды, ключ Зобриста строится один раз в конце.
+        :param fen: Строка FEN.
+        :raises ValueError: Если запись некорректна (позиция при этом не меняется).
+        """
+        fields = fen.split()
+        if not 2 <= len(fields) <= 6:
+            raise ValueError(f"Некорректная запись FEN (нужно от 2 до 6 полей): {fen!r}")
+        placement, side = fields[0], fields[1]
+        castling = fields[2] if len(fields) > 2 else "-"
+        en_passant = fields[3] if len(fields) > 3 else "-"
+        ranks = placement.split("/")
+        if len(ranks) != 8:
+            raise ValueError(f"Некорректная запись FEN (нужно 8 горизонталей): {fen!r}")
+        if side not in ("w", "b"):
+            raise ValueError(f"Некорректная запись FEN (очередь хода — w или b): {fen!r}")
+        if castling != "-" and (not castling or any(letter not in "KQkq" for letter in castling)):
+            raise ValueError(f"Некорректная запись FEN (права на рокировку): {fen!r}")
+        if en_passant != "-" and (len(en_passant) != 2 or en_passant[0] not in "abcdefgh" or en_passant[1] not in "36"):
+            raise ValueError(f"Некорректная запись FEN (клетка взятия на проходе): {fen!r}")
+        counters = fields[4:]
+        if not all(counter.isascii() and counter.isdigit() for counter in counters):
+            raise ValueError(f"Некорректная запись FEN (счётчики ходов — целые числа): {fen!r}")
+
+        grid = [[None] * 8 for _ in range(8)]
+        bitboards = [0] * 12
+        king_squares = {"white": None, "black": None}
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char in "12345678":
+                    col += int(char)
+                    continue
+                piece_class = PIECE_CLASSES.get(char.upper())
+                if piece_class is None or col > 7:
+                    raise ValueError(f"Некорректная запись FEN (горизонталь {8 - row}: {rank!r}): {fen!r}")
+                color = "white" if char.isupper() else "black"
+                piece = piece_class(color, (row, col))
+                if piece_class is Pawn:
+                    piece.has_moved = row != (6 if color == "white" else 1)
+                    piece.board = self
+                elif piece_class is King:
+                    if king_squares[color] is not None:
+                        raise ValueError(f"Некорректная запись FEN (два короля одного цвета): {fen!r}")
+                    piece.has_moved = True
+                    piece.board = self
+                    king_squares[color] = (row, col)
+                elif piece_class is Rook:
+                    piece.has_moved = True
+                grid[row][col] = piece
+                bitboards[COLOR_INDEX[color] * 6 + PIECE_INDEX[piece_class.symbol]] |= 1 << (row * 8 + col)
+                col += 1
+            if col != 8:
+                raise ValueError(f"Некорректная запись FEN (горизонталь {8 - row}: {rank!r}): {fen!r}")
+        if None in king_squares.values():
+            raise ValueError(f"Некорректная запись FEN (нет короля): {fen!r}")
+
+        # Право на рокировку — это неподвижные король и ладья на исходных клетках
+        for letter, row, rook_col in (("K", 7, 7), ("Q", 7, 0), ("k", 0, 7), ("q", 0, 0)):
+            if letter in castling:
+                king, rook = grid[row][4], grid[row][rook_col]
+                if isinstance(king, King) and isinstance(rook, Rook):
+                    king.has_moved = False
+                    rook.has_moved = False
+
+        self.grid = grid
+        self.bitboards = bitboards
+        self.king_squares = king_squares
+        self.current_player = "white" if side == "w" else "black"
+        self.en_passant_target = notation_to_square(en_passant) if en_passant != "-" else None
+        self.halfmove_clock = int(counters[0]) if counters else 0
+        self.fullmove_number = int(counters[1]) if len(counters) > 1 else 1
+        self.history = []
+        self.zobrist_key = compute_key(self)
+
+    def to_fen(self):
+        """
+        Возвращает запись позиции в формате FEN.
+        Клетка взятия на проходе записывается после каждого хода пешки на две клетки.
+        :return: Строка FEN.
+        """
+        ranks = []
+        for row in self.grid:
+            rank = ""
+            empty = 0
+            for piece in row:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank += str(empty)
+                    empty = 0
+                rank += piece.symbol if piece.color == "white" else piece.symbol.lower()
+            if empty:
+                rank += str(empty)
+            ranks.append(rank)
+        en_passant = "-"
+        if self.en_passant_target:
+            en_passant = square_to_notation(self.en_passant_target)
+        return " ".join(("/".join(ranks), "w" if self.current_player == "white" else "b",
+                         self.get_castling_rights() or "-", en_passant,
+                         str(self.halfmove_clock), str(self.fullmove_number)))
+
+    def put_piece(self, piece):
+        """
+        Ставит фигуру на клетку, указанную в её позиции.
+        :param piece: Фигура.
+        """
+        row, col = piece.position
+        self.grid[row][col] = piece
+        index = COLOR_INDEX[piece.color] * 6 + PIECE_INDEX[piece.symbol]
+        self.bitboards[index] |= 1 << (row * 8 + col)
+        self.zobrist_key ^= PIECE_KEYS[index][row * 8 + col]
+        if isinstance(piece, King):
+            self.king_squares[piece.color] = (row, col)
+        if isinstance(piece, (Pawn, King)):
+            piece.board = self  # Пешке нужна позиция для взятия на проходе, королю — битборды для проверки атак
+
+    def remove_piece(self, row, col):
+        """
+        Убирает фигуру с клетки.
+        :param row: Строка клетки.
+        :param col: Столбец клетки.
+        :return: Убранная фигура или None.
+        """
+        piece = self.grid[row][col]
+        if piece is not None:
+            self.grid[row][col] = None
+            index = COLOR_INDEX[piece.color] * 6 + PIECE_INDEX[piece.symbol]
+            self.bitboards[index] &= ~(1 << (row * 8 + col))
+            self.zobrist_key ^= PIECE_KEYS[index][row * 8 + col]
+            if isinstance(piece, King):
+                self.king_squares[piece.color] = None
+        return piece
+
+    def occupied(self):
+        """
+        Возвращает битборд всех занятых клеток.
+        """
+        occupied = 0
+        for bitboard in self.bitboards:
+            occupied |= bitboard
+        return occupied
+
+    def get_castling_rights(self):
+        """
+        Возвращает права на рокировку в виде строки FEN ("KQkq", "" — рокировок нет).
+        Право есть, пока король и соответствующая ладья стоят на местах и не двигались.
+        """
+        rights = ""
+        for color, row, letters in (("white", 7, "KQ"), ("black", 0, "kq")):
+            king = self.grid[row][4]
+            if not isinstance(king, King) or king.color != color or king.has_moved:
+                continue
+            for rook_col, letter in zip((7, 0), letters):
+                rook = self.grid[row][rook_col]
+                if isinstance(rook, Rook) and rook.color == color and not rook.has_moved:
+                    rights += letter
+        return rights
+
+    def find_king_position(self, color):
+        """
+        Находит позицию короля на доске.
+        :param color: Цвет короля ("black" или "white").
+        :return: Позиция короля в виде кортежа (row, col) или None, если короля нет.
+        """
+        return self.king_squares[color]
+
+    def is_king_in_check(self, color):
+        return self.state_checker.is_king_in_check(color)
+
+    def is_checkmate(self, color):
+        return self.state_checker.is_checkmate(color)
+
+    def is_stalemate(self, color):
+        return self.state_checker.is_stalemate(color)
+
+    def get_status(self):
+        """
+        Возвращает состояние партии (GameStatus) для игрока, чей сейчас ход.
+        Вычисляется один раз после хода, повторные вызовы берут его из кэша.
+        """
+        return self.state_checker.get_status()
+
+    def get_pieces(self, color):
+        """
+        Возвращает все фигуры указанного цвета.
+        :param color: Цвет фигур ("black" или "white").
+        :return: Список фигур.
+        """
+        # Битборды — это списки клеток фигур каждого цвета и типа, обходим только занятые клетки
+        pieces = []
+        base = COLOR_INDEX[color] * 6
+        for bitboard in self.bitboards[base:base + 6]:
+            while bitboard:
+                low = bitboard & -bitboard
+                square = low.bit_length() - 1
+                pieces.append(self.grid[square >> 3][square & 7])
+                bitboard ^= low
+        return pieces
+
+    def get_pieces_of_type(self, color, symbol):
+        """
+        Возвращает фигуры указанного цвета и типа.
+        :param color: Цвет фигур ("black" или "white").
+        :param symbol: Буква фигуры ("P", "N", "B", "R", "Q", "K").
+        :return: Список фигур.
+        """
+        pieces = []
+        bitboard = self.bitboards[COLOR_INDEX[color] * 6 + PIECE_INDEX[symbol]]
+        while bitboard:
+            low = bitboard & -bitboard
+            square = low.bit_length() - 1
+            pieces.append(self.grid[square >> 3][square & 7])
+            bitboard ^= low
+        return pieces
+
+    def get_valid_moves(self, piece):
+        """
+        Возвращает ходы фигуры, после которых её король не остаётся под шахом.
+        :param piece: Фигура.
+        :return: Список клеток (row, col), куда фигура может пойти.
+        """
+        return self.move_generator.get_valid_moves(self, piece)
+
+    def get_all_valid_moves(self, color=None):
+        """
+        Возвращает все допустимые ходы игрока.
+        :param color: Цвет игрока, по умолчанию тот, чей сейчас ход.
+        :return: Список кортежей ((start_row, start_col), (end_row, end_col), promotion),
+                 где promotion — буква фигуры превращения ("q", "r", "b", "n") или None.
+        """
+        return self.move_generator.get_all_valid_moves(self, color or self.current_player)
+
+    def has_valid_moves(self, color):
+        """
+        Проверяет, есть ли у игрока хотя бы один допустимый ход.
+        :param color: Цвет игрока ("black" или "white").
+        """
+        return self.move_generator.has_valid_moves(self, color)
+
+    @staticmethod
+    def is_promotion_move(piece, row):
+        """
+        Проверяет, превращается ли пешка при ходе на указанную строку.
+        :param piece: Фигура, которая ходит.
+        :param row: Строка клетки назначения.
+        """
+        return is_promotion_move(piece, row)
+
+    def make_move(self, start, end, promotion=None):
+        """
+        Выполняет ход: взятие на проходе, рокировку и превращение пешки, затем передаёт ход сопернику.
+        Допустимость хода не проверяется. Ход отменяется методом unmake_move.
+        :param start: Клетка, с которой ходит фигура (row, col).
+        :param end: Клетка назначения (row, col).
+        :param promotion: Буква фигуры превращения ("q", "r", "b", "n"), по умолчанию ферзь.
+        :return: Запись для отмены хода: (start, end, фигура, взятая фигура, прежняя клетка взятия на проходе,
+                 прежний флаг has_moved фигуры,
+                 (строка, столбец ладьи, новый столбец ладьи, её has_moved) при рокировке,
+                 прежний ключ Зобриста, прежний счётчик полуходов).
+        """
+        start_row, start_col = start
+        row, col = end
+        piece = self.grid[start_row][start_col]
+        captured = self.grid[row][col]
+        en_passant_target = self.en_passant_target
+        had_moved = getattr(piece, "has_moved", None)
+        castle = None
+        zobrist_key = self.zobrist_key
+        halfmove_clock = self.halfmove_clock
+
+        # Права на рокировку меняются, только если ход затрагивает клетки королей и ладей
+        castling_changes = start in CASTLING_SQUARES or end in CASTLING_SQUARES
+        if castling_changes:
+            self.zobrist_key ^= castling_key(self.get_castling_rights())
+
+        # Сброс флага взятия на проходе (в ключе он есть, только если взять было чем — см. classes/zobrist.py)
+        if en_passant_target and can_capture_en_passant(self.bitboards, en_passant_target,
+                                                        COLOR_INDEX[self.current_player]):
+            self.zobrist_key ^= EN_PASSANT_KEYS[en_passant_target[1]]
+        self.en_passant_target = None
+
+        if isinstance(piece, Pawn):
+            # Ход на две клетки - запоминаем промежуточную клетку
+            if abs(row - start_row) == 2:
+                direction = 1 if piece.color == "black" else -1
+                self.en_passant_target = (start_row + direction, start_col)
+                if can_capture_en_passant(self.bitboards, self.en_passant_target, COLOR_INDEX[opponent(piece.color)]):
+                    self.zobrist_key ^= EN_PASSANT_KEYS[start_col]
+
+            # Взятие на проходе: пешка соперника стоит рядом с атакующей
+            if col != start_col and captured is None:
+                captured = self.remove_piece(start_row, col)
+
+        # Рокировка: дополнительно перемещаем ладью
+        if isinstance(piece, King) and abs(col - start_col) == 2:
+            rook_col, new_rook_col = (7, col - 1) if col > start_col else (0, col + 1)
+            rook = self.remove_piece(start_row, rook_col)
+            castle = (start_row, rook_col, new_rook_col, rook.has_moved)
+            rook.position = (start_row, new_rook_col)
+            rook.has_moved = True
+            self.put_piece(rook)
+
+        self.remove_piece(start_row, start_col)
+        self.remove_piece(row, col)
+        moved = piece
+        if self.is_promotion_move(piece, row):
+            moved = PROMOTION_PIECES[promotion or "q"](piece.color, end)
+        moved.position = end
+        self.put_piece(moved)
+
+        # Король, ладья и пешка после хода теряют право на рокировку/двойной ход
+        if hasattr(moved, "has_moved"):
+            moved.has_moved = True
+
+        if castling_changes:
+            self.zobrist_key ^= castling_key(self.get_castling_rights())
+
+        # Взятие или ход пешкой обнуляют счётчик правила 50 ходов
+        self.halfmove_clock = 0 if captured is not None or isinstance(piece, Pawn) else halfmove_clock + 1
+        self.history.append(zobrist_key)
+        if piece.color == "black":
+            self.fullmove_number += 1
+
+        self.current_player = opponent(self.current_player)
+        self.zobrist_key ^= SIDE_KEY
+        return start, end, piece, captured, en_passant_target, had_moved, castle, zobrist_key, halfmove_clock
+
+    def unmake_move(self, undo):
+        """
+        Отменяет ход, выполненный make_move.
+        :param undo: Запись, которую вернул make_move.
+        """
+        start, end, piece, captured, en_passant_target, had_moved, castle, zobrist_key, halfmove_clock = undo
+
+        # Убираем походившую фигуру (или фигуру, в которую превратилась пешка)
+        self.remove_piece(end[0], end[1])
+        piece.position = start
+        self.put_piece(piece)
+        if had_moved is not None:
+            piece.has_moved = had_moved
+
+        # Взятая фигура возвращается на свою клетку (при взятии на проходе она не совпадает с end)
+        if captured is not None:
+            self.put_piece(captured)
+
+        if castle:
+            row, rook_col, new_rook_col, rook_had_moved = castle
+            rook = self.remove_piece(row, new_rook_col)
+            rook.position = (row, rook_col)
+            rook.has_moved = rook_had_moved
+            self.put_piece(rook)
+
+        self.en_passant_target = en_passant_target
+        self.current_player = opponent(self.current_player)
+        self.zobrist_key = zobrist_key
+        self.halfmove_clock = halfmove_clock
+        if piece.color == "black":
+            self.fullmove_number -= 1
+        self.history.pop()
@@ -0,0 +1,142 @@
+"""
+Менеджер сцен: главное меню, выбор таймера и партия — это сцены в стеке,
+которые по очереди получают события и кадры одного общего цикла.
+
+Сцена, снятая со стека, освобождает свои ресурсы (exit), поэтому сколько бы партий ни было сыграно,
+глубина стека вызовов и расход памяти не растут.
+"""
+
+import pygame
+
+from classes.frame_clock import DEFAULT_FPS, FrameClock
+
+
+class Scene:
+    # Период таймерного события в миллисекундах, пока сцена активна (0 — без таймера)
+    tick_interval = 0
+
+    def __init__(self, manager):
+        """
+        Базовая сцена.
+        :param manager: Менеджер сцен (SceneManager).
+        """
+        self.manager = manager
+
+    def enter(self, screen):
+        """
+        Вызывается, когда сцена становится активной (в том числе при возврате к ней).
+        :param screen: Экран.
+        """
+
+    def exit(self):
+        """
+        Вызывается, когда сцена снимается со стека: здесь освобождаются ресурсы.
+        """
+
+    def handle_event(self, event):
+        """
+        Обрабатывает событие pygame.
+        :param event: Событие.
+        """
+
+    def update(self, screen):
+        """
+        Обновляет и отрисовывает сцену.
+        :param screen: Экран.
+        :return: Список изменившихся прямоугольников или None, если нужно обновить весь экран.
+        """
+        return None
+
+    def is_idle(self):
+        """
+        Может ли цикл спать до следующего события (на экране ничего не меняется само).
+        """
+        return True
+
+
+class SceneManager:
+    def __init__(self, screen, fps=DEFAULT_FPS, workers=1):
+        """
+        Стек сцен и общий игровой цикл.
+        :param screen: Экран.
+        :param fps: Ограничение частоты кадров.
+        :param workers: Число процессов поиска компьютера в партиях против него.
+        """
+        self.screen = screen
+        self.fps = fps
+        self.workers = workers
+        self.scenes = []
+        self.clock = None
+
+    @property
+    def current(self):
+        """
+        Активная сцена (вершина стека) или None.
+        """
+        return self.scenes[-1] if self.scenes else None
+
+    def activate(self):
+        """
+        Готовит активную сцену к работе: свой таймер и вызов enter.
+        """
+        if self.clock is not None:
+            self.clock.stop()
+            self.clock = None
+        scene = self.current
+        if scene is not None:
+            self.clock = FrameClock(self.fps, scene.tick_interval)
+            scene.enter(self.screen)
+
+    def push(self, scene):
+        """
+        Делает сцену активной, предыдущая остаётся в стеке.
+        """
+        self.scenes.append(scene)
+        self.activate()
+
+    def pop(self):
+        """
+        Снимает активную сцену со стека и возвращается к предыдущей.
+        """
+        self.scenes.pop().exit()
+        self.activate()
+
+    def replace(self, scene):
+        """
+        Заменяет активную сцену новой.
+        """
+        self.scenes.pop().exit()
+        self.push(scene)
+
+    def quit(self):
+        """
+        Снимает все сцены — цикл завершается.
+        """
+        while self.scenes:
+            self.scenes.pop().exit()
+        if self.clock is not None:
+            self.clock.stop()
+            self.clock = None
+
+    def run(self):
+        """
+        Общий цикл: пока в стеке есть сцены, активная сцена отрисовывается и получает события.
+        """
+        while self.scenes:
+            scene = self.current
+            dirty = scene.update(self.screen)
+            if scene is not self.current:
+                continue  # Сцена сменилась во время обновления
+
+            if dirty is None:
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
+
+            for event in self.clock.get_events(idle=scene.is_idle()):
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    break
+                scene.handle_event(event)
+                if scene is not self.current:
+                    break  # Остальные события предназначались прежней сцене
@@ -0,0 +1,141 @@
+"""
+Сцены игры: главное меню, выбор таймера и партия.
+"""
+
+import pygame
+
+from classes.board import Board
+from classes.button import Button
+from classes.menu import Menu
+from classes.scene_manager import Scene
+
+# Минуты на партию для кнопок выбора таймера
+TIMER_OPTIONS = {"5 минут": 5, "10 минут": 10, "15 минут": 15}
+
+
+class MenuScene(Scene):
+    def __init__(self, manager, background, fen=None):
+        """
+        Главное меню.
+        :param manager: Менеджер сцен.
+        :param background: Фоновое изображение меню.
+        :param fen: Начальная позиция партий в формате FEN или None.
+        """
+        super().__init__(manager)
+        self.background = background
+        self.fen = fen
+        width, height = manager.screen.get_size()
+        self.menu = Menu(width, height)
+
+    def enter(self, screen):
+        pygame.display.set_caption("Main menu")
+
+    def update(self, screen):
+        # Отрисовка фона
+        screen.blit(self.background, (0, 0))
+
+        # Проверка наведения на кнопки
+        mouse_pos = pygame.mouse.get_pos()
+        for button in self.menu.buttons:
+            button.check_hover(mouse_pos)
+
+        # Отрисовка меню
+        self.menu.draw(screen)
+        return None
+
+    def handle_event(self, event):
+        result = self.menu.handle_event(event)
+        if result == "Игра против компьютера":
+            self.manager.push(TimerSelectScene(self.manager, self.background, mode="human_vs_ai", fen=self.fen))
+        elif result == "Игра против человека":
+            self.manager.push(TimerSelectScene(self.manager, self.background, mode="human_vs_human", fen=self.fen))
+        elif result == "Выход":
+            self.manager.quit()
+
+
+class TimerSelectScene(Scene):
+    def __init__(self, manager, background, mode="human_vs_human", fen=None):
+        """
+        Меню выбора таймера.
+        :param manager: Менеджер сцен.
+        :param background: Фоновое изображение.
+        :param mode: Режим игры ("human_vs_human" или "human_vs_ai").
+        :param fen: Начальная позиция партии в формате FEN или None.
+        """
+        super().__init__(manager)
+        self.background = background
+        self.mode = mode
+        self.fen = fen
+
+        # Создание кнопок для выбора таймера
+        screen_width = manager.screen.get_width()
+        font = pygame.font.Font(None, 72)
+        vertical_spacing = 200  # Расстояние между кнопками
+        start_y = 200  # Начальная позиция по Y
+        self.buttons = [
+            Button(start_y + vertical_spacing * i, text, font, (0, 128, 255), (0, 255, 128), (255, 255, 255), screen_width)
+            for i, text in enumerate(TIMER_OPTIONS)
+        ]
+
+    def enter(self, screen):
+        pygame.display.set_caption("Select timer")
+
+    def update(self, screen):
+        # Отрисовка фона
+        screen.blit(self.background, (0, 0))
+
+        # Проверка наведения на кнопки
+        mouse_pos = pygame.mouse.get_pos()
+        for button in self.buttons:
+            button.check_hover(mouse_pos)
+
+        # Отрисовка кнопок
+        for button in self.buttons:
+            button.draw(screen)
+        return None
+
+    def handle_event(self, event):
+        # Обработка нажатий на кнопки
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for button in self.buttons:
+                if button.rect.collidepoint(event.pos):
+                    # Партия заменяет меню выбора: после неё возвращаемся в главное меню
+                    self.manager.replace(GameScene(self.manager, self.mode, TIMER_OPTIONS[button.text], self.fen))
+                    return
+
+
+class GameScene(Scene):
+    # Таймерное событие будит спящий цикл, чтобы шли часы
+    tick_interval = 200
+
+    def __init__(self, manager, mode, timer_minutes, fen=None):
+        """
+        Партия.
+        :param manager: Менеджер сцен.
+        :param mode: Режим игры ("human_vs_human" или "human_vs_ai").
+        :param timer_minutes: Минут на партию каждому игроку.
+        :param fen: Начальная позиция в формате FEN или None.
+        """
+        super().__init__(manager)
+        width, height = manager.screen.get_size()
+        self.board = Board(width, height, mode=mode, timer_minutes=timer_minutes, fen=fen, workers=manager.workers)
+
+    def enter(self, screen):
+        self.board.start(screen)
+
+    def exit(self):
+        # Останавливаем поиск компьютера и закрываем запись партии
+        self.board.close()
+        self.board = None
+
+    def update(self, screen):
+        dirty = self.board.update(screen)
+        if self.board.is_finished():
+            self.manager.pop()
+        return dirty
+
+    def handle_event(self, event):
+        self.board.handle_event(event)
+
+    def is_idle(self):
+        return self.board.is_idle()
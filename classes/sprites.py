@@ -0,0 +1,98 @@
+"""
+Общий для всего процесса кэш изображений фигур.
+
+Каждый PNG из images/ декодируется один раз, масштабированная копия хранится одна на пару
+(изображение, размер клетки) и используется всеми досками. По желанию все фигуры одного размера
+собираются в один атлас — одну поверхность, из которой фигуры копируются по прямоугольникам.
+"""
+
+import os
+
+import pygame
+
+IMAGES_DIR = "images"
+PIECE_SYMBOLS = ("K", "Q", "R", "B", "N", "P")
+
+_images = {}  # Декодированные изображения по имени файла
+_scaled = {}  # Масштабированные изображения по (имя файла, размер)
+_atlases = {}  # Атласы по размеру клетки: (поверхность, прямоугольники по имени файла)
+
+
+def piece_image_name(color, symbol):
+    """
+    Возвращает имя файла изображения фигуры (например, "wK.png" или "bp.png").
+    :param color: Цвет фигуры ("black" или "white").
+    :param symbol: Буква фигуры ("K", "Q", "R", "B", "N", "P").
+    """
+    return f"{'b' if color == 'black' else 'w'}{'p' if symbol == 'P' else symbol}.png"
+
+
+def load_image(name):
+    """
+    Загружает изображение из images/ один раз за всё время работы процесса.
+    Если окно уже создано, изображение переводится в формат экрана с прозрачностью (convert_alpha).
+    :param name: Имя файла.
+    :return: Поверхность pygame.
+    """
+    image = _images.get(name)
+    if image is None:
+        image = pygame.image.load(os.path.join(IMAGES_DIR, name))
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        _images[name] = image
+    return image
+
+
+def get_scaled_image(name, size):
+    """
+    Возвращает изображение, масштабированное до квадрата size x size.
+    :param name: Имя файла.
+    :param size: Сторона квадрата в пикселях.
+    """
+    key = (name, size)
+    image = _scaled.get(key)
+    if image is None:
+        image = pygame.transform.scale(load_image(name), (size, size))
+        _scaled[key] = image
+    return image
+
+
+def get_piece_sprite(color, symbol, size):
+    """
+    Возвращает изображение фигуры под размер клетки.
+    :param color: Цвет фигуры ("black" или "white").
+    :param symbol: Буква фигуры.
+    :param size: Размер клетки в пикселях.
+    """
+    return get_scaled_image(piece_image_name(color, symbol), size)
+
+
+def get_atlas(size):
+    """
+    Возвращает атлас всех фигур одного размера.
+    :param size: Размер клетки в пикселях.
+    :return: (поверхность атласа, словарь прямоугольников фигур по имени файла).
+    """
+    atlas = _atlases.get(size)
+    if atlas is None:
+        names = [piece_image_name(color, symbol) for color in ("white", "black") for symbol in PIECE_SYMBOLS]
+        surface = pygame.Surface((size * len(PIECE_SYMBOLS), size * 2), pygame.SRCALPHA)
+        rects = {}
+        for index, name in enumerate(names):
+            rect = pygame.Rect(index % len(PIECE_SYMBOLS) * size, index // len(PIECE_SYMBOLS) * size, size, size)
+            surface.blit(get_scaled_image(name, size), rect)
+            rects[name] = rect
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        atlas = (surface, rects)
+        _atlases[size] = atlas
+    return atlas
+
+
+def clear_cache():
+    """
+    Очищает кэш (например, после смены видеорежима, когда формат экрана изменился).
+    """
+    _images.clear()
+    _scaled.clear()
+    _atlases.clear()
@@ -0,0 +1,436 @@
+"""
+Таблицы эндшпиля для малых окончаний (KQK, KRK, KPK, KBNK): результат и расстояние до мата
+для каждой позиции, посчитанные ретроградным анализом.
+
+Во всех окончаниях у сильной стороны король и одна-две фигуры, у слабой — голый король; в таблице
+сильная сторона — белые (позиции с сильными чёрными отражаются по вертикали).
+Файл окончания — заголовок и два массива по байту на позицию: при ходе белых и при ходе чёрных.
+Байт 0 — ничья (или невозможная позиция), иначе число полуходов до мата плюс один: при ходе белых
+это выигрыш белых, при ходе чёрных — проигрыш чёрных. Файлы отображаются в память (mmap)
+и при открытии не читаются.
+
+Позиции сводятся симметриями доски: без пешек белый король ставится в треугольник a1–d1–d4
+(8 симметрий), с пешкой — на вертикали a–d (отражение слева направо).
+
+Генерация: сначала находятся все маты, затем уровень за уровнем отменяются ходы. Из проигрыша чёрных
+за n полуходов отмена хода белых даёт выигрыш белых за n + 1. Из выигрыша белых отмена хода чёрного
+короля уменьшает счётчик оставшихся ходов чёрных, и когда все ходы ведут к выигрышу белых, позиция
+становится проигрышем за n + 1. Счётчики взвешены размером класса симметрии, чтобы позиции,
+симметричные относительно диагонали, считались верно.
+"""
+
+import mmap
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import product
+
+from classes.bitboard import BISHOP, KING, KING_ATTACKS, KNIGHT, PAWN, QUEEN, ROOK, attacks_of
+
+DEFAULT_DIRECTORY = "tablebases"
+
+# Фигуры сильной стороны (кроме короля) в порядке индексации
+ENDGAMES = {"KQK": (QUEEN,), "KRK": (ROOK,), "KPK": (PAWN,), "KBNK": (BISHOP, KNIGHT)}
+# Окончания, в которые переходит KPK при превращении пешки (в коня или слона — ничья)
+PROMOTION_ENDGAMES = {QUEEN: "KQK", ROOK: "KRK"}
+# Окончание по набору фигур сильной стороны
+MATERIAL = {tuple(sorted(pieces)): name for name, pieces in ENDGAMES.items()}
+# Голый король против короля с одной лёгкой фигурой — ничья без таблиц
+DRAWN_MATERIAL = {(), (KNIGHT,), (BISHOP,)}
+MAX_PIECES = 4
+
+# Результат для стороны, которая ходит
+WIN, DRAW, LOSS = 1, 0, -1
+
+MAGIC = b"CPYTB001"
+HEADER_SIZE = 16  # MAGIC и имя окончания, дополненное нулями
+
+# Симметрии доски (row, col) -> (row, col); TRANSFORMS[1] — отражение слева направо,
+# TRANSFORMS[DIAGONAL] — отражение относительно диагонали a1–h8
+TRANSFORMS = (lambda row, col: (row, col), lambda row, col: (row, 7 - col),
+              lambda row, col: (7 - row, col), lambda row, col: (7 - row, 7 - col),
+              lambda row, col: (col, row), lambda row, col: (col, 7 - row),
+              lambda row, col: (7 - col, row), lambda row, col: (7 - col, 7 - row))
+# SYMMETRIES[номер симметрии][клетка] — клетка после преобразования
+SYMMETRIES = [[row * 8 + col for row, col in (transform(square >> 3, square & 7) for square in range(64))]
+              for transform in TRANSFORMS]
+DIAGONAL = 7
+
+# Значение счётчика для позиций чёрных, которые не могут быть проигрышем (взятие фигуры или пат)
+ESCAPE = 255
+
+
+class Layout:
+    def __init__(self, name):
+        """
+        Схема индексации окончания: индекс = (клетка белого короля в области, чёрный король, фигуры...),
+        по 6 бит на клетку.
+        :param name: Имя окончания ("KQK", "KRK", "KPK", "KBNK").
+        """
+        self.name = name
+        self.pieces = ENDGAMES[name]
+        self.has_pawns = PAWN in self.pieces
+        if self.has_pawns:
+            symmetries = SYMMETRIES[:2]
+            self.region = [square for square in range(64) if square & 7 <= 3]
+        else:
+            symmetries = SYMMETRIES
+            self.region = [square for square in range(64) if 7 - (square >> 3) <= (square & 7) <= 3]
+        region_index = {square: index for index, square in enumerate(self.region)}
+        # Для каждой клетки белого короля — симметрии, переводящие её в область, и номер клетки в области
+        self.transforms = [[(region_index[symmetry[square]], symmetry) for symmetry in symmetries
+                            if symmetry[square] in region_index] for square in range(64)]
+        self.size = len(self.region) << 6 * (1 + len(self.pieces))
+
+    def index(self, squares):
+        """
+        Индекс позиции: наименьший среди симметричных позиций с белым королём в области.
+        :param squares: Клетки (белый король, чёрный король, фигуры в порядке ENDGAMES).
+        """
+        best = -1
+        for king_index, symmetry in self.transforms[squares[0]]:
+            index = king_index
+            for square in squares[1:]:
+                index = index << 6 | symmetry[square]
+            if best < 0 or index < best:
+                best = index
+        return best
+
+    def squares(self, index):
+        """
+        Клетки позиции по индексу (обратное к index для позиций из области).
+        """
+        squares = []
+        for _ in range(len(self.pieces) + 1):
+            squares.append(index & 63)
+            index >>= 6
+        squares.append(self.region[index])
+        squares.reverse()
+        return squares
+
+    def weight(self, squares):
+        """
+        Вес позиции в счётчиках ходов — размер её класса симметрии в единицах наименьшего класса.
+        Без пешек класс вдвое меньше у позиций, симметричных относительно диагонали.
+        """
+        if self.has_pawns:
+            return 1
+        diagonal = SYMMETRIES[DIAGONAL]
+        for square in squares:
+            if diagonal[square] != square:
+                return 2
+        return 1
+
+
+def is_king_attacked(pieces, squares, occupied):
+    """
+    Проверяет, атакован ли чёрный король белыми фигурами.
+    :param pieces: Типы белых фигур (без короля).
+    :param squares: Клетки (белый король, чёрный король, фигуры).
+    :param occupied: Занятость доски.
+    """
+    king = squares[1]
+    if KING_ATTACKS[squares[0]] >> king & 1:
+        return True
+    for piece_type, square in zip(pieces, squares[2:]):
+        if attacks_of(piece_type, square, occupied) >> king & 1:
+            return True
+    return False
+
+
+def pawn_origins(square, occupied):
+    """
+    Клетки, с которых белая пешка могла прийти на square ходом без взятия.
+    """
+    origins = 0
+    if square < 48 and not occupied >> (square + 8) & 1:
+        origins |= 1 << (square + 8)
+        if 32 <= square < 40 and not occupied >> (square + 16) & 1:
+            origins |= 1 << (square + 16)
+    return origins
+
+
+def table_path(name, directory=DEFAULT_DIRECTORY):
+    return os.path.join(directory, f"{name}.bin")
+
+
+def table_header(name):
+    return MAGIC + name.encode("ascii").ljust(HEADER_SIZE - len(MAGIC), b"\0")
+
+
+def generate(name, directory=DEFAULT_DIRECTORY):
+    """
+    Считает таблицу окончания и записывает её в файл. Для KPK нужны готовые KQK и KRK.
+    :param name: Имя окончания.
+    :param directory: Папка с таблицами.
+    :return: Словарь: имя, число выигрышей при ходе белых, наибольшее расстояние до мата (полуходы), время.
+    """
+    start_time = time.perf_counter()
+    layout = Layout(name)
+    pieces = layout.pieces
+    white = bytearray(layout.size)  # При ходе белых: 0 — ничья, иначе полуходов до мата + 1
+    black = bytearray(layout.size)  # При ходе чёрных: 0 — ничья, иначе полуходов до мата + 1
+    counters = bytearray(layout.size)  # Оставшиеся ходы чёрных (с весами), ESCAPE — проигрыша нет
+    frontier = []
+    seeds = {}  # Выигрыши белых превращением: число полуходов -> индексы
+    promotion_tables = {}
+    if layout.has_pawns:
+        promotion_tables = {piece: Tablebase(table_name, directory)
+                            for piece, table_name in PROMOTION_ENDGAMES.items()}
+
+    # Начальный проход: маты, паты, взятия и число ходов чёрного короля в каждой позиции
+    for king_index, king in enumerate(layout.region):
+        diagonal_king = len(layout.transforms[king]) > 1
+        for others in product(range(64), repeat=len(pieces)):
+            occupied = 1 << king
+            for square in others:
+                occupied |= 1 << square
+            if occupied.bit_count() != len(others) + 1:
+                continue
+            if layout.has_pawns and not 8 <= others[0] < 56:
+                continue  # Пешка не бывает на крайних горизонталях
+            # Атаки белых без чёрного короля: король не может уйти вдоль линии атаки дальнобойной фигуры
+            attacks = KING_ATTACKS[king]
+            for piece_type, square in zip(pieces, others):
+                attacks |= attacks_of(piece_type, square, occupied)
+            for black_king in range(64):
+                if occupied >> black_king & 1 or KING_ATTACKS[king] >> black_king & 1:
+                    continue
+                squares = (king, black_king) + others
+                index = king_index << 6 | black_king
+                for square in others:
+                    index = index << 6 | square
+                if diagonal_king and layout.index(squares) != index:
+                    continue  # Позиция хранится под симметричным индексом
+
+                targets = KING_ATTACKS[black_king] & ~attacks
+                if targets & occupied:
+                    counters[index] = ESCAPE  # Чёрный король берёт незащищённую фигуру
+                elif targets:
+                    counters[index] = targets.bit_count() * layout.weight(squares)
+                elif attacks >> black_king & 1:
+                    black[index] = 1  # Мат
+                    frontier.append(index)
+                else:
+                    counters[index] = ESCAPE  # Пат
+
+                # Превращение пешки при ходе белых (позиция допустима, только если чёрный король не под шахом)
+                if layout.has_pawns and others[0] < 16 and not attacks >> black_king & 1:
+                    target = others[0] - 8
+                    if target != black_king and target != king:
+                        for table in promotion_tables.values():
+                            value = table.probe_squares((king, black_king, target), white_to_move=False)
+                            if value:
+                                seeds.setdefault(value, []).append(index)
+
+    # Ретроградный анализ по уровням: plies — число полуходов до мата в позициях frontier
+    plies = 0
+    last_seed = max(seeds, default=0)
+    while frontier or plies < last_seed:
+        next_frontier = []
+        if plies % 2 == 0:
+            # Проигрыши чёрных: отменяем ход белого короля или фигуры
+            for index in frontier:
+                squares = layout.squares(index)
+                occupied = 0
+                for square in squares:
+                    occupied |= 1 << square
+                for slot in range(len(squares)):
+                    if slot == 1:
+                        continue
+                    square = squares[slot]
+                    piece_type = KING if slot == 0 else pieces[slot - 2]
+                    if piece_type == PAWN:
+                        origins = pawn_origins(square, occupied)
+                    else:
+                        origins = attacks_of(piece_type, square, occupied) & ~occupied
+                    while origins:
+                        low = origins & -origins
+                        origins ^= low
+                        moved = list(squares)
+                        moved[slot] = low.bit_length() - 1
+                        # При ходе белых чёрный король не может стоять под шахом
+                        if is_king_attacked(pieces, moved, occupied ^ (1 << square) ^ low):
+                            continue
+                        previous = layout.index(moved)
+                        if not white[previous]:
+                            white[previous] = plies + 2
+                            next_frontier.append(previous)
+            for index in seeds.get(plies + 1, ()):
+                if not white[index]:
+                    white[index] = plies + 2
+                    next_frontier.append(index)
+        else:
+            # Выигрыши белых: отменяем ход чёрного короля
+            for index in frontier:
+                squares = layout.squares(index)
+                occupied = 0
+                for square in squares:
+                    occupied |= 1 << square
+                weight = layout.weight(squares)
+                origins = KING_ATTACKS[squares[1]] & ~occupied & ~KING_ATTACKS[squares[0]]
+                while origins:
+                    low = origins & -origins
+                    origins ^= low
+                    moved = list(squares)
+                    moved[1] = low.bit_length() - 1
+                    previous = layout.index(moved)
+                    counter = counters[previous]
+                    if counter == ESCAPE or black[previous]:
+                        continue
+                    counter -= weight
+                    counters[previous] = counter
+                    if counter == 0:
+                        # Все ходы чёрных ведут к выигрышу белых
+                        black[previous] = plies + 2
+                        next_frontier.append(previous)
+        frontier = next_frontier
+        plies += 1
+
+    for table in promotion_tables.values():
+        table.close()
+
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    path = table_path(name, directory)
+    with open(path + ".tmp", "wb") as file:
+        file.write(table_header(name))
+        file.write(white)
+        file.write(black)
+    os.replace(path + ".tmp", path)
+    return {"name": name, "wins": layout.size - white.count(0), "max_plies": max(white) - 1,
+            "time": time.perf_counter() - start_time}
+
+
+def generate_all(names=tuple(ENDGAMES), directory=DEFAULT_DIRECTORY, workers=None, report=None):
+    """
+    Генерирует таблицы в пуле процессов: независимые окончания считаются одновременно,
+    KPK — после KQK и KRK, от которых он зависит.
+    :param names: Имена окончаний.
+    :param directory: Папка с таблицами.
+    :param workers: Число процессов (по умолчанию — число ядер).
+    :param report: Функция report(сводка), вызываемая после каждого окончания, или None.
+    :return: Список сводок generate.
+    """
+    names = list(names)
+    # Недостающие таблицы, от которых зависят заказанные окончания, считаются тоже
+    for name in list(names):
+        if PAWN in ENDGAMES[name]:
+            for dependency in PROMOTION_ENDGAMES.values():
+                if dependency not in names and not os.path.exists(table_path(dependency, directory)):
+                    names.insert(0, dependency)
+    waiting = {name: {dependency for dependency in PROMOTION_ENDGAMES.values() if dependency in names}
+               if PAWN in ENDGAMES[name] else set() for name in names}
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        while waiting or running:
+            for name in [name for name, dependencies in waiting.items() if not dependencies]:
+                del waiting[name]
+                running[executor.submit(generate, name, directory)] = name
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished = running.pop(future)
+                summary = future.result()
+                summaries.append(summary)
+                if report:
+                    report(summary)
+                for dependencies in waiting.values():
+                    dependencies.discard(finished)
+    return summaries
+
+
+class Tablebase:
+    def __init__(self, name, directory=DEFAULT_DIRECTORY):
+        """
+        Таблица одного окончания, отображённая в память.
+        :param name: Имя окончания.
+        :param directory: Папка с таблицами.
+        :raises OSError: Файла нет.
+        :raises ValueError: Файл повреждён или от другой версии.
+        """
+        self.layout = Layout(name)
+        self.file = open(table_path(name, directory), "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) != HEADER_SIZE + 2 * self.layout.size or self.data[:HEADER_SIZE] != table_header(name):
+            self.close()
+            raise ValueError(f"Файл таблицы {name} повреждён")
+
+    def probe_squares(self, squares, white_to_move):
+        """
+        Значение позиции в таблице.
+        :param squares: Клетки (белый король, чёрный король, фигуры в порядке ENDGAMES).
+        :param white_to_move: Ход белых.
+        :return: 0 — ничья, иначе число полуходов до мата плюс один.
+        """
+        offset = HEADER_SIZE + self.layout.index(squares)
+        if not white_to_move:
+            offset += self.layout.size
+        return self.data[offset]
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+
+class Tablebases:
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        """
+        Все таблицы из папки; файлы открываются при первом обращении к окончанию.
+        :param directory: Папка с таблицами.
+        """
+        self.directory = directory
+        self.tables = {}  # Имя окончания -> Tablebase или None, если файла нет
+
+    def get_table(self, name):
+        if name not in self.tables:
+            try:
+                self.tables[name] = Tablebase(name, self.directory)
+            except (OSError, ValueError):
+                self.tables[name] = None
+        return self.tables[name]
+
+    def probe(self, position):
+        """
+        Ищет позицию в таблицах.
+        :param position: Позиция (Position).
+        :return: (WIN, DRAW или LOSS для ходящего, полуходов до мата) или None, если окончания нет в таблицах.
+        """
+        bitboards = position.bitboards
+        strong = None
+        pieces = []
+        for color in (0, 1):
+            for piece_type in range(KING):
+                bitboard = bitboards[color * 6 + piece_type]
+                if bitboard:
+                    if strong is not None and strong != color:
+                        return None  # Фигуры есть у обеих сторон
+                    strong = color
+                    pieces.extend([piece_type] * bitboard.bit_count())
+                    if len(pieces) > MAX_PIECES - 2:
+                        return None
+        pieces.sort()
+        if tuple(pieces) in DRAWN_MATERIAL:
+            return DRAW, 0
+        name = MATERIAL.get(tuple(pieces))
+        table = self.get_table(name) if name else None
+        if table is None or position.get_castling_rights():
+            return None
+
+        # Клетки в порядке таблицы; если сильнее чёрные, доска отражается по вертикали
+        flip = 56 if strong == 1 else 0
+        squares = [(bitboards[strong * 6 + KING].bit_length() - 1) ^ flip,
+                   (bitboards[(1 - strong) * 6 + KING].bit_length() - 1) ^ flip]
+        for piece_type in table.layout.pieces:
+            squares.append((bitboards[strong * 6 + piece_type].bit_length() - 1) ^ flip)
+        strong_to_move = position.current_player == ("white" if strong == 0 else "black")
+        value = table.probe_squares(squares, strong_to_move)
+        if not value:
+            return DRAW, 0
+        return (WIN if strong_to_move else LOSS), value - 1
+
+    def close(self):
+        for table in self.tables.values():
+            if table is not None:
+                table.close()
+        self.tables = {}
@@ -0,0 +1,374 @@
+"""
+Турнир движков без окна: партии движок против движка в пуле процессов.
+
+Каждая позиция из набора дебютов играется дважды со сменой цвета, ход ограничен временем
+или числом узлов. Партии записываются в PGN, по результатам считается разница в Elo
+с доверительным интервалом и последовательный тест (SPRT), который останавливает
+турнир, как только результат статистически ясен.
+"""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from classes.engine import SearchEngine
+from classes.game_record import default_headers
+from classes.notation import move_to_san, san_to_move
+from classes.pgn_reader import PgnReader
+from classes.position import START_FEN, Position
+
+# Короткие дебюты (SAN) для набора по умолчанию
+DEFAULT_OPENINGS = [
+    "e4 e5 Nf3 Nc6 Bb5",
+    "e4 e5 Nf3 Nc6 Bc4",
+    "e4 c5 Nf3 d6 d4",
+    "e4 e6 d4 d5",
+    "e4 c6 d4 d5",
+    "d4 d5 c4 e6",
+    "d4 d5 c4 c6",
+    "d4 Nf6 c4 g6",
+    "d4 Nf6 c4 e6 Nc3 Bb4",
+    "c4 e5 Nc3 Nf6",
+    "Nf3 d5 g3 Nf6",
+    "e4 d5 exd5 Qxd5",
+]
+
+# Параметры движка в описании "search:time=0.1,nodes=5000" и соответствующие параметры SearchEngine
+ENGINE_OPTIONS = {"time": ("time_limit", float), "nodes": ("node_limit", int), "depth": ("max_depth", int),
+                  "hash": ("hash_mb", int), "tb": ("tablebases", str)}
+ENGINE_TYPES = ("search", "random")
+
+MAX_PLIES = 300  # После стольких полуходов партия признаётся ничьей
+
+
+def parse_engine(spec, time_limit=None, node_limit=None):
+    """
+    Разбирает описание движка: "тип[:параметр=значение,...]".
+    Тип — "search" (SearchEngine) или "random" (случайные ходы). Параметры: time (секунд на ход),
+    nodes (узлов на ход), depth, hash (МБ), tb (папка таблиц эндшпиля) и name (имя в таблице и PGN).
+    :param spec: Строка описания.
+    :param time_limit: Время на ход по умолчанию.
+    :param node_limit: Лимит узлов на ход по умолчанию.
+    :return: Словарь {"name": ..., "type": ..., "options": параметры SearchEngine}.
+    :raises ValueError: Неизвестный тип или параметр.
+    """
+    kind, _, text = spec.partition(":")
+    if kind not in ENGINE_TYPES:
+        raise ValueError(f"Неизвестный тип движка: {kind!r}")
+    engine = {"name": spec, "type": kind, "options": {"time_limit": time_limit, "node_limit": node_limit}}
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        if key == "name":
+            engine["name"] = value
+        elif key in ENGINE_OPTIONS:
+            option, convert = ENGINE_OPTIONS[key]
+            engine["options"][option] = convert(value)
+        else:
+            raise ValueError(f"Неизвестный параметр движка: {key!r}")
+    if kind == "search" and not engine["options"]["time_limit"] and not engine["options"]["node_limit"]:
+        raise ValueError(f"Для движка {engine['name']!r} не задан лимит времени или узлов")
+    return engine
+
+
+def load_openings(path=None, plies=8):
+    """
+    Загружает набор дебютных позиций.
+    :param path: Файл PGN (берутся первые plies полуходов каждой партии), файл с FEN или EPD по строке
+                 или None — встроенный набор DEFAULT_OPENINGS.
+    :param plies: Сколько полуходов брать из партий PGN.
+    :return: Список строк FEN.
+    """
+    fens = []
+    if path is None:
+        for line in DEFAULT_OPENINGS:
+            position = Position(move_generator="bitboard")
+            for san in line.split():
+                position.make_move(*san_to_move(position, san))
+            fens.append(position.to_fen())
+    elif path.endswith(".pgn"):
+        for game in PgnReader(path):
+            position = Position.from_fen(game.headers.get("FEN", START_FEN), move_generator="bitboard")
+            for move in game.moves[:plies]:
+                position.make_move(*move)
+            fens.append(position.to_fen())
+    else:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                fields = line.split()
+                if not fields:
+                    continue
+                # В строках EPD после четырёх полей FEN идут операции ("bm e4; id ..."), а не счётчики ходов
+                if len(fields) < 6 or not (fields[4].isdigit() and fields[5].isdigit()):
+                    fields = fields[:4]
+                fens.append(Position.from_fen(" ".join(fields[:6])).to_fen())
+    if not fens:
+        raise ValueError(f"В наборе дебютов {path!r} нет позиций")
+    return fens
+
+
+def make_player(engine, seed):
+    """
+    Создаёт игрока по описанию движка.
+    :return: Функция player(position), возвращающая ход и число узлов поиска.
+    """
+    if engine["type"] == "random":
+        generator = random.Random(seed)
+        return lambda position: (generator.choice(position.get_all_valid_moves()), 0)
+
+    search = SearchEngine(None, **{key: value for key, value in engine["options"].items() if value is not None})
+
+    def player(position):
+        move = search.get_best_move(position)
+        return move, search.last_info.get("nodes", 0)
+    return player
+
+
+def play_game(task):
+    """
+    Играет одну партию (выполняется в процессе пула).
+    :param task: (номер партии, движок белых, движок чёрных, FEN начальной позиции, предел полуходов).
+    :return: Словарь с ходами в SAN, результатом, числом узлов и затраченным процессорным временем.
+    """
+    number, white, black, fen, max_plies = task
+    start_cpu = time.process_time()
+    start_time = time.perf_counter()
+    position = Position.from_fen(fen, move_generator="bitboard")
+    players = {"white": make_player(white, number * 2), "black": make_player(black, number * 2 + 1)}
+    nodes = {"white": 0, "black": 0}
+    moves = []
+    while True:
+        status = position.get_status()
+        if status.is_over:
+            result = status.get_result()
+            reason = status.reason or status.state
+            termination = "normal"
+            break
+        if len(moves) >= max_plies:
+            result, reason, termination = "1/2-1/2", "max_plies", "adjudication"
+            break
+        color = position.current_player
+        move, move_nodes = players[color](position)
+        nodes[color] += move_nodes
+        moves.append(move_to_san(position, move))
+        position.make_move(*move)
+    return {
+        "game": number,
+        "white": white["name"],
+        "black": black["name"],
+        "fen": fen,
+        "moves": moves,
+        "result": result,
+        "reason": reason,
+        "termination": termination,
+        "nodes": nodes,
+        "cpu": time.process_time() - start_cpu,
+        "time": time.perf_counter() - start_time,
+    }
+
+
+def game_headers(game):
+    """
+    Заголовки PGN для сыгранной партии (Seven Tag Roster — как у GameRecord, Result добавляет format_pgn).
+    """
+    headers = default_headers()
+    headers.update({"Event": "Engine tournament", "Round": str(game["game"]),
+                    "White": game["white"], "Black": game["black"]})
+    if game["fen"] != START_FEN:
+        headers["SetUp"] = "1"
+        headers["FEN"] = game["fen"]
+    headers["PlyCount"] = str(len(game["moves"]))
+    headers["Termination"] = game["termination"]
+    return headers
+
+
+def expected_score(elo):
+    """
+    Ожидаемый результат (доля очков) при разнице в рейтинге elo.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score):
+    """
+    Разница в рейтинге, соответствующая доле очков score.
+    """
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+class MatchStats:
+    def __init__(self, first, second):
+        """
+        Счёт матча двух движков с точки зрения первого.
+        :param first: Имя первого движка.
+        :param second: Имя второго движка.
+        """
+        self.first = first
+        self.second = second
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    def add(self, game):
+        """
+        Учитывает партию, если её играли эти два движка.
+        :return: True, если партия учтена.
+        """
+        if {game["white"], game["black"]} != {self.first, self.second} or game["result"] == "*":
+            return False
+        if game["result"] == "1/2-1/2":
+            self.draws += 1
+        elif (game["result"] == "1-0") == (game["white"] == self.first):
+            self.wins += 1
+        else:
+            self.losses += 1
+        return True
+
+    @property
+    def games(self):
+        return self.wins + self.draws + self.losses
+
+    def score(self):
+        """
+        Доля набранных очков первого движка.
+        """
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    def variance(self):
+        """
+        Дисперсия результата одной партии (по наблюдаемым долям побед, ничьих и поражений).
+        """
+        if not self.games:
+            return 0.0
+        score = self.score()
+        return ((self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2 + self.losses * score ** 2)
+                / self.games)
+
+    def elo(self, confidence=0.95):
+        """
+        Разница в Elo и границы доверительного интервала.
+        :param confidence: Уровень доверия.
+        :return: (elo, нижняя граница, верхняя граница).
+        """
+        score = self.score()
+        if not self.games:
+            return 0.0, -math.inf, math.inf
+        margin = normal_quantile(0.5 + confidence / 2) * math.sqrt(self.variance() / self.games)
+        return score_to_elo(score), score_to_elo(score - margin), score_to_elo(score + margin)
+
+    def sprt(self, elo0, elo1, alpha=0.05, beta=0.05):
+        """
+        Последовательный тест отношения правдоподобия: H0 — разница elo0, H1 — разница elo1
+        (нормальное приближение для результатов партий).
+        :return: (LLR, нижняя граница, верхняя граница, решение: "H0", "H1" или None — играть дальше).
+        """
+        lower = math.log(beta / (1 - alpha))
+        upper = math.log((1 - beta) / alpha)
+        if not self.games:
+            return 0.0, lower, upper, None
+        # К счёту добавляется по половине победы, ничьей и поражения, чтобы серия из одних побед
+        # (нулевая дисперсия) не давала бесконечного LLR
+        wins, draws, losses = self.wins + 0.5, self.draws + 0.5, self.losses + 0.5
+        games = wins + draws + losses
+        score = (wins + draws / 2) / games
+        variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+        score0, score1 = expected_score(elo0), expected_score(elo1)
+        llr = self.games * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+        decision = "H1" if llr >= upper else "H0" if llr <= lower else None
+        return llr, lower, upper, decision
+
+    def format(self):
+        """
+        Строка для таблицы результатов.
+        """
+        elo, low, high = self.elo()
+        return (f"{self.first} — {self.second}: +{self.wins} ={self.draws} -{self.losses} "
+                f"({self.score() * 100:.1f}%), Elo {elo:+.1f} [{low:+.1f}, {high:+.1f}]")
+
+
+def normal_quantile(probability):
+    """
+    Квантиль стандартного нормального распределения (приближение Акклама).
+    """
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02,
+         -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01,
+         -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00,
+         4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+    if probability < 0.02425:
+        q = math.sqrt(-2 * math.log(probability))
+        return (((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) / \
+            ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1)
+    if probability > 1 - 0.02425:
+        return -normal_quantile(1 - probability)
+    q = probability - 0.5
+    r = q * q
+    return (((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q / \
+        (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1)
+
+
+def make_tasks(engines, openings, games, max_plies=MAX_PLIES):
+    """
+    Составляет расписание: круговой турнир, каждая дебютная позиция — пара партий со сменой цвета.
+    :param engines: Описания движков (parse_engine).
+    :param openings: Позиции FEN.
+    :param games: Общее число партий.
+    :param max_plies: Предел полуходов в партии.
+    :return: Генератор заданий для play_game.
+    """
+    pairs = [(first, second) for index, first in enumerate(engines) for second in engines[index + 1:]]
+    number = 0
+    round_number = 0
+    while number < games:
+        fen = openings[round_number % len(openings)]
+        for first, second in pairs:
+            for white, black in ((first, second), (second, first)):
+                if number >= games:
+                    return
+                number += 1
+                yield number, white, black, fen, max_plies
+        round_number += 1
+
+
+def run_tournament(engines, openings, games, workers=None, max_plies=MAX_PLIES, sprt=None, report=None):
+    """
+    Играет турнир в пуле процессов. В работе держится не больше двух партий на процесс,
+    поэтому остановка по SPRT не ждёт уже запланированных партий.
+    :param engines: Описания движков (parse_engine).
+    :param openings: Позиции FEN.
+    :param games: Наибольшее число партий.
+    :param workers: Число процессов (по умолчанию — число ядер).
+    :param max_plies: Предел полуходов в партии.
+    :param sprt: (elo0, elo1, alpha, beta) для остановки по SPRT (только для двух движков) или None.
+    :param report: Функция report(game, stats), вызываемая после каждой партии, или None.
+    :return: Генератор словарей сыгранных партий (в порядке завершения).
+    """
+    tasks = make_tasks(engines, openings, games, max_plies)
+    stats = MatchStats(engines[0]["name"], engines[1]["name"])
+    workers = workers or os.cpu_count() or 1
+    in_flight = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        stopped = False
+        while True:
+            while not stopped and len(pending) < in_flight:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                pending.add(executor.submit(play_game, task))
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                game = future.result()
+                stats.add(game)
+                if report:
+                    report(game, stats)
+                yield game
+            if sprt and not stopped and stats.sprt(*sprt)[3]:
+                # Результат ясен: новые партии не запускаем, уже начатые доигрываем
+                stopped = True
@@ -0,0 +1,152 @@
+"""
+Таблица транспозиций фиксированного размера.
+
+Записи хранятся в одном массиве array('Q') по два 64-битных слова на запись: ключ Зобриста
+и упакованные данные (оценка, глубина, тип границы, возраст, лучший ход). Записи сгруппированы
+в корзины по две: первая заменяется только более глубоким или устаревшим результатом,
+вторая — всегда.
+
+Вместо ключа хранится ключ XOR данные: если несколько процессов пишут в общую таблицу
+одновременно, «разорванная» запись просто не совпадёт по ключу.
+"""
+from array import array
+
+from classes.bitboard import SQUARES
+
+# Тип оценки в записи
+EXACT, LOWER_BOUND, UPPER_BOUND = range(3)
+
+ENTRY_SIZE = 16  # Байт на запись: ключ + данные
+BUCKET_SIZE = 2  # Записей в корзине
+
+PROMOTIONS = (None, "q", "r", "b", "n")
+PROMOTION_CODES = {promotion: code for code, promotion in enumerate(PROMOTIONS)}
+
+SCORE_OFFSET = 1 << 31
+AGE_LIMIT = 64
+
+
+def encode_move(move):
+    """
+    Упаковывает ход в 16 бит: клетка начала, клетка конца, фигура превращения.
+    :param move: Кортеж ((start_row, start_col), (end_row, end_col), promotion) или None.
+    """
+    if move is None:
+        return 0
+    (start_row, start_col), (end_row, end_col), promotion = move
+    return ((start_row * 8 + start_col) | (end_row * 8 + end_col) << 6 | PROMOTION_CODES[promotion] << 12) + 1
+
+
+def decode_move(code):
+    """
+    Распаковывает ход, закодированный encode_move.
+    """
+    if code == 0:
+        return None
+    code -= 1
+    return SQUARES[code & 63], SQUARES[code >> 6 & 63], PROMOTIONS[code >> 12]
+
+
+def table_size(size_mb):
+    """
+    Возвращает размер таблицы в байтах (кратный размеру корзины).
+    :param size_mb: Размер таблицы в мегабайтах.
+    """
+    return max(1, size_mb * 1024 * 1024 // (ENTRY_SIZE * BUCKET_SIZE)) * ENTRY_SIZE * BUCKET_SIZE
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=16, buffer=None):
+        """
+        Таблица транспозиций с ограничением по памяти.
+        :param size_mb: Размер таблицы в мегабайтах.
+        :param buffer: Готовый буфер размером table_size(size_mb), например общая память нескольких процессов.
+                       По умолчанию таблица выделяет собственный массив.
+        """
+        size = table_size(size_mb)
+        self.bucket_count = size // (ENTRY_SIZE * BUCKET_SIZE)
+        if buffer is None:
+            self.table = array("Q", bytes(size))
+        else:
+            self.table = memoryview(buffer).cast("B")[:size].cast("Q")
+        self.age = 0
+
+        # Счётчики для отчётов
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def new_search(self):
+        """
+        Начинает новый поиск: записи прошлых ходов становятся устаревшими и заменяются в первую очередь.
+        """
+        self.age = (self.age + 1) % AGE_LIMIT
+
+    def clear(self):
+        """
+        Очищает таблицу и счётчики.
+        """
+        self.table[:] = array("Q", bytes(len(self.table) * 8))
+        self.age = 0
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def probe(self, key):
+        """
+        Ищет запись по ключу позиции.
+        :param key: Ключ Зобриста.
+        :return: Кортеж (глубина, оценка, тип границы, лучший ход) или None.
+        """
+        table = self.table
+        index = (key % self.bucket_count) * BUCKET_SIZE * 2
+        for slot in (index, index + 2):
+            data = table[slot + 1]
+            if data and table[slot] ^ data == key:
+                self.hits += 1
+                return ((data >> 32 & 0xFF) - 1, (data & 0xFFFFFFFF) - SCORE_OFFSET,
+                        data >> 40 & 3, decode_move(data >> 48))
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """
+        Сохраняет результат поиска.
+        :param key: Ключ Зобриста.
+        :param depth: Глубина поиска.
+        :param score: Оценка.
+        :param bound: Тип оценки (EXACT, LOWER_BOUND, UPPER_BOUND).
+        :param move: Лучший ход или None.
+        """
+        table = self.table
+        index = (key % self.bucket_count) * BUCKET_SIZE * 2
+        data = ((score + SCORE_OFFSET) | (min(depth, 254) + 1) << 32 | bound << 40 | self.age << 42
+                | encode_move(move) << 48)
+
+        # Первая запись корзины: та же позиция, пустая, устаревшая или менее глубокая
+        old_data = table[index + 1]
+        if (table[index] ^ old_data == key or not old_data or (old_data >> 42 & 63) != self.age
+                or (old_data >> 32 & 0xFF) - 1 <= depth):
+            slot = index
+        else:
+            slot = index + 2  # Вторая запись заменяется всегда
+
+        if table[slot + 1] and table[slot] ^ table[slot + 1] != key:
+            self.overwrites += 1
+        table[slot] = key ^ data
+        table[slot + 1] = data
+        self.stores += 1
+
+    def get_stats(self):
+        """
+        Возвращает счётчики обращений к таблице.
+        :return: Словарь с попаданиями, промахами, записями, перезаписями и заполненностью (доля записей).
+        """
+        sample = min(len(self.table) // 2, 2000)
+        used = sum(1 for entry in range(sample) if self.table[entry * 2 + 1])
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+            "fill": used / sample,
+        }
@@ -0,0 +1,61 @@
+"""
+Ключи Зобриста для позиций.
+
+Ключ позиции — XOR случайных 64-битных чисел для каждой фигуры на клетке, очереди хода чёрных,
+прав на рокировку и вертикали взятия на проходе. Вертикаль учитывается, только если взять на проходе
+есть чем: иначе одинаковые позиции после двойного хода пешки и без него получали бы разные ключи
+и повторения не находились бы. Position обновляет ключ при каждом изменении доски.
+"""
+import random
+
+from classes.bitboard import COLOR_INDEX, can_capture_en_passant
+
+_random = random.Random(0x5EED)  # Фиксированное зерно: ключи одинаковы во всех процессах и запусках
+
+
+def _key():
+    return _random.getrandbits(64)
+
+
+# PIECE_KEYS[цвет * 6 + тип фигуры][клетка] — индексы как у Position.bitboards
+PIECE_KEYS = [[_key() for _ in range(64)] for _ in range(12)]
+SIDE_KEY = _key()  # Ход чёрных
+EN_PASSANT_KEYS = [_key() for _ in range(8)]  # По вертикали клетки взятия на проходе
+
+_CASTLING_LETTER_KEYS = {letter: _key() for letter in "KQkq"}
+
+
+def castling_key(rights):
+    """
+    Возвращает ключ прав на рокировку.
+    :param rights: Права в виде строки FEN ("KQkq", "Kq", "").
+    """
+    key = 0
+    for letter in rights:
+        key ^= _CASTLING_LETTER_KEYS[letter]
+    return key
+
+
+# Клетки королей и ладей: только ходы с них или на них меняют права на рокировку
+CASTLING_SQUARES = {(7, 4), (7, 0), (7, 7), (0, 4), (0, 0), (0, 7)}
+
+
+def compute_key(position):
+    """
+    Считает ключ позиции с нуля (при расстановке и для проверки инкрементального ключа).
+    :param position: Позиция (Position).
+    :return: 64-битный ключ.
+    """
+    key = 0
+    for index, bitboard in enumerate(position.bitboards):
+        while bitboard:
+            low = bitboard & -bitboard
+            key ^= PIECE_KEYS[index][low.bit_length() - 1]
+            bitboard ^= low
+    if position.current_player == "black":
+        key ^= SIDE_KEY
+    key ^= castling_key(position.get_castling_rights())
+    target = position.en_passant_target
+    if target and can_capture_en_passant(position.bitboards, target, COLOR_INDEX[position.current_player]):
+        key ^= EN_PASSANT_KEYS[target[1]]
+    return key
@@ -0,0 +1,29 @@
+import argparse
+import os
+import time
+
+from classes.tablebase import DEFAULT_DIRECTORY, ENDGAMES, generate_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация таблиц эндшпиля ретроградным анализом.")
+    parser.add_argument("endgames", nargs="*", default=list(ENDGAMES), choices=list(ENDGAMES),
+                        help="Окончания (по умолчанию все).")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY,
+                        help=f"Папка для таблиц (по умолчанию {DEFAULT_DIRECTORY}).")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов (по умолчанию — число ядер).")
+    args = parser.parse_args()
+
+    def report(summary):
+        size = os.path.getsize(os.path.join(args.directory, f"{summary['name']}.bin"))
+        print(f"{summary['name']}: выигрышей при ходе сильной стороны: {summary['wins']}, "
+              f"самый долгий мат: {summary['max_plies']} полуходов, {size / 1024:.0f} КБ, {summary['time']:.1f} с",
+              flush=True)
+
+    start_time = time.perf_counter()
+    generate_all(args.endgames, args.directory, args.workers, report)
+    print(f"Готово за {time.perf_counter() - start_time:.1f} с, таблицы в {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import sys
+
+from classes.pgn_reader import PgnReader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Потоковое чтение и проверка партий из файла PGN.")
+    parser.add_argument("path", help="Файл PGN.")
+    parser.add_argument("--generator", choices=["pieces", "bitboard"], default="bitboard", help="Генератор ходов.")
+    parser.add_argument("--limit", type=int, default=None, help="Прочитать не больше указанного числа партий.")
+    parser.add_argument("--progress", type=int, default=1000,
+                        help="Печатать прогресс каждые N партий (0 — не печатать).")
+    parser.add_argument("--errors", type=int, default=10, help="Сколько сообщений об ошибках показать в конце.")
+    args = parser.parse_args()
+
+    reader = PgnReader(args.path, move_generator=args.generator)
+    moves = 0
+    for game in reader:
+        moves += len(game.moves)
+        if args.progress and reader.games_read % args.progress == 0:
+            print(f"Партий: {reader.games_read}, ошибок: {reader.errors}, {reader.games_per_second():.0f} партий/с",
+                  file=sys.stderr)
+        if args.limit and reader.games_read >= args.limit:
+            break
+
+    print(f"Прочитано партий: {reader.games_read}, полуходов: {moves}, пропущено с ошибками: {reader.errors}")
+    print(f"Время: {reader.elapsed:.2f} с, {reader.games_per_second():.1f} партий/с")
+    for number, message in reader.error_messages[:args.errors]:
+        print(f"  Партия {number}: {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import argparse
+import sys
+import time
+
+from classes.perft import divide, perft, run_suite
+from classes.position import START_FEN, Position
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Подсчёт perft для проверки генерации ходов.")
+    parser.add_argument("depth", type=int, nargs="?", default=3, help="Глубина в полуходах.")
+    parser.add_argument("--fen", default=START_FEN, help="Позиция в формате FEN (по умолчанию начальная).")
+    parser.add_argument("--divide", action="store_true", help="Показать число листьев для каждого хода из корня.")
+    parser.add_argument("--suite", action="store_true",
+                        help="Прогнать эталонные позиции (depth — максимальная глубина).")
+    parser.add_argument("--generator", choices=["pieces", "bitboard"], default="bitboard", help="Генератор ходов.")
+    args = parser.parse_args()
+    if args.depth < 1:
+        parser.error("Глубина должна быть не меньше 1")
+
+    if args.suite:
+        failures = run_suite(max_depth=args.depth, move_generator=args.generator)
+        sys.exit(1 if failures else 0)
+
+    position = Position.from_fen(args.fen, move_generator=args.generator)
+    start_time = time.perf_counter()
+    if args.divide:
+        nodes = 0
+        for move, count in divide(position, args.depth):
+            print(f"{move}: {count}")
+            nodes += count
+    else:
+        nodes = perft(position, args.depth)
+    elapsed = time.perf_counter() - start_time
+    print(f"Узлов: {nodes}, время: {elapsed:.2f} с, {nodes / max(elapsed, 1e-9):.0f} узлов/с")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import sys
+import time
+
+from classes.batch_replay import SHARD_SIZE, replay_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная проверка партий (журналы data/*.txt и файлы PGN).")
+    parser.add_argument("paths", nargs="*", default=["data"], help="Файлы и папки с партиями (по умолчанию data).")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов (по умолчанию — число ядер).")
+    parser.add_argument("--output", default="-", help="Файл для сводок в формате JSON Lines (по умолчанию stdout).")
+    parser.add_argument("--shard-mb", type=float, default=SHARD_SIZE / (1024 * 1024),
+                        help="Размер куска PGN-файла на одно задание, МБ.")
+    args = parser.parse_args()
+
+    def report(games, elapsed):
+        print(f"\rПартий: {games}, {games / max(elapsed, 1e-9):.0f} партий/с", end="", file=sys.stderr, flush=True)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start_time = time.perf_counter()
+    games = illegal = errors = 0
+    statuses = {}
+    try:
+        for summary in replay_files(args.paths, args.workers, int(args.shard_mb * 1024 * 1024), report):
+            output.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            games += 1
+            illegal += "illegal_ply" in summary
+            errors += "error" in summary
+            if "status" in summary:
+                statuses[summary["status"]] = statuses.get(summary["status"], 0) + 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(file=sys.stderr)
+    print(f"Партий: {games}, с недопустимыми ходами: {illegal}, с ошибками записи: {errors}, "
+          f"время: {elapsed:.2f} с, {games / max(elapsed, 1e-9):.0f} партий/с", file=sys.stderr)
+    print("Итоговые состояния: " + ", ".join(f"{state}: {count}" for state, count in sorted(statuses.items())),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
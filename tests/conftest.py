@@ -0,0 +1,37 @@
+"""
+Общие помощники тестов.
+"""
+import random
+
+import pytest
+
+
+def play_random_game(position, seed, plies, visit=None):
+    """
+    Играет в позиции случайные допустимые ходы (одинаковые при одинаковом seed).
+    :param position: Позиция (Position), в которой делаются ходы.
+    :param seed: Начальное значение генератора случайных чисел.
+    :param plies: Наибольшее число полуходов.
+    :param visit: Функция visit(position), вызываемая перед каждым ходом и в конце партии, или None.
+    :return: Список записей для отмены сыгранных ходов.
+    """
+    rng = random.Random(seed)
+    undos = []
+    for _ in range(plies):
+        if visit:
+            visit(position)
+        moves = position.get_all_valid_moves()
+        if not moves:
+            return undos
+        undos.append(position.make_move(*rng.choice(moves)))
+    if visit:
+        visit(position)
+    return undos
+
+
+@pytest.fixture(scope="session")
+def random_game():
+    """
+    Функция play_random_game для тестов и фикстур любой области видимости.
+    """
+    return play_random_game
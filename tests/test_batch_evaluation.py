@@ -0,0 +1,70 @@
+"""
+Пакетная оценка на NumPy совпадает с evaluate() для каждой позиции.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from classes import batch_evaluation
+from classes.batch_evaluation import evaluate_batch, pack_positions, planes_from_boards, score_components
+from classes.evaluation import evaluate
+from classes.perft import PERFT_SUITE
+from classes.position import Position
+
+
+@pytest.fixture(scope="module")
+def positions(random_game):
+    """
+    Позиции из эталонного набора perft и случайных партий (при ходе обеих сторон).
+    """
+    result = [Position.from_fen(fen, move_generator="bitboard") for _, fen, _ in PERFT_SUITE]
+
+    def collect(position):
+        result.append(Position.from_fen(position.to_fen(), move_generator="bitboard"))
+
+    for seed in range(10):
+        random_game(Position(move_generator="bitboard"), seed, 60, collect)
+    return result
+
+
+def test_evaluate_batch_matches_evaluate(positions):
+    planes, turns = pack_positions(positions)
+    assert planes.shape == (len(positions), 12) and planes.dtype == np.uint64
+    assert evaluate_batch(planes, turns).tolist() == [evaluate(position) for position in positions]
+
+
+def test_chunks(positions, monkeypatch):
+    planes, turns = pack_positions(positions)
+    expected = evaluate_batch(planes, turns)
+    monkeypatch.setattr(batch_evaluation, "CHUNK_SIZE", 7)
+    assert evaluate_batch(planes, turns).tolist() == expected.tolist()
+
+
+def test_planes_from_boards(positions):
+    boards = np.full((len(positions), 64), -1, dtype=np.int8)
+    for row, position in enumerate(positions):
+        for index, bitboard in enumerate(position.bitboards):
+            for square in range(64):
+                if bitboard >> square & 1:
+                    boards[row, square] = index
+    planes, _ = pack_positions(positions)
+    assert np.array_equal(planes_from_boards(boards), planes)
+
+
+def test_mobility():
+    planes, turns = pack_positions([Position(move_generator="bitboard")])
+    material, squares, mobility = score_components(planes)
+    # Начальная позиция симметрична
+    assert material.tolist() == [0] and squares.tolist() == [0] and mobility.tolist() == [0]
+
+    # Один белый ферзь на d4: 27 клеток на пустой доске
+    queen = Position.from_fen("k7/8/8/8/3Q4/8/8/7K w - - 0 1", move_generator="bitboard")
+    planes, turns = pack_positions([queen])
+    without = evaluate_batch(planes, turns)
+    with_mobility = evaluate_batch(planes, turns, mobility=True)
+    assert (with_mobility - without).tolist() == [27 * batch_evaluation.MOBILITY_WEIGHTS[4]]
+
+
+def test_empty_batch():
+    planes, turns = pack_positions([])
+    assert evaluate_batch(planes, turns, mobility=True).tolist() == []
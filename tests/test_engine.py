@@ -0,0 +1,49 @@
+"""
+Поиск: выигрывающая сторона не соглашается на ничью повторением или по правилу 50 ходов.
+"""
+from classes.engine import SearchEngine
+from classes.notation import move_to_uci, uci_to_move
+from classes.position import Position
+
+
+def play(fen, moves):
+    position = Position.from_fen(fen, move_generator="bitboard")
+    for uci in moves.split():
+        position.make_move(*uci_to_move(uci))
+    return position
+
+
+def search(position, depth=4):
+    engine = SearchEngine(position, max_depth=depth, time_limit=None)
+    return engine.get_best_move(), engine.last_info["score"]
+
+
+def test_winning_side_avoids_repetition():
+    fen = "4k3/8/8/8/8/8/8/3QK3 w - - 0 1"
+    move, score = search(play(fen, ""))
+    assert move_to_uci(move) == "d1f3" and score > 0
+
+    # Позиция после 1. Qf3 уже была: повторять её незачем, лишний ферзь по-прежнему выигрывает
+    position = play(fen, "d1f3 e8d8 f3d1 d8e8")
+    move, score = search(position)
+    assert move_to_uci(move) != "d1f3"
+    assert score > 0
+    position.make_move(*move)
+    assert position.zobrist_key not in position.history
+
+
+def test_repetition_is_draw():
+    fen = "4k3/8/8/8/8/8/8/3QK3 b - - 0 1"
+    assert not SearchEngine.is_draw(play(fen, "e8d8 e1f1 d8e8"))
+    assert SearchEngine.is_draw(play(fen, "e8d8 e1f1 d8e8 f1e1"))
+
+
+def test_fifty_move_rule():
+    # До ничьей по правилу 50 ходов один полуход: выигрыш сохраняет только ход пешкой
+    position = play("4k3/8/8/8/8/8/4P3/3QK3 w - - 99 80", "")
+    move, score = search(position, 2)
+    assert move_to_uci(move) in ("e2e3", "e2e4")
+    assert score > 0
+
+    position.make_move(*uci_to_move("d1d2"))
+    assert SearchEngine.is_draw(position)
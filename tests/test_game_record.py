@@ -0,0 +1,117 @@
+"""
+Запись партий: дописывание ходов по ходу игры, полная перезапись в конце и ошибки записи.
+"""
+import logging
+
+import pytest
+
+from classes import game_record
+from classes.game_record import DURABILITY_END, SEVEN_TAG_ROSTER, GameRecord, RecordWriter, format_pgn
+from classes.pgn_reader import iter_game_texts, parse_game
+
+MOVES = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7", "Re1", "b5", "Bb3", "d6", "c3", "O-O"]
+
+
+@pytest.fixture
+def writer():
+    return RecordWriter()
+
+
+def read_game(path):
+    """
+    Читает единственную партию файла через pgn_reader.
+    """
+    games = list(iter_game_texts(str(path)))
+    assert len(games) == 1
+    return parse_game(*games[0])
+
+
+def test_moves_are_appended_during_the_game(tmp_path, writer):
+    path = tmp_path / "game.pgn"
+    record = GameRecord(str(path), {"White": "Белые", "Black": "Чёрные"}, writer=writer)
+    for ply, san in enumerate(MOVES, 1):
+        record.add_move(san)
+        writer.flush()
+        # После каждого хода файл — партия с результатом "*" и всеми сыгранными ходами
+        game = read_game(path)
+        assert len(game.moves) == ply
+        assert game.result == "*"
+    assert list(game.headers)[:7] == list(SEVEN_TAG_ROSTER)
+    assert game.headers["White"] == "Белые"
+
+
+def test_finish_rewrites_the_file(tmp_path, writer, monkeypatch):
+    synced = []
+    fsync = game_record.os.fsync
+    monkeypatch.setattr(game_record.os, "fsync", lambda descriptor: synced.append(descriptor) or fsync(descriptor))
+
+    path = tmp_path / "game.pgn"
+    record = GameRecord(str(path), {"White": "Белые", "Black": "Чёрные"}, writer=writer)
+    for san in MOVES:
+        record.add_move(san)
+    writer.flush()
+    assert not synced  # Дописывания по ходу партии не ждут диска
+
+    record.finish("1/2-1/2", comment="Ничья: троекратное повторение.")
+    record.finish("1-0")  # Повторный вызов ничего не меняет
+    writer.flush()
+    assert len(synced) == 1
+    assert not (tmp_path / "game.pgn.tmp").exists()
+
+    text = path.read_text(encoding="utf-8")
+    assert text == format_pgn(record.headers, MOVES, "1/2-1/2", "Ничья: троекратное повторение.")
+    game = read_game(path)
+    assert len(game.moves) == len(MOVES)
+    assert game.result == "1/2-1/2"
+    assert game.headers["Termination"] == "normal"
+
+
+@pytest.mark.parametrize("durability, files", [(DURABILITY_END, [0, 0, 0, 0, 0]), (2, [0, 2, 2, 4, 4])])
+def test_durability(tmp_path, writer, durability, files):
+    path = tmp_path / "game.pgn"
+    record = GameRecord(str(path), {}, durability=durability, writer=writer)
+    for san, saved in zip(MOVES, files):
+        record.add_move(san)
+        writer.flush()
+        assert (len(read_game(path).moves) if path.exists() else 0) == saved
+
+    record.close()
+    writer.flush()
+    game = read_game(path)
+    assert len(game.moves) == len(files)
+    assert game.result == "*"
+    assert game.headers["Termination"] == "unterminated"
+
+
+def test_game_from_fen(tmp_path, writer):
+    fen = "4k3/8/8/8/8/8/4P3/4K3 b - - 0 12"
+    path = tmp_path / "game.pgn"
+    record = GameRecord(str(path), {"SetUp": "1", "FEN": fen}, writer=writer)
+    for san in ["Kd7", "e4", "Ke6"]:
+        record.add_move(san)
+    writer.flush()
+    assert "12... Kd7 13. e4 Ke6" in path.read_text(encoding="utf-8")
+    record.finish("*")
+    writer.flush()
+    assert read_game(path).position.to_fen() == "8/8/4k3/8/4P3/8/8/4K3 w - - 1 14"
+
+
+def test_write_errors_are_logged(tmp_path, writer, caplog):
+    missing = tmp_path / "missing" / "game.pgn"
+    record = GameRecord(str(missing), {}, writer=writer)
+    with caplog.at_level(logging.ERROR, logger=game_record.__name__):
+        record.add_move("e4")
+        writer.flush()
+        record.finish("*")
+        writer.flush()
+    assert str(missing) in writer.errors
+    assert any(str(missing) in message for message in caplog.messages)
+
+    # Поток записи продолжает работать
+    path = tmp_path / "game.pgn"
+    other = GameRecord(str(path), {}, writer=writer)
+    other.add_move("d4")
+    other.finish("*")
+    writer.flush()
+    assert read_game(path).moves == [((6, 3), (4, 3), None)]
+    assert str(path) not in writer.errors
@@ -0,0 +1,137 @@
+"""
+Состояние партии: мат, пат, ничьи по правилам и кэширование GameStatus.
+"""
+import pytest
+
+from classes.game_status import (CHECK, CHECKMATE, DRAW, FIFTY_MOVES, IN_PROGRESS, INSUFFICIENT_MATERIAL, REPETITION,
+                                 STALEMATE)
+from classes.notation import san_to_move
+from classes.position import Position
+
+
+def play(sans, fen=None, move_generator="bitboard"):
+    position = Position.from_fen(fen, move_generator=move_generator) if fen else Position(move_generator=move_generator)
+    for san in sans.split():
+        position.make_move(*san_to_move(position, san))
+    return position
+
+
+@pytest.mark.parametrize("move_generator", ["bitboard", "pieces"])
+def test_checkmate(move_generator):
+    status = play("f3 e5 g4 Qh4#", move_generator=move_generator).get_status()
+    assert status.state == CHECKMATE
+    assert status.player == "white" and status.winner == "black"
+    assert status.is_over and status.in_check
+    assert status.get_result() == "0-1"
+    assert status.get_message() == "Мат! Черные победили."
+
+
+def test_check():
+    status = play("e4 f5 Qh5+").get_status()
+    assert status.state == CHECK
+    assert status.in_check and not status.is_over
+    assert status.get_result() == "*" and status.get_message() is None
+
+
+@pytest.mark.parametrize("move_generator", ["bitboard", "pieces"])
+def test_stalemate(move_generator):
+    status = play("Qb6", "k7/8/2Q5/8/8/8/8/K7 w - - 0 1", move_generator).get_status()
+    assert status.state == STALEMATE and status.player == "black"
+    assert status.is_over and not status.in_check
+    assert status.get_result() == "1/2-1/2"
+
+
+def test_checkmate_is_not_fifty_move_draw():
+    # Мат последним ходом перед правилом 50 ходов остаётся матом
+    status = play("Qb7#", "k7/7Q/1K6/8/8/8/8/8 w - - 99 80").get_status()
+    assert status.state == CHECKMATE and status.winner == "white"
+
+
+def test_fifty_move_rule():
+    position = play("", "4k3/8/8/8/8/8/4P3/R3K3 w - - 98 80")
+    assert position.get_status().state == IN_PROGRESS
+    position.make_move(*san_to_move(position, "Ra2"))
+    assert position.get_status().state == IN_PROGRESS
+    position.make_move(*san_to_move(position, "Kd8"))
+    status = position.get_status()
+    assert status.state == DRAW and status.reason == FIFTY_MOVES
+    assert status.get_message() == "Ничья: правило 50 ходов."
+
+    # Ход пешкой обнуляет счётчик
+    position = play("e3 Kd8", "4k3/8/8/8/8/8/4P3/R3K3 w - - 98 80")
+    assert position.halfmove_clock == 1
+    assert position.get_status().state == IN_PROGRESS
+
+
+def test_threefold_repetition():
+    position = play("Nf3 Nf6 Ng1 Ng8 Nf3 Nf6 Ng1")
+    assert position.get_status().state == IN_PROGRESS
+    position.make_move(*san_to_move(position, "Ng8"))
+    status = position.get_status()
+    assert status.state == DRAW and status.reason == REPETITION
+    assert status.get_result() == "1/2-1/2"
+
+
+def test_repetition_after_capture():
+    # Позиция сразу после взятия (счётчик полуходов 0) входит в число повторений
+    position = play("e4 d5 exd5 Qxd5 Nc3 Qd8 Nb1 Qd5 Nc3 Qd8 Nb1")
+    assert position.get_status().state == IN_PROGRESS
+    position.make_move(*san_to_move(position, "Qd5"))
+    assert position.get_status().reason == REPETITION
+
+
+@pytest.mark.parametrize("fen, drawn", [
+    ("4k3/8/8/8/8/8/8/4K3 w - - 0 1", True),
+    ("4k3/8/8/8/8/8/8/4KN2 w - - 0 1", True),
+    ("4k3/8/8/8/8/8/8/2B1K3 w - - 0 1", True),
+    ("2b1k3/8/8/8/8/8/8/4KB2 w - - 0 1", True),  # Слоны на полях одного цвета
+    ("3bk3/8/8/8/8/8/8/4KB2 w - - 0 1", False),  # Слоны на полях разного цвета
+    ("4k3/8/8/8/8/8/8/3NKN2 w - - 0 1", False),
+    ("4kn2/8/8/8/8/8/8/4KB2 w - - 0 1", False),
+    ("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1", False),
+    ("4k3/8/8/8/8/8/8/R3K3 w - - 0 1", False),
+])
+def test_insufficient_material(fen, drawn):
+    status = Position.from_fen(fen, move_generator="bitboard").get_status()
+    assert (status.state == DRAW and status.reason == INSUFFICIENT_MATERIAL) == drawn
+
+
+def test_draw_after_capture():
+    position = play("Kxb2", "8/8/8/8/8/2k5/1R6/7K b - - 0 1")
+    status = position.get_status()
+    assert status.state == DRAW and status.reason == INSUFFICIENT_MATERIAL
+    assert status.get_message() == "Ничья: недостаточно материала."
+
+
+def test_status_cache():
+    position = Position(move_generator="bitboard")
+    status = position.get_status()
+    assert position.get_status() is status  # Тот же полуход — тот же объект
+
+    undo = position.make_move(*san_to_move(position, "e4"))
+    after_move = position.get_status()
+    assert after_move is not status
+    assert after_move.player == "black"
+    assert position.get_status() is after_move
+
+    position.unmake_move(undo)
+    after_unmake = position.get_status()
+    assert after_unmake is not after_move
+    assert after_unmake.player == "white"
+
+
+def test_status_cache_key_includes_ply():
+    # После Nf3 Nf6 Ng1 Ng8 ключ позиции тот же, что в начале, но полуход другой — состояние пересчитывается
+    position = Position(move_generator="bitboard")
+    status = position.get_status()
+    key = position.zobrist_key
+    for san in "Nf3 Nf6 Ng1 Ng8".split():
+        position.make_move(*san_to_move(position, san))
+    assert position.zobrist_key == key
+    assert position.get_status() is not status
+    assert position.state_checker.status_key == (key, 4)
+
+    # На третьем повторении та же позиция становится ничьей
+    for san in "Nf3 Nf6 Ng1 Ng8".split():
+        position.make_move(*san_to_move(position, san))
+    assert position.get_status().reason == REPETITION
@@ -0,0 +1,53 @@
+"""
+Запись ходов в SAN и обратный разбор.
+"""
+import pytest
+
+from classes.notation import move_to_san, san_to_move
+from classes.perft import PERFT_SUITE
+from classes.position import Position
+
+
+def check_round_trip(position):
+    """
+    Проверяет, что каждый допустимый ход позиции записывается в SAN однозначно и разбирается обратно.
+    """
+    fen = position.to_fen()
+    moves = position.get_all_valid_moves()
+    sans = [move_to_san(position, move) for move in moves]
+    assert position.to_fen() == fen
+    assert len(set(sans)) == len(sans)
+    for move, san in zip(moves, sans):
+        assert san_to_move(position, san) == move, san
+
+
+@pytest.mark.parametrize("name, fen", [(name, fen) for name, fen, _ in PERFT_SUITE],
+                         ids=[name for name, _, _ in PERFT_SUITE])
+def test_suite_positions(name, fen):
+    check_round_trip(Position.from_fen(fen, move_generator="bitboard"))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_games(random_game, seed):
+    random_game(Position(move_generator="bitboard"), seed, 100, check_round_trip)
+
+
+@pytest.mark.parametrize("fen, move, san", [
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", ((7, 4), (7, 6), None), "O-O"),
+    ("r3k3/8/8/8/8/8/8/3K4 b q - 0 1", ((0, 4), (0, 2), None), "O-O-O+"),
+    ("4k3/8/8/8/8/8/4K3/R6R w - - 0 1", ((7, 0), (7, 3), None), "Rad1"),
+    ("4k3/8/8/R7/8/8/8/R3K3 w - - 0 1", ((7, 0), (6, 0), None), "R1a2"),
+    ("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1", ((3, 4), (2, 3), None), "exd6"),
+    ("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", ((1, 1), (0, 1), "n"), "b8=N"),
+    ("6k1/5ppp/8/8/8/8/8/R3K3 w - - 0 1", ((7, 0), (0, 0), None), "Ra8#"),
+])
+def test_known_moves(fen, move, san):
+    position = Position.from_fen(fen, move_generator="bitboard")
+    assert move_to_san(position, move) == san
+    assert san_to_move(position, san) == move
+
+
+@pytest.mark.parametrize("san", ["e5", "Nf4", "O-O", "Qxd7", "e9", "Zz1"])
+def test_invalid_moves(san):
+    with pytest.raises(ValueError):
+        san_to_move(Position(move_generator="bitboard"), san)
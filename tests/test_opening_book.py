@@ -0,0 +1,78 @@
+"""
+Ключи Polyglot, кодирование ходов и сборка книги дебютов.
+"""
+import pytest
+
+from classes.notation import uci_to_move
+from classes.opening_book import OpeningBook, build_book, decode_move, encode_move, polyglot_key
+from classes.position import Position
+
+# Эталонные ключи из описания формата Polyglot
+REFERENCE_KEYS = [
+    ("", 0x463B96181691FC9C),
+    ("e2e4", 0x823C9B50FD114196),
+    ("e2e4 d7d5", 0x0756B94461C50FB0),
+    ("e2e4 d7d5 e4e5", 0x662FAFB965DB29D4),
+    ("e2e4 d7d5 e4e5 f7f5", 0x22A48B5A8E47FF78),
+    ("e2e4 d7d5 e4e5 f7f5 e1e2", 0x652A607CA3F242C1),
+    ("e2e4 d7d5 e4e5 f7f5 e1e2 e8f7", 0x00FDD303C946BDD9),
+    ("a2a4 b7b5 h2h4 b5b4 c2c4", 0x3C8123EA7B067637),
+    ("a2a4 b7b5 h2h4 b5b4 c2c4 b4c3 a1a3", 0x5C3F9B829B279560),
+]
+
+GAMES = """[Result "1-0"]
+
+1. e4 e5 2. Nf3 Nc6 1-0
+
+[Result "1/2-1/2"]
+
+1. e4 c5 2. Nf3 d6 1/2-1/2
+
+[Result "0-1"]
+
+1. d4 d5 0-1
+"""
+
+
+@pytest.mark.parametrize("move_generator", ["bitboard", "pieces"])
+@pytest.mark.parametrize("moves, key", REFERENCE_KEYS, ids=[moves or "start" for moves, _ in REFERENCE_KEYS])
+def test_reference_keys(move_generator, moves, key):
+    position = Position(move_generator=move_generator)
+    for uci in moves.split():
+        position.make_move(*uci_to_move(uci))
+    assert polyglot_key(position) == key
+
+
+@pytest.mark.parametrize("fen, move, code", [
+    ("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1", ((6, 4), (4, 4), None), 0x031C),
+    ("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1", ((7, 4), (7, 6), None), 0x0107),
+    ("r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1", ((0, 4), (0, 2), None), 0x0F38),
+    ("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1", ((1, 1), (0, 1), "n"), 0x1C79),
+])
+def test_move_codes(fen, move, code):
+    position = Position.from_fen(fen, move_generator="bitboard")
+    assert encode_move(position, move) == code
+    assert decode_move(position, code) == move
+
+
+def test_build_and_read_book(tmp_path):
+    pgn = tmp_path / "games.pgn"
+    pgn.write_text(GAMES, encoding="utf-8")
+    output = tmp_path / "book.bin"
+    games, positions, entries = build_book([str(pgn)], str(output), min_games=1)
+    assert games == 3
+
+    book = OpeningBook(str(output))
+    try:
+        assert book.count == entries
+        position = Position(move_generator="bitboard")
+        # 1. e4: победа и ничья — 3 очка; ходы без очков (1. d4, 1... e5) в книгу не попадают
+        assert book.get_moves(position) == [(uci_to_move("e2e4"), 3)]
+        assert book.choose_move(position) == uci_to_move("e2e4")
+        position.make_move(*uci_to_move("e2e4"))
+        assert book.get_moves(position) == [(uci_to_move("c7c5"), 1)]
+        position.make_move(*uci_to_move("d7d5"))
+        assert book.get_moves(position) == []
+        assert book.choose_move(position) is None
+    finally:
+        book.close()
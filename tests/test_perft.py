@@ -0,0 +1,33 @@
+"""
+Число листьев perft для эталонных позиций — для обоих генераторов ходов.
+"""
+import pytest
+
+from classes.perft import PERFT_SUITE, divide, perft, run_suite
+from classes.position import Position
+
+# Наибольшая проверяемая глубина (глубина 4 есть не у всех позиций и слишком долго считается)
+MAX_DEPTH = 3
+
+
+@pytest.mark.parametrize("move_generator", ["bitboard", "pieces"])
+@pytest.mark.parametrize("name, fen, counts", PERFT_SUITE, ids=[name for name, _, _ in PERFT_SUITE])
+def test_perft_suite(move_generator, name, fen, counts):
+    position = Position.from_fen(fen, move_generator=move_generator)
+    for depth, expected in sorted(counts.items()):
+        if depth > MAX_DEPTH:
+            break
+        assert perft(position, depth) == expected, f"{name}, глубина {depth}"
+    # После обхода дерева позиция должна вернуться в исходное состояние
+    assert position.to_fen() == fen
+
+
+def test_depth_bounds():
+    position = Position.from_fen(PERFT_SUITE[0][1], move_generator="bitboard")
+    assert perft(position, 0) == 1
+    assert perft(position, -1) == 1
+    assert sum(count for _, count in divide(position, 2)) == 400
+    with pytest.raises(ValueError):
+        divide(position, 0)
+    with pytest.raises(ValueError):
+        run_suite(max_depth=0, report=lambda line: None)
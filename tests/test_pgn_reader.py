@@ -0,0 +1,106 @@
+"""
+Чтение PGN: разбор партий и подсчёт испорченных партий.
+"""
+import pytest
+
+from classes.pgn_reader import PgnError, PgnReader, parse_game, split_pgn
+
+GOOD_GAME = """[Event "Проверка"]
+[White "Белые"]
+[Black "Чёрные"]
+[Result "1-0"]
+
+1. e4 e5 2. Bc4 {комментарий} Nc6 (2... Nf6 3. d3) 3. Qh5 $1 Nf6?? 4. Qxf7# 1-0
+"""
+
+GOOD_FEN_GAME = """[Event "Окончание"]
+[FEN "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"]
+
+1. e4 Kd7 2. e5 ; комментарий до конца строки
+Ke6 *
+"""
+
+ILLEGAL_MOVE = """[Event "Недопустимый ход"]
+
+1. e4 e5 2. Nf3 Ke7 3. Bb5 Qe9 *
+"""
+
+BAD_HEADER = """[Event "Испорченный заголовок]
+
+1. d4 d5 *
+"""
+
+OPEN_VARIATION = """[Event "Незакрытый вариант"]
+
+1. d4 (1. e4 e5 2. Nf3 *
+"""
+
+BAD_FEN = """[Event "Неверный FEN"]
+[FEN "8/8/8 w - - 0 1"]
+
+1. e4 *
+"""
+
+
+def write_pgn(path, *games):
+    path.write_text("\n".join(games), encoding="utf-8")
+    return path
+
+
+def test_parse_game():
+    header_lines = ['[Event "Проверка"]', '[Result "0-1"]']
+    game = parse_game(header_lines, ["1. f3 e5 2. g4 Qh4#"])
+    assert game.headers == {"Event": "Проверка", "Result": "0-1"}
+    assert game.result == "0-1"
+    assert len(game.moves) == 4
+    assert game.position.is_checkmate("white")
+
+
+def test_illegal_move_reports_ply():
+    with pytest.raises(PgnError) as error:
+        parse_game([], ["1. e4 e5 2. Nf3 Nc6 3. Ke3"])
+    assert error.value.ply == 5
+    assert error.value.token == "Ke3"
+    assert error.value.reason
+    # Партия до недопустимого хода
+    assert len(error.value.game.moves) == 4
+    assert error.value.game.position.current_player == "white"
+
+
+def test_reader_counts_errors(tmp_path):
+    path = write_pgn(tmp_path / "games.pgn", GOOD_GAME, ILLEGAL_MOVE, BAD_HEADER, GOOD_FEN_GAME, OPEN_VARIATION,
+                     BAD_FEN, GOOD_GAME)
+    reader = PgnReader(str(path))
+    games = list(reader)
+    assert reader.games_read == 3
+    assert reader.errors == 4
+    assert [index for index, _ in reader.error_messages] == [2, 3, 5, 6]
+    assert [game.headers["Event"] for game in games] == ["Проверка", "Окончание", "Проверка"]
+    assert games[0].result == "1-0"
+    assert len(games[0].moves) == 7
+    assert games[1].result == "*"
+    assert games[1].position.to_fen() == "8/8/4k3/4P3/8/8/8/4K3 w - - 1 3"
+
+
+def test_reader_limits_error_messages(tmp_path):
+    path = write_pgn(tmp_path / "games.pgn", *[ILLEGAL_MOVE] * 5, GOOD_GAME)
+    reader = PgnReader(str(path), max_errors=2)
+    assert len(list(reader)) == 1
+    assert reader.errors == 5
+    assert len(reader.error_messages) == 2
+
+
+def test_split_pgn(tmp_path):
+    path = write_pgn(tmp_path / "games.pgn", *[GOOD_GAME, GOOD_FEN_GAME] * 10)
+    shards = split_pgn(str(path), 300)
+    assert len(shards) > 1
+    assert shards[0][0] == 0 and shards[-1][1] == path.stat().st_size
+    assert all(end == start for (_, end), (start, _) in zip(shards, shards[1:]))
+
+
+def test_empty_file(tmp_path):
+    path = write_pgn(tmp_path / "empty.pgn")
+    reader = PgnReader(str(path))
+    assert list(reader) == []
+    assert reader.errors == 0
+    assert split_pgn(str(path), 100) == []
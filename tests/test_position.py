@@ -0,0 +1,91 @@
+"""
+Ход и его отмена: make_move/unmake_move возвращают позицию в точности к прежней записи FEN.
+"""
+import pytest
+
+from classes.perft import PERFT_SUITE
+from classes.position import START_FEN, Position
+
+
+def check_unmake(position):
+    """
+    Делает и отменяет каждый допустимый ход: позиция должна остаться прежней.
+    """
+    fen = position.to_fen()
+    for move in position.get_all_valid_moves():
+        position.unmake_move(position.make_move(*move))
+        assert position.to_fen() == fen, move
+
+
+@pytest.mark.parametrize("move_generator", ["bitboard", "pieces"])
+@pytest.mark.parametrize("seed", range(5))
+def test_make_unmake_restores_fen(random_game, move_generator, seed):
+    position = Position(move_generator=move_generator)
+    undos = random_game(position, seed, 80, check_unmake)
+
+    # Отменяем всю партию целиком
+    for undo in reversed(undos):
+        position.unmake_move(undo)
+    assert position.to_fen() == START_FEN
+    assert position.history == []
+
+
+@pytest.mark.parametrize("name, fen", [(name, fen) for name, fen, _ in PERFT_SUITE],
+                         ids=[name for name, _, _ in PERFT_SUITE])
+def test_make_unmake_suite_positions(random_game, name, fen):
+    position = Position.from_fen(fen, move_generator="bitboard")
+    undos = random_game(position, name, 10, check_unmake)
+    for undo in reversed(undos):
+        position.unmake_move(undo)
+    assert position.to_fen() == fen
+
+
+@pytest.mark.parametrize("fen", [fen for _, fen, _ in PERFT_SUITE] + [
+    "4k3/8/8/8/8/8/8/4K3 b - - 17 42",
+    "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1",
+])
+def test_fen_round_trip(fen):
+    for move_generator in ("bitboard", "pieces"):
+        assert Position.from_fen(fen, move_generator=move_generator).to_fen() == fen
+
+
+def test_short_fen_defaults():
+    position = Position.from_fen("4k3/8/8/8/8/8/8/4K3 w")
+    assert position.to_fen() == "4k3/8/8/8/8/8/8/4K3 w - - 0 1"
+
+
+@pytest.mark.parametrize("fen", [
+    "",
+    "4k3/8/8/8/8/8/8/4K3",  # Нет очереди хода
+    "4k3/8/8/8/8/8/8/4K3 w - - 0 1 extra",
+    "4k3/8/8/8/8/8/4K3 w - - 0 1",  # 7 горизонталей
+    "4k3/8/8/8/8/8/8/8/4K3 w - - 0 1",  # 9 горизонталей
+    "4k3/8/8/8/8/8/8/4K4 w - - 0 1",  # 9 клеток на горизонтали
+    "4k3/8/8/8/8/8/8/4K2 w - - 0 1",  # 7 клеток на горизонтали
+    "4k3/8/8/8/8/8/8/4K2RR w - - 0 1",
+    "4k3/8/8/9/8/8/8/4K3 w - - 0 1",
+    "4k3/8/8/8/8/8/8/4K2X w - - 0 1",  # Неизвестная фигура
+    "4k3/8/8/8/8/8/8/4K3 x - - 0 1",  # Неверная очередь хода
+    "4k3/8/8/8/8/8/8/4K3 white - - 0 1",
+    "4k3/8/8/8/8/8/8/4K3 w KX - 0 1",  # Неверные права на рокировку
+    "4k3/8/8/8/8/8/8/4K3 w - e4 0 1",  # Неверная клетка взятия на проходе
+    "4k3/8/8/8/8/8/8/4K3 w - z3 0 1",
+    "8/8/8/8/8/8/8/4K3 w - - 0 1",  # Нет чёрного короля
+    "4k3/8/8/8/8/8/8/8 w - - 0 1",  # Нет белого короля
+    "4k3/8/8/8/8/8/8/3KK3 w - - 0 1",  # Два белых короля
+    "4k3/8/8/8/8/8/8/4K3 w - - x 1",  # Нечисловые счётчики
+    "4k3/8/8/8/8/8/8/4K3 w - - 0 one",
+    "4k3/8/8/8/8/8/8/4K3 w - - -1 1",
+    "4k3/8/8/8/8/8/8/4K3 w - - ² 1",
+])
+def test_malformed_fen(fen):
+    with pytest.raises(ValueError, match="Некорректная запись FEN"):
+        Position.from_fen(fen)
+
+
+def test_malformed_fen_keeps_position():
+    position = Position(move_generator="bitboard")
+    fen = position.to_fen()
+    with pytest.raises(ValueError):
+        position.load_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 x")
+    assert position.to_fen() == fen
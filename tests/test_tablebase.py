@@ -0,0 +1,74 @@
+"""
+Таблицы эндшпиля: расстояние до мата в KQK и KRK, ничьи в KPK.
+"""
+import pytest
+
+from classes.position import Position
+from classes.tablebase import DRAW, LOSS, WIN, Tablebases, generate
+
+
+@pytest.fixture(scope="module")
+def tablebases(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("tablebases"))
+    summaries = {name: generate(name, directory) for name in ("KQK", "KRK", "KPK")}
+    tables = Tablebases(directory)
+    yield tables, summaries
+    tables.close()
+
+
+def probe(tablebases, fen):
+    tables, _ = tablebases
+    return tables.probe(Position.from_fen(fen, move_generator="bitboard"))
+
+
+def test_longest_mates(tablebases):
+    # Самый долгий мат: ферзём — 10 ходов, ладьёй — 16 (при ходе сильной стороны)
+    _, summaries = tablebases
+    assert summaries["KQK"]["max_plies"] == 19
+    assert summaries["KRK"]["max_plies"] == 31
+
+
+@pytest.mark.parametrize("fen, expected", [
+    ("7k/8/6K1/8/8/8/Q7/8 w - - 0 1", (WIN, 1)),
+    ("Q6k/8/6K1/8/8/8/8/8 b - - 0 1", (LOSS, 0)),
+    ("7k/8/5K2/8/8/8/8/6Q1 w - - 0 1", (WIN, 1)),
+    ("8/q7/8/8/8/6k1/8/7K b - - 0 1", (WIN, 1)),  # Сильная сторона — чёрные
+    ("7k/8/5K2/8/8/8/8/R7 w - - 0 1", (WIN, 3)),
+    ("7k/8/6K1/8/8/8/8/R7 w - - 0 1", (WIN, 1)),
+])
+def test_mate_distance(tablebases, fen, expected):
+    assert probe(tablebases, fen) == expected
+
+
+def test_stalemate_and_capture(tablebases):
+    assert probe(tablebases, "7k/5Q2/6K1/8/8/8/8/8 b - - 0 1") == (DRAW, 0)  # Пат
+    assert probe(tablebases, "8/8/8/8/8/8/6kQ/4K3 b - - 0 1") == (DRAW, 0)  # Чёрные берут ферзя
+
+
+@pytest.mark.parametrize("fen, expected", [
+    # Оппозиция: при ходе белых ничья, при ходе чёрных белые выигрывают
+    ("8/4k3/8/4K3/4P3/8/8/8 w - - 0 1", DRAW),
+    ("8/4k3/8/4K3/4P3/8/8/8 b - - 0 1", LOSS),
+    # Король сильной стороны на шестой горизонтали перед пешкой выигрывает при любой очереди хода
+    ("4k3/8/4K3/4P3/8/8/8/8 w - - 0 1", WIN),
+    # Крайняя пешка, король слабой стороны в углу
+    ("k7/8/8/8/8/8/P7/7K w - - 0 1", DRAW),
+    ("8/8/8/8/8/4k3/4P3/4K3 w - - 0 1", DRAW),
+    # Пешка проходит в ферзи, король соперника далеко
+    ("8/8/8/8/P7/8/8/K6k w - - 0 1", WIN),
+    # То же с сильными чёрными
+    ("k6K/8/8/p7/8/8/8/8 b - - 0 1", WIN),
+])
+def test_kpk(tablebases, fen, expected):
+    result, plies = probe(tablebases, fen)
+    assert result == expected
+    if result == DRAW:
+        assert plies == 0
+
+
+def test_positions_outside_tables(tablebases):
+    assert probe(tablebases, "4k3/8/8/8/8/8/8/4K1N1 w - - 0 1") == (DRAW, 0)  # Конь не матует
+    assert probe(tablebases, "4k3/8/8/8/8/8/8/4K2R w K - 0 1") is None  # С правом на рокировку
+    assert probe(tablebases, "4k3/8/8/8/8/8/8/3QK2R w - - 0 1") is None  # Нет такого окончания
+    assert probe(tablebases, "4k2r/8/8/8/8/8/8/4K2R w - - 0 1") is None  # Фигуры у обеих сторон
+    assert probe(tablebases, "4k3/8/8/8/8/8/8/2B1K1N1 w - - 0 1") is None  # KBNK не сгенерирована
@@ -0,0 +1,98 @@
+"""
+Статистика турнира (Elo, доверительный интервал, SPRT) и заголовки PGN партий.
+"""
+import math
+
+import pytest
+
+from classes.game_record import SEVEN_TAG_ROSTER, format_pgn
+from classes.pgn_reader import parse_game
+from classes.position import START_FEN
+from classes.tournament import MatchStats, expected_score, game_headers, normal_quantile, score_to_elo
+
+
+def stats(wins, draws, losses):
+    match = MatchStats("first", "second")
+    match.wins, match.draws, match.losses = wins, draws, losses
+    return match
+
+
+def split_pgn_text(text):
+    """
+    Делит текст одной партии на строки заголовков и строки ходов.
+    """
+    lines = [line for line in text.splitlines() if line]
+    return [line for line in lines if line.startswith("[")], [line for line in lines if not line.startswith("[")]
+
+
+@pytest.mark.parametrize("probability, quantile", [
+    (0.5, 0.0), (0.975, 1.959964), (0.95, 1.644854), (0.99, 2.326348), (0.01, -2.326348), (0.001, -3.090232),
+])
+def test_normal_quantile(probability, quantile):
+    assert normal_quantile(probability) == pytest.approx(quantile, abs=1e-6)
+
+
+@pytest.mark.parametrize("elo, score", [(0, 0.5), (400, 10 / 11), (-400, 1 / 11), (190.8485, 0.75)])
+def test_elo_and_score(elo, score):
+    assert expected_score(elo) == pytest.approx(score)
+    assert score_to_elo(score) == pytest.approx(elo, abs=1e-3)
+
+
+def test_add_games():
+    match = MatchStats("first", "second")
+    assert match.add({"white": "first", "black": "second", "result": "1-0"})
+    assert match.add({"white": "second", "black": "first", "result": "1-0"})
+    assert match.add({"white": "second", "black": "first", "result": "1/2-1/2"})
+    assert not match.add({"white": "second", "black": "first", "result": "*"})
+    assert not match.add({"white": "first", "black": "third", "result": "1-0"})
+    assert (match.wins, match.draws, match.losses) == (1, 1, 1)
+    assert match.score() == 0.5
+
+
+def test_confidence_interval():
+    # 60 побед, 20 ничьих, 20 поражений: доля 0.7, дисперсия партии 0.16, граница ±1.96 * 0.04
+    elo, low, high = stats(60, 20, 20).elo()
+    assert elo == pytest.approx(147.19, abs=0.01)
+    assert low == pytest.approx(86.23, abs=0.01)
+    assert high == pytest.approx(218.25, abs=0.01)
+
+    # Равный счёт: интервал симметричен относительно нуля
+    elo, low, high = stats(10, 80, 10).elo()
+    assert elo == pytest.approx(0)
+    assert low == pytest.approx(-high) and high == pytest.approx(30.53, abs=0.01)
+
+    assert stats(0, 0, 0).elo() == (0.0, -math.inf, math.inf)
+
+
+def test_sprt():
+    bounds = (math.log(0.05 / 0.95), math.log(0.95 / 0.05))
+    llr, lower, upper, decision = stats(0, 0, 0).sprt(0, 10)
+    assert (llr, lower, upper, decision) == (0.0, *bounds, None)
+
+    llr, lower, upper, decision = stats(60, 20, 20).sprt(0, 10)
+    assert llr == pytest.approx(1.6999, abs=1e-4)
+    assert (lower, upper) == pytest.approx(bounds)
+    assert decision is None
+
+    # Равный счёт одинаково далёк от обеих гипотез, симметричных относительно нуля
+    assert stats(10, 80, 10).sprt(0, 5)[0] == pytest.approx(-stats(10, 80, 10).sprt(-5, 0)[0])
+
+    assert stats(300, 100, 100).sprt(0, 10)[3] == "H1"
+    assert stats(100, 100, 300).sprt(0, 10)[3] == "H0"
+
+
+def test_game_headers():
+    game = {"game": 3, "white": "search:time=0.1", "black": "random", "fen": START_FEN,
+            "moves": ["f3", "e5", "g4", "Qh4#"], "result": "0-1", "termination": "normal"}
+    headers = game_headers(game)
+    assert all(name in headers for name in SEVEN_TAG_ROSTER if name != "Result")
+    assert headers["Round"] == "3" and "FEN" not in headers
+
+    parsed = parse_game(*split_pgn_text(format_pgn(headers, game["moves"], game["result"], "checkmate")))
+    assert list(parsed.headers)[:7] == list(SEVEN_TAG_ROSTER)
+    assert parsed.headers["PlyCount"] == "4"
+    assert parsed.result == "0-1"
+
+    headers = game_headers(dict(game, fen="4k3/8/8/8/8/8/8/4K2R w K - 0 1", moves=[]))
+    assert headers["SetUp"] == "1" and headers["FEN"] == "4k3/8/8/8/8/8/8/4K2R w K - 0 1"
+
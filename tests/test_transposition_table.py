@@ -0,0 +1,96 @@
+"""
+Упаковка записей таблицы транспозиций и правила замены в корзине.
+"""
+import pytest
+
+from classes.bitboard import SQUARES
+from classes.transposition_table import (BUCKET_SIZE, ENTRY_SIZE, EXACT, LOWER_BOUND, PROMOTIONS, UPPER_BOUND,
+                                         TranspositionTable, decode_move, encode_move, table_size)
+
+
+def test_move_round_trip():
+    assert encode_move(None) == 0
+    assert decode_move(0) is None
+    for start in SQUARES:
+        for end in SQUARES:
+            for promotion in PROMOTIONS:
+                move = (start, end, promotion)
+                code = encode_move(move)
+                assert 0 < code < 1 << 16
+                assert decode_move(code) == move
+
+
+@pytest.mark.parametrize("score", [0, 1, -1, 31999, -31999, 100000, -100000])
+@pytest.mark.parametrize("bound", [EXACT, LOWER_BOUND, UPPER_BOUND])
+def test_store_and_probe(score, bound):
+    table = TranspositionTable(1)
+    key = 0x123456789ABCDEF0
+    move = ((6, 4), (4, 4), None)
+    table.store(key, 7, score, bound, move)
+    assert table.probe(key) == (7, score, bound, move)
+    assert table.probe(key ^ 1) is None
+    assert table.hits == 1 and table.misses == 1
+
+
+def test_depth_is_capped():
+    table = TranspositionTable(1)
+    table.store(1, 1000, 5, EXACT, None)
+    assert table.probe(1) == (254, 5, EXACT, None)
+
+
+def test_table_size():
+    assert table_size(1) == 1024 * 1024
+    assert table_size(0) == ENTRY_SIZE * BUCKET_SIZE
+    assert TranspositionTable(1).bucket_count == 1024 * 1024 // (ENTRY_SIZE * BUCKET_SIZE)
+
+
+def test_replacement():
+    table = TranspositionTable(1)
+    buckets = table.bucket_count
+    deep, shallow, third = 5, 5 + buckets, 5 + 2 * buckets  # Ключи одной корзины
+
+    # Более мелкий результат не вытесняет глубокий из первой записи и идёт во вторую
+    table.store(deep, 10, 1, EXACT, None)
+    table.store(shallow, 3, 2, EXACT, None)
+    assert table.probe(deep) == (10, 1, EXACT, None)
+    assert table.probe(shallow) == (3, 2, EXACT, None)
+
+    # Вторая запись заменяется всегда
+    table.store(third, 2, 3, EXACT, None)
+    assert table.probe(deep) is not None
+    assert table.probe(shallow) is None
+    assert table.probe(third) == (2, 3, EXACT, None)
+    assert table.overwrites == 1
+
+    # Та же позиция обновляется на месте, даже с меньшей глубиной
+    table.store(deep, 4, 7, LOWER_BOUND, None)
+    assert table.probe(deep) == (4, 7, LOWER_BOUND, None)
+    assert table.probe(third) is not None
+
+    # Более глубокий результат вытесняет первую запись
+    table.store(shallow, 6, 8, EXACT, None)
+    assert table.probe(shallow) == (6, 8, EXACT, None)
+    assert table.probe(deep) is None
+
+
+def test_old_entries_are_replaced_first():
+    table = TranspositionTable(1)
+    buckets = table.bucket_count
+    table.store(9, 20, 1, EXACT, None)
+    table.new_search()
+    # Запись прошлого поиска заменяется даже более мелким результатом
+    table.store(9 + buckets, 1, 2, EXACT, None)
+    assert table.probe(9) is None
+    assert table.probe(9 + buckets) == (1, 2, EXACT, None)
+
+
+def test_shared_buffer_and_clear():
+    buffer = bytearray(table_size(1))
+    writer = TranspositionTable(1, buffer)
+    reader = TranspositionTable(1, buffer)
+    writer.store(42, 3, -15, UPPER_BOUND, ((1, 0), (0, 0), "n"))
+    assert reader.probe(42) == (3, -15, UPPER_BOUND, ((1, 0), (0, 0), "n"))
+
+    writer.clear()
+    assert reader.probe(42) is None
+    assert writer.get_stats()["fill"] == 0
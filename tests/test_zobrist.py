@@ -0,0 +1,62 @@
+"""
+Инкрементальный ключ Зобриста совпадает с ключом, посчитанным с нуля.
+"""
+import pytest
+
+from classes.notation import san_to_move
+from classes.perft import PERFT_SUITE
+from classes.position import Position
+from classes.zobrist import compute_key
+
+
+def check_keys(position, depth):
+    """
+    Обходит дерево ходов и сверяет ключи после каждого хода и его отмены.
+    """
+    key = position.zobrist_key
+    assert key == compute_key(position)
+    if depth == 0:
+        return
+    for move in position.get_all_valid_moves():
+        undo = position.make_move(*move)
+        check_keys(position, depth - 1)
+        position.unmake_move(undo)
+        assert position.zobrist_key == key
+
+
+@pytest.mark.parametrize("name, fen", [(name, fen) for name, fen, _ in PERFT_SUITE],
+                         ids=[name for name, _, _ in PERFT_SUITE])
+def test_incremental_key_matches_compute_key(name, fen):
+    check_keys(Position.from_fen(fen, move_generator="bitboard"), 2)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_key_in_random_games(random_game, seed):
+    def check_key(position):
+        assert position.zobrist_key == compute_key(position)
+
+    random_game(Position(move_generator="bitboard"), seed, 120, check_key)
+
+
+def test_en_passant_without_capture_is_not_hashed():
+    # После e4 взять на проходе нечем: ключ совпадает с той же позицией без клетки взятия
+    position = Position(move_generator="bitboard")
+    position.make_move(*san_to_move(position, "e4"))
+    without_target = Position.from_fen(position.to_fen().replace(" e3 ", " - "), move_generator="bitboard")
+    assert position.zobrist_key == without_target.zobrist_key
+
+
+def test_en_passant_capture_is_hashed():
+    position = Position.from_fen("4k3/8/8/8/5p2/8/4P3/4K3 w - - 0 1", move_generator="bitboard")
+    position.make_move(*san_to_move(position, "e4"))
+    without_target = Position.from_fen(position.to_fen().replace(" e3 ", " - "), move_generator="bitboard")
+    assert position.zobrist_key != without_target.zobrist_key
+
+
+def test_repetition_after_double_pawn_move():
+    # Позиция после 1. e4 повторяется ещё дважды (уже без клетки взятия на проходе) — троекратное повторение
+    position = Position(move_generator="bitboard")
+    for san in "e4 Nf6 Nf3 Ng8 Ng1 Nf6 Nf3 Ng8 Ng1".split():
+        assert not position.state_checker.is_threefold_repetition()
+        position.make_move(*san_to_move(position, san))
+    assert position.state_checker.is_threefold_repetition()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+import time
+
+from classes.game_record import format_pgn
+from classes.tournament import MAX_PLIES, MatchStats, game_headers, load_openings, parse_engine, run_tournament
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Турнир движков без окна: Elo с доверительным интервалом и остановка по SPRT.")
+    parser.add_argument("engines", nargs="+",
+                        help='Описания движков: "search:time=0.1,depth=6,hash=16,name=A", "search:nodes=20000", '
+                             '"random". Нужно не меньше двух.')
+    parser.add_argument("--games", type=int, default=100, help="Наибольшее число партий.")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов (по умолчанию — число ядер).")
+    parser.add_argument("--time", type=float, default=None, help="Секунд на ход для движков без своего лимита.")
+    parser.add_argument("--nodes", type=int, default=None, help="Узлов на ход для движков без своего лимита.")
+    parser.add_argument("--openings", default=None,
+                        help="Набор дебютов: файл PGN или файл с FEN по строке (по умолчанию встроенный).")
+    parser.add_argument("--opening-plies", type=int, default=8, help="Сколько полуходов брать из партий PGN.")
+    parser.add_argument("--max-plies", type=int, default=MAX_PLIES, help="После стольких полуходов — ничья.")
+    parser.add_argument("--pgn", default="tournament.pgn", help="Файл для записи партий.")
+    parser.add_argument("--sprt", type=float, nargs=2, metavar=("ELO0", "ELO1"), default=None,
+                        help="Остановить турнир по SPRT с гипотезами H0: elo0, H1: elo1 (только для двух движков).")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Ошибка первого рода для SPRT.")
+    parser.add_argument("--beta", type=float, default=0.05, help="Ошибка второго рода для SPRT.")
+    args = parser.parse_args()
+
+    time_limit = args.time
+    if time_limit is None and args.nodes is None:
+        time_limit = 0.1
+    try:
+        engines = [parse_engine(spec, time_limit, args.nodes) for spec in args.engines]
+        openings = load_openings(args.openings, args.opening_plies)
+    except (ValueError, OSError) as error:
+        parser.error(str(error))
+    names = [engine["name"] for engine in engines]
+    if len(engines) < 2 or len(set(names)) != len(names):
+        parser.error("нужно не меньше двух движков с разными именами (параметр name=...)")
+    if args.sprt and len(engines) != 2:
+        parser.error("SPRT считается только для матча двух движков")
+    sprt = (args.sprt[0], args.sprt[1], args.alpha, args.beta) if args.sprt else None
+    workers = args.workers or os.cpu_count() or 1
+
+    start_time = time.perf_counter()
+    cpu_time = 0.0
+    games = []
+
+    def report(game, stats):
+        nonlocal cpu_time
+        cpu_time += game["cpu"]
+        elapsed = time.perf_counter() - start_time
+        line = f"\rПартий: {len(games) + 1}, {(len(games) + 1) / max(elapsed, 1e-9):.2f} партий/с, {stats.format()}"
+        if sprt:
+            llr, lower, upper, _ = stats.sprt(*sprt)
+            line += f", LLR {llr:.2f} [{lower:.2f}, {upper:.2f}]"
+        print(line, end="", file=sys.stderr, flush=True)
+
+    with open(args.pgn, "w", encoding="utf-8") as output:
+        for game in run_tournament(engines, openings, args.games, workers, args.max_plies, sprt, report):
+            games.append(game)
+            output.write(format_pgn(game_headers(game), game["moves"], game["result"], game["reason"]))
+            output.flush()
+
+    elapsed = time.perf_counter() - start_time
+    print(file=sys.stderr)
+    nodes = sum(game["nodes"]["white"] + game["nodes"]["black"] for game in games)
+    print(f"Партий: {len(games)} за {elapsed:.1f} с, {len(games) / max(elapsed, 1e-9):.2f} партий/с, "
+          f"{nodes / max(cpu_time, 1e-9):.0f} узлов/с на процесс")
+    print(f"Загрузка процессора: {cpu_time / max(elapsed * workers, 1e-9) * 100:.0f}% от {workers} процессов "
+          f"({os.cpu_count()} ядер)")
+    for index, first in enumerate(names):
+        for second in names[index + 1:]:
+            stats = MatchStats(first, second)
+            for game in games:
+                stats.add(game)
+            print(stats.format())
+            if sprt:
+                llr, lower, upper, decision = stats.sprt(*sprt)
+                verdict = {"H1": f"принята H1 (Elo >= {sprt[1]:g})", "H0": f"принята H0 (Elo <= {sprt[0]:g})",
+                           None: "решения нет"}[decision]
+                print(f"SPRT: LLR {llr:.2f} [{lower:.2f}, {upper:.2f}], {verdict}")
+    print(f"Партии записаны в {args.pgn}")
+
+
+if __name__ == "__main__":
+    main()